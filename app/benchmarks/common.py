@@ -0,0 +1,248 @@
+"""
+Load generation, latency statistics and baselines shared by the benchmarks.
+A report is a JSON document with the run parameters and a summary per
+scenario. Compare a report with a baseline to detect regressions of
+throughput and of the 99th percentile of latency.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Iterable, Iterator
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+SEED_BATCH_SIZE = 5000
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    seconds: float = 0.0
+    errors: int = 0
+    # seconds of every successful call
+    latencies: list[float] = field(default_factory=list)
+    # items processed by successful calls, e.g. rows of a batch
+    items: int = 0
+    # additional figures of the summary, e.g. queries per request
+    extra: dict = field(default_factory=dict)
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies) + self.errors
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies)
+        seconds = self.seconds or 1.0
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "throughput": round(len(latencies) / seconds, 2),
+            "items_per_second": round(self.items / seconds, 2),
+            "mean_ms": _ms(sum(latencies) / len(latencies) if latencies else 0),
+            "p50_ms": _ms(percentile(latencies, 50)),
+            "p90_ms": _ms(percentile(latencies, 90)),
+            "p99_ms": _ms(percentile(latencies, 99)),
+            "max_ms": _ms(latencies[-1] if latencies else 0),
+            **self.extra,
+        }
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    if not sorted_values:
+        return 0.0
+    rank = max(round(q / 100 * len(sorted_values) + 0.5), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def run_load(
+    name: str,
+    call: Callable[[int], Awaitable[int]],
+    duration: float,
+    concurrency: int,
+    warmup: float = 0.0,
+) -> ScenarioResult:
+    """Calls call(iteration) from concurrency workers for duration seconds.
+    call returns the number of processed items and raises on errors.
+    Calls of the warmup period are not measured"""
+    result = ScenarioResult(name=name)
+    counter = iter(range(1 << 62))
+    measured = False
+
+    async def worker(deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                items = await call(next(counter))
+            except Exception as e:
+                if measured:
+                    result.errors += 1
+                    if result.errors <= 3:
+                        logging.warning("%s failed: %r", name, e)
+                continue
+            if measured:
+                result.latencies.append(time.perf_counter() - started)
+                result.items += items
+
+    async def run(seconds: float) -> None:
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(*(worker(deadline) for _ in range(concurrency)))
+
+    if warmup > 0:
+        await run(warmup)
+    measured = True
+    started = time.perf_counter()
+    await run(duration)
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def add_run_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adds arguments of the load and the report"""
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--scenarios", help="comma separated names, all scenarios by default"
+    )
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    parser.add_argument("--output", help="path of the JSON report")
+    parser.add_argument("--compare", help="path of the baseline report")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="allowed share of regression against the baseline",
+    )
+
+
+def finish_report(args: argparse.Namespace, report: dict) -> int:
+    """Prints and saves the report, returns the exit code:
+    1 if the report regressed against the baseline"""
+    baseline = load_report(args.compare) if args.compare else None
+    print_report(report, baseline)
+    if args.output:
+        save_report(args.output, report)
+    if baseline:
+        regressions = compare_reports(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+def build_report(parameters: dict, results: Iterable[ScenarioResult]) -> dict:
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "parameters": parameters,
+        "scenarios": {result.name: result.summary() for result in results},
+    }
+
+
+def print_report(report: dict, baseline: dict | None = None) -> None:
+    header = (
+        f"{'scenario':<24}{'req/s':>10}{'items/s':>11}{'p50 ms':>9}"
+        f"{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}{'errors':>8}"
+    )
+    if baseline:
+        header += f"{'vs base':>10}"
+    print(header)
+    base_scenarios = (baseline or {}).get("scenarios", {})
+    for name, summary in report["scenarios"].items():
+        line = (
+            f"{name:<24}{summary['throughput']:>10.1f}"
+            f"{summary['items_per_second']:>11.1f}{summary['p50_ms']:>9.2f}"
+            f"{summary['p90_ms']:>9.2f}{summary['p99_ms']:>9.2f}"
+            f"{summary['max_ms']:>9.2f}{summary['errors']:>8}"
+        )
+        base = base_scenarios.get(name)
+        if base and base["throughput"]:
+            change = summary["throughput"] / base["throughput"] - 1
+            line += f"{change:>+10.1%}"
+        print(line)
+
+
+def save_report(path: str, report: dict) -> None:
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+
+
+def load_report(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare_reports(
+    report: dict, baseline: dict, tolerance: float
+) -> list[str]:
+    """Returns regressions: throughput lower or p99 higher than
+    the baseline by more than tolerance, or new errors"""
+    regressions = []
+    for name, summary in report["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        if summary["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {summary['throughput']} req/s, "
+                f"baseline {base['throughput']} req/s"
+            )
+        if summary["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p99 {summary['p99_ms']} ms, "
+                f"baseline {base['p99_ms']} ms"
+            )
+        if summary["errors"] and not base["errors"]:
+            regressions.append(f"{name}: {summary['errors']} errors")
+    return regressions
+
+
+def batched(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def seed_table(
+    engine: AsyncEngine,
+    table,
+    rows: Iterable[dict],
+    expected: int,
+    count_filter: str = "true",
+    reset: bool = False,
+) -> bool:
+    """Inserts rows unless the table already holds expected rows matching
+    count_filter. Other rows matching the filter are deleted first.
+    Returns True if the table was seeded"""
+    table = getattr(table, "__table__", table)
+    async with engine.begin() as connection:
+        if not reset:
+            count = await connection.scalar(
+                text(f"SELECT count(*) FROM {table.name} WHERE {count_filter}")
+            )
+            if count == expected:
+                return False
+        await connection.execute(
+            text(f"DELETE FROM {table.name} WHERE {count_filter}")
+        )
+        for batch in batched(rows, SEED_BATCH_SIZE):
+            await connection.execute(insert(table), batch)
+    return True
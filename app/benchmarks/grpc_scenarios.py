@@ -0,0 +1,160 @@
+"""
+Seed data and request batches of the gRPC benchmark.
+KPIs below existing_kpis are seeded as color ranges of the service,
+every batch mixes them with KPIs, which don't exist yet.
+Color ranges of new KPIs are deleted before and after a run.
+"""
+
+import json
+import random
+from dataclasses import dataclass
+from itertools import count
+from typing import Awaitable, Callable
+
+import grpc
+from sqlalchemy import delete
+
+from v1.database.database import Database
+from v1.database.models.color_range import ColorRangeTableNew
+from v1.grpc_config.frontend_settings_proto import (
+    frontend_settings_pb2,
+    frontend_settings_pb2_grpc,
+)
+from v1.grpc_config.grpc_server import FrontendSettings
+from v1.metrics.grpc_interceptor import MetricsInterceptor
+
+from benchmarks.common import seed_table
+
+SERVICE = "/frontend_settings.FrontendSettings"
+# methods of the scenarios in statistics of the interceptor
+SCENARIO_METHODS = {
+    "default_palette": f"{SERVICE}/SetDefaultPaletteForItems",
+    "custom_palette": f"{SERVICE}/SetCustomColorRangeForKPI",
+}
+EXISTING_PREFIX = "benchmark_kpi_"
+NEW_PREFIX = "benchmark_new_kpi_"
+# object types of the benchmark, far from ids of real object types
+FIRST_TMO_ID = 1_000_000_000
+PALETTE = json.dumps(
+    {
+        "colors": [
+            {"name": "Low", "id": 1, "hex": "#66CC33"},
+            {"name": "High", "id": 2, "hex": "#FF0000"},
+        ],
+        "values": [50],
+    }
+)
+
+
+@dataclass
+class KpiLayout:
+    tmos: int
+    existing_kpis: int
+    batch_size: int
+    existing_share: float
+
+    def tmo_id(self, kpi_id: int) -> int:
+        return FIRST_TMO_ID + kpi_id % self.tmos
+
+
+async def start_server() -> tuple[grpc.aio.Server, int]:
+    """Starts the service on a free local port"""
+    server = grpc.aio.server(interceptors=[MetricsInterceptor()])
+    frontend_settings_pb2_grpc.add_FrontendSettingsServicer_to_server(
+        FrontendSettings(), server
+    )
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    return server, port
+
+
+async def delete_new_kpis() -> None:
+    async with Database().engine.begin() as connection:
+        await connection.execute(
+            delete(ColorRangeTableNew).where(
+                ColorRangeTableNew.created_by == "",
+                ColorRangeTableNew.name.startswith(NEW_PREFIX),
+            )
+        )
+
+
+async def seed(layout: KpiLayout, reset: bool = False) -> bool:
+    await delete_new_kpis()
+    rows = (
+        {
+            "tmo_id": str(layout.tmo_id(kpi_id)),
+            "tprm_id": str(kpi_id),
+            "val_type": "float",
+            "name": f"{EXISTING_PREFIX}{kpi_id}",
+            "value_type": "General",
+            "with_indeterminate": True,
+            "with_cleared": True,
+            "ranges": json.loads(PALETTE),
+            "public": True,
+            "direction": "asc",
+            "default": False,
+            "created_by": "",
+            "created_by_sub": "",
+        }
+        for kpi_id in range(layout.existing_kpis)
+    )
+    return await seed_table(
+        Database().engine,
+        ColorRangeTableNew,
+        rows,
+        layout.existing_kpis,
+        f"created_by = '' AND name LIKE '{EXISTING_PREFIX}%'",
+        reset=reset,
+    )
+
+
+def build_scenarios(
+    channel: grpc.aio.Channel, layout: KpiLayout, seed: int
+) -> dict[str, Callable[[int], Awaitable[int]]]:
+    """Returns calls of the scenarios by name.
+    Every call sends one batch of batch_size KPIs"""
+    rng = random.Random(seed)
+    stub = frontend_settings_pb2_grpc.FrontendSettingsStub(channel)
+    new_kpi_ids = count(layout.existing_kpis)
+
+    def batch() -> list[tuple[int, str]]:
+        kpis = []
+        for _ in range(layout.batch_size):
+            if layout.existing_kpis and rng.random() < layout.existing_share:
+                kpi_id = rng.randrange(layout.existing_kpis)
+                kpis.append((kpi_id, f"{EXISTING_PREFIX}{kpi_id}"))
+            else:
+                kpi_id = next(new_kpi_ids)
+                kpis.append((kpi_id, f"{NEW_PREFIX}{kpi_id}"))
+        return kpis
+
+    async def default_palette(_: int) -> int:
+        request = frontend_settings_pb2.RequestObjectForPalette()
+        kpis = batch()
+        for kpi_id, name in kpis:
+            request.tmo_id_preference[
+                layout.tmo_id(kpi_id)
+            ].preference_instances.add(
+                preference_name=name, val_type="float", kpi_id=kpi_id
+            )
+        await stub.SetDefaultPaletteForItems(request)
+        return len(kpis)
+
+    async def custom_palette(_: int) -> int:
+        request = frontend_settings_pb2.RequestToSetCustomPalette()
+        kpis = batch()
+        for kpi_id, name in kpis:
+            request.preference_instances.add(
+                preference_name=name,
+                val_type="float",
+                kpi_id=kpi_id,
+                palette=PALETTE,
+                object_type_id=layout.tmo_id(kpi_id),
+            )
+        await stub.SetCustomColorRangeForKPI(request)
+        return len(kpis)
+
+    return {
+        "default_palette": default_palette,
+        "custom_palette": custom_palette,
+    }
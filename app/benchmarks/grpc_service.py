@@ -0,0 +1,135 @@
+"""
+Benchmark of the gRPC service.
+Starts the FrontendSettings server in-process against the database of DB_*
+variables and sends batches of KPIs for --duration seconds per scenario.
+Prints RPC latency percentiles, KPIs per second and SQL statements per RPC.
+
+    cd app && python -m benchmarks.grpc_service --batch-size 500 --output base.json
+    cd app && python -m benchmarks.grpc_service --batch-size 500 --compare base.json
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+import grpc
+
+from benchmarks.common import (
+    add_run_arguments,
+    build_report,
+    finish_report,
+    run_load,
+)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tmos", type=int, default=100)
+    parser.add_argument(
+        "--existing-kpis",
+        type=int,
+        default=10_000,
+        help="KPIs with color ranges before the run",
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--existing-share",
+        type=float,
+        default=0.5,
+        help="share of existing KPIs in batches",
+    )
+    parser.add_argument(
+        "--reset", action="store_true", help="replace seeded color ranges"
+    )
+    add_run_arguments(parser)
+    parser.set_defaults(concurrency=4)
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    from benchmarks.grpc_scenarios import (
+        SCENARIO_METHODS,
+        KpiLayout,
+        build_scenarios,
+        delete_new_kpis,
+        seed,
+        start_server,
+    )
+    from v1 import settings
+    from v1.database import Base
+    from v1.database.database import Database
+    from v1.metrics.queries import QueryStats
+
+    layout = KpiLayout(
+        tmos=args.tmos,
+        existing_kpis=args.existing_kpis,
+        batch_size=args.batch_size,
+        existing_share=args.existing_share,
+    )
+    db = Database()
+    db.set_config(
+        database_url=settings.DATABASE_URL,
+        db_schema=settings.DB_SCHEMA,
+        metadata=Base.metadata,
+    )
+    await db.init()
+    if await seed(layout, reset=args.reset):
+        print(f"Seeded {args.existing_kpis} KPIs")
+
+    server, port = await start_server()
+    results = []
+    try:
+        async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+            scenarios = build_scenarios(channel, layout, args.seed)
+            names = args.scenarios.split(",") if args.scenarios else scenarios
+            for name in names:
+                QueryStats().reset()
+                result = await run_load(
+                    name,
+                    scenarios[name],
+                    duration=args.duration,
+                    concurrency=args.concurrency,
+                    warmup=args.warmup,
+                )
+                stats = QueryStats().routes.get(SCENARIO_METHODS[name])
+                if stats is not None:
+                    result.extra["statements_per_rpc"] = round(
+                        stats.mean_queries, 2
+                    )
+                    result.extra["max_statements_per_rpc"] = stats.max_queries
+                results.append(result)
+                await delete_new_kpis()
+    finally:
+        await server.stop(None)
+        await db.engine.dispose()
+
+    parameters = {
+        key: getattr(args, key)
+        for key in (
+            "tmos",
+            "existing_kpis",
+            "batch_size",
+            "existing_share",
+            "duration",
+            "warmup",
+            "concurrency",
+        )
+    }
+    return build_report(parameters, results)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    # settings are read at import, the app is imported by run
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    os.environ.setdefault("LOG_FORMAT", "text")
+    from v1.utils.logging_setup import setup_logging
+
+    setup_logging()
+    report = asyncio.run(run(args))
+    return finish_report(args, report)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
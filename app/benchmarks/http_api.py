@@ -0,0 +1,126 @@
+"""
+Benchmark of the HTTP API.
+Drives main.app in-process through the ASGI transport of httpx against
+the database of DB_* variables, seeds it with --rows rows per table,
+runs every scenario for --duration seconds and prints throughput and
+latency percentiles. Secured modes use a local stub of Keycloak and OPA.
+
+    cd app && python -m benchmarks.http_api --rows 100000 --output base.json
+    cd app && python -m benchmarks.http_api --rows 100000 --compare base.json
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+import httpx
+
+from benchmarks.common import (
+    add_run_arguments,
+    build_report,
+    finish_report,
+    run_load,
+)
+from benchmarks.stubs import AuthStub
+
+SECURITY_TYPES = {
+    "disable": "DISABLE",
+    "keycloak": "KEYCLOAK",
+    "keycloak-info": "KEYCLOAK-INFO",
+    "opa-jwt-raw": "OPA-JWT-RAW",
+    "opa-jwt-parsed": "OPA-JWT-PARSED",
+}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--security", choices=SECURITY_TYPES, default="disable")
+    parser.add_argument(
+        "--reset", action="store_true", help="replace seeded rows"
+    )
+    add_run_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def configure_environment(args: argparse.Namespace, stub: AuthStub | None):
+    """Settings are read at import, so it runs before the app is imported"""
+    os.environ["SECURITY_TYPE"] = SECURITY_TYPES[args.security]
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("LOG_FORMAT", "text")
+    if stub is not None:
+        for service in ("KEYCLOAK", "OPA"):
+            os.environ[f"{service}_PROTOCOL"] = "http"
+            os.environ[f"{service}_HOST"] = "127.0.0.1"
+            os.environ[f"{service}_PORT"] = str(stub.port)
+        os.environ["KEYCLOAK_REALM"] = stub.realm
+
+
+async def run(args: argparse.Namespace, stub: AuthStub | None) -> dict:
+    from benchmarks.http_scenarios import SeedLayout, build_scenarios, seed
+    from init_app import lifespan
+    from main import APP_VERSION, app
+    from settings import PREFIX
+    from v1.metrics.queries import QueryStats
+
+    layout = SeedLayout(rows=args.rows)
+    headers = {}
+    if stub is not None:
+        headers["Authorization"] = f"Bearer {stub.issue_token()}"
+
+    async with lifespan(app):
+        seeded = await seed(layout, reset=args.reset)
+        if seeded:
+            print(f"Seeded {', '.join(seeded)} with {args.rows} rows")
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url=f"http://benchmark{PREFIX}/v{APP_VERSION}",
+            headers=headers,
+            timeout=60,
+        ) as client:
+            scenarios = build_scenarios(client, layout, args.seed)
+            names = args.scenarios.split(",") if args.scenarios else scenarios
+            results = []
+            for name in names:
+                QueryStats().reset()
+                result = await run_load(
+                    name,
+                    scenarios[name],
+                    duration=args.duration,
+                    concurrency=args.concurrency,
+                    warmup=args.warmup,
+                )
+                routes = QueryStats().routes.values()
+                requests = sum(route.requests for route in routes)
+                if requests:
+                    result.extra["queries_per_request"] = round(
+                        sum(route.queries for route in routes) / requests, 2
+                    )
+                results.append(result)
+
+    parameters = {
+        key: getattr(args, key)
+        for key in ("rows", "duration", "warmup", "concurrency", "security")
+    }
+    return build_report(parameters, results)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    stub = None
+    if args.security != "disable":
+        stub = AuthStub(realm=os.environ.get("KEYCLOAK_REALM", "avataa"))
+        stub.start()
+    configure_environment(args, stub)
+    try:
+        report = asyncio.run(run(args, stub))
+    finally:
+        if stub is not None:
+            stub.stop()
+    return finish_report(args, report)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
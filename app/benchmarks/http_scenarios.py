@@ -0,0 +1,341 @@
+"""
+Seed data and request scenarios of the HTTP API benchmark.
+Seeded rows are marked with SEED_USER, so they can be counted and replaced
+without touching other rows of the database.
+"""
+
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Iterator
+
+import httpx
+
+from v1.controllers.module_settings.common.registry.registry import (
+    ModuleSettingsRegistry,
+)
+from v1.database.database import Database
+from v1.database.models.color_range import ColorRangeTableNew
+from v1.database.models.modules import (
+    Module,
+    ModuleSettings,
+    ModuleSettingsLogs,
+)
+from v1.database.models.state import State
+from v1.database.models.table import ColumnsTable, FiltersTable
+
+from benchmarks.common import seed_table
+
+SEED_USER = "benchmark-seed"
+SEED_USER_SUB = "benchmark-user"
+ROWS_PER_TMO = 100
+MODULES = 100
+MODULE_PREFIX = "benchmark_module_"
+SETTINGS_PER_MODULE = 50
+STATE_NAMESPACE = uuid.UUID("5c1b4a52-7e0e-4f57-9d3c-2b8f0f6f3f21")
+
+
+@dataclass
+class SeedLayout:
+    rows: int
+
+    @property
+    def tmo_count(self) -> int:
+        return max(self.rows // ROWS_PER_TMO, 1)
+
+    def tmo_id(self, row: int) -> int:
+        return row % self.tmo_count + 1
+
+    @staticmethod
+    def state_id(row: int) -> uuid.UUID:
+        return uuid.uuid5(STATE_NAMESPACE, str(row))
+
+    @staticmethod
+    def module_name(row: int) -> str:
+        return f"{MODULE_PREFIX}{row % MODULES}"
+
+    @staticmethod
+    def module_custom_name(row: int) -> str:
+        return f"Benchmark module {row % MODULES}"
+
+
+def _table_value(row: int) -> dict:
+    return {
+        "columns": [
+            {"field": f"param_{i}", "width": 120, "visible": (row + i) % 3 > 0}
+            for i in range(20)
+        ]
+    }
+
+
+def _state_value(row: int) -> dict:
+    return {
+        "map": {"zoom": row % 18, "center": [row % 90, row % 180]},
+        "filters": [{"tprm_id": row + i, "value": f"v{i}"} for i in range(10)],
+    }
+
+
+def _color_range_rows(layout: SeedLayout) -> Iterator[dict]:
+    for row in range(layout.rows):
+        public = row % 2 == 0
+        yield {
+            "tmo_id": str(layout.tmo_id(row)),
+            "tprm_id": str(row),
+            "val_type": "float",
+            "name": f"range_{row}",
+            "value_type": "General",
+            "with_indeterminate": False,
+            "with_cleared": False,
+            "ranges": {
+                "colors": ["#00ff00", "#ffff00", "#ff8800", "#ff0000"],
+                "values": [25, 50, 75],
+            },
+            "public": public,
+            "direction": "asc",
+            "default": (row // layout.tmo_count) % 5 == 0,
+            "created_by": SEED_USER,
+            "created_by_sub": "" if public else SEED_USER_SUB,
+        }
+
+
+def _table_rows(
+    layout: SeedLayout, prefix: str, columns: bool
+) -> Iterator[dict]:
+    for row in range(layout.rows):
+        # two defaults per tmo, a public and a private one
+        public = (row // layout.tmo_count) % 2 == 0
+        item = {
+            "tmo_id": layout.tmo_id(row),
+            "name": f"{prefix}_{row}",
+            "value": _table_value(row),
+            "value_packed": None,
+            "created_by": SEED_USER,
+            "created_by_sub": "" if public else SEED_USER_SUB,
+            "public": public,
+            "default": row < 2 * layout.tmo_count,
+        }
+        if columns:
+            item["order"] = [f"param_{i}" for i in range(20)]
+            item["pinned"] = {"left": ["param_0"]}
+        yield item
+
+
+def _state_rows(layout: SeedLayout) -> Iterator[dict]:
+    now = datetime.now()
+    for row in range(layout.rows):
+        yield {
+            "id": layout.state_id(row),
+            "value": _state_value(row),
+            "value_packed": None,
+            "creation_date": now,
+            "expire_date": None,
+            "created_by": SEED_USER,
+        }
+
+
+def _log_rows(layout: SeedLayout) -> Iterator[dict]:
+    now = datetime.now()
+    for row in range(layout.rows):
+        yield {
+            "domain": layout.module_name(row),
+            "variable": f"key_{row % SETTINGS_PER_MODULE}",
+            "user": SEED_USER,
+            "change_time": now - timedelta(seconds=row),
+            "old_value": str(row - 1),
+            "new_value": str(row),
+        }
+
+
+async def seed(layout: SeedLayout, reset: bool = False) -> list[str]:
+    """Seeds tables which don't hold the rows of the layout,
+    returns names of the seeded tables"""
+    engine = Database().engine
+    seed_filter = f"created_by = '{SEED_USER}'"
+    modules_filter = f"name LIKE '{MODULE_PREFIX}%'"
+    tables = [
+        (
+            ColorRangeTableNew,
+            _color_range_rows(layout),
+            layout.rows,
+            seed_filter,
+        ),
+        (
+            ColumnsTable,
+            _table_rows(layout, "benchmark_columns", columns=True),
+            layout.rows,
+            seed_filter,
+        ),
+        (
+            FiltersTable,
+            _table_rows(layout, "benchmark_filters", columns=False),
+            layout.rows,
+            seed_filter,
+        ),
+        (State, _state_rows(layout), layout.rows, seed_filter),
+        (
+            Module,
+            (
+                {
+                    "name": layout.module_name(i),
+                    "custom_name": layout.module_custom_name(i),
+                }
+                for i in range(MODULES)
+            ),
+            MODULES,
+            modules_filter,
+        ),
+        (
+            ModuleSettings,
+            (
+                {
+                    "module": layout.module_name(i),
+                    "settings": {
+                        f"key_{j}": j for j in range(SETTINGS_PER_MODULE)
+                    },
+                }
+                for i in range(MODULES)
+            ),
+            MODULES,
+            f"module LIKE '{MODULE_PREFIX}%'",
+        ),
+        (
+            ModuleSettingsLogs,
+            _log_rows(layout),
+            layout.rows,
+            f"\"user\" = '{SEED_USER}'",
+        ),
+    ]
+    seeded = []
+    for table, rows, expected, count_filter in tables:
+        if await seed_table(
+            engine, table, rows, expected, count_filter, reset=reset
+        ):
+            seeded.append(table.__tablename__)
+    async with engine.begin() as connection:
+        for table, *_ in tables:
+            await connection.exec_driver_sql(f"ANALYZE {table.__tablename__}")
+    await ModuleSettingsRegistry().reload()
+    return seeded
+
+
+def build_scenarios(
+    client: httpx.AsyncClient, layout: SeedLayout, seed: int
+) -> dict[str, Callable[[int], Awaitable[int]]]:
+    """Returns calls of the scenarios by name.
+    Every call sends one request with random parameters of the seeded data"""
+    rng = random.Random(seed)
+
+    async def send(method: str, url: str, **kwargs) -> httpx.Response:
+        response = await client.request(method, url, **kwargs)
+        if response.status_code >= 400:
+            raise RuntimeError(
+                f"{method} {url}: {response.status_code} {response.text[:200]}"
+            )
+        return response
+
+    def tmo_id() -> int:
+        return rng.randint(1, layout.tmo_count)
+
+    async def table_columns_default(_: int) -> int:
+        await send("GET", f"/table/columns/default/tmo/{tmo_id()}")
+        return 1
+
+    async def table_filters_default(_: int) -> int:
+        await send("GET", f"/table/filters/default/tmo/{tmo_id()}")
+        return 1
+
+    async def color_range_filter(_: int) -> int:
+        tmo_ids = [str(tmo_id()) for _ in range(5)]
+        response = await send(
+            "POST",
+            "/color_range/filter",
+            json={"tmo_ids": tmo_ids, "limit": 100},
+        )
+        return len(response.json())
+
+    # scrolled by all calls, counts are requested with the first page
+    page_cursor = {"next": None}
+
+    async def color_range_page(_: int) -> int:
+        cursor = page_cursor["next"]
+        response = await send(
+            "POST",
+            "/color_range/filter/page",
+            json={
+                "limit": 100,
+                "cursor": cursor,
+                "with_counts": cursor is None,
+            },
+        )
+        page = response.json()
+        page_cursor["next"] = page["meta"]["next_cursor"]
+        return len(page["elements"])
+
+    async def color_range_defaults(_: int) -> int:
+        response = await send(
+            "GET", "/color_range/defaults", params={"tmo_id": str(tmo_id())}
+        )
+        return len(response.json())
+
+    async def tmo_settings(_: int) -> int:
+        tmo_ids = [tmo_id() for _ in range(5)]
+        await send(
+            "GET", "/tmo_settings/", params=[("tmo_id", t) for t in tmo_ids]
+        )
+        return len(tmo_ids)
+
+    async def state_save(iteration: int) -> int:
+        await send(
+            "POST",
+            "/state/",
+            json={"state": _state_value(iteration), "expires_in_minutes": 60},
+        )
+        return 1
+
+    async def state_get(_: int) -> int:
+        state_id = layout.state_id(rng.randrange(layout.rows))
+        await send("GET", f"/state/{state_id}")
+        return 1
+
+    async def module_settings_all(_: int) -> int:
+        response = await send("GET", "/module_settings")
+        return len(response.json())
+
+    async def module_settings_one(_: int) -> int:
+        await send(
+            "GET",
+            f"/module_settings/{layout.module_name(rng.randrange(MODULES))}",
+        )
+        return 1
+
+    async def module_settings_logs(_: int) -> int:
+        response = await send(
+            "POST",
+            "/module_settings_logs/get_msl_by_filters",
+            json={
+                # logs are filtered by custom names of modules
+                "module_names": [
+                    layout.module_custom_name(rng.randrange(MODULES))
+                ],
+                "limit": 20,
+                "sort_by": [
+                    {"sort_by": "change_time", "sort_direction": "desc"}
+                ],
+            },
+        )
+        return len(response.json()["elements"])
+
+    return {
+        "table_columns_default": table_columns_default,
+        "table_filters_default": table_filters_default,
+        "color_range_filter": color_range_filter,
+        "color_range_page": color_range_page,
+        "color_range_defaults": color_range_defaults,
+        "tmo_settings": tmo_settings,
+        "state_save": state_save,
+        "state_get": state_get,
+        "module_settings_all": module_settings_all,
+        "module_settings_one": module_settings_one,
+        "module_settings_logs": module_settings_logs,
+    }
@@ -0,0 +1,168 @@
+"""
+Benchmark of JSON encoding of responses.
+Encodes payloads shaped like responses of the list endpoints with JSONResponse
+and FastJSONResponse and checks that their output is the same.
+Payloads are prepared by jsonable_encoder, as FastAPI does before encoding.
+
+    cd app && python -m benchmarks.json_encoding --rows 1000
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from benchmarks.common import (
+    add_run_arguments,
+    build_report,
+    finish_report,
+    run_load,
+)
+from v1.utils.serialize import FastJSONResponse
+
+
+class JoinOperator(Enum):
+    AND = "AND"
+    OR = "OR"
+
+
+def table_filters(rows: int) -> list[dict]:
+    """/table/filters/tmo/all"""
+    return [
+        {
+            "id": row,
+            "tmo_id": row % 50 + 1,
+            "name": f"Filter {row} – заявки",
+            "value": {
+                "filters": [
+                    {
+                        "column": f"param_{i}",
+                        "operator": "contains",
+                        "value": f"value {i}",
+                        "enabled": i % 2 == 0,
+                    }
+                    for i in range(15)
+                ],
+                "sort": [{"field": "name", "desc": False}],
+            },
+            "public": row % 2 == 0,
+            "default": False,
+            "created_by": "Benchmark User",
+        }
+        for row in range(rows)
+    ]
+
+
+def filter_sets(rows: int) -> list[dict]:
+    """/process/filterSet"""
+    created = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    return [
+        {
+            "id": row,
+            "name": f"Filter set {row}",
+            "filters": [
+                {
+                    "column": {"name": f"tprm_{i}", "type": "str"},
+                    "operator": "equals",
+                    "value": str(i * row),
+                }
+                for i in range(10)
+            ],
+            "join_operator": JoinOperator.AND if row % 2 else JoinOperator.OR,
+            "tmo_info": {"tmo_id": row % 50, "name": "Cell"},
+            "priority": row % 5,
+            "hidden": False,
+            "created_by": "Benchmark User",
+            "created_at": created + timedelta(minutes=row, microseconds=row),
+            "owner_id": uuid.UUID(int=row),
+        }
+        for row in range(rows)
+    ]
+
+
+def color_ranges(rows: int) -> list[dict]:
+    """/color_range/filter with only_description=false"""
+    return [
+        {
+            "id": row,
+            "tmo_id": str(row % 50),
+            "tprm_id": str(row),
+            "val_type": "float",
+            "name": f"KPI {row}",
+            "value_type": "General",
+            "direction": "asc",
+            "with_indeterminate": True,
+            "with_cleared": False,
+            "ranges": {
+                "colors": [
+                    {"name": f"Tier {i}", "id": i, "hex": "#FF0000"}
+                    for i in range(5)
+                ],
+                "values": [row * 0.25, row * 0.5, row * 0.75, row * 1.5],
+            },
+            "public": True,
+            "default": row % 3 == 0,
+            "created_by": "",
+            "created_by_sub": "",
+        }
+        for row in range(rows)
+    ]
+
+
+PAYLOADS = {
+    "table_filters": table_filters,
+    "filter_sets": filter_sets,
+    "color_ranges": color_ranges,
+}
+ENCODERS = {"json": JSONResponse, "orjson": FastJSONResponse}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--rows", type=int, default=1000, help="items per payload"
+    )
+    add_run_arguments(parser)
+    parser.set_defaults(concurrency=1, duration=3.0, warmup=0.5)
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    names = args.scenarios.split(",") if args.scenarios else PAYLOADS
+    results = []
+    for name in names:
+        content = jsonable_encoder(PAYLOADS[name](args.rows))
+        outputs = {}
+        for encoder_name, response_class in ENCODERS.items():
+            outputs[encoder_name] = response_class(content).body
+
+            async def encode(_: int, response_class=response_class) -> int:
+                response_class(content)
+                return args.rows
+
+            result = await run_load(
+                f"{name}/{encoder_name}",
+                encode,
+                duration=args.duration,
+                concurrency=args.concurrency,
+                warmup=args.warmup,
+            )
+            result.extra["bytes"] = len(outputs[encoder_name])
+            results.append(result)
+        if outputs["json"] != outputs["orjson"]:
+            print(f"Output of {name} differs between encoders")
+    return build_report({"rows": args.rows}, results)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    return finish_report(args, asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Stub of Keycloak and OPA for benchmarks of the secured modes.
+Serves the realm public key, userinfo and allows every OPA decision.
+Tokens are signed with a key generated at start.
+"""
+
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+BENCHMARK_USER = {
+    "sub": "benchmark-user",
+    "given_name": "Benchmark",
+    "family_name": "User",
+    "preferred_username": "benchmark",
+    "realm_access": {"roles": ["__admin"]},
+}
+
+
+class AuthStub:
+    def __init__(self, realm: str):
+        self.realm = realm
+        self._key = rsa.generate_private_key(
+            public_exponent=65537, key_size=2048
+        )
+        public_key = self._key.public_key().public_bytes(
+            serialization.Encoding.DER,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        self._responses = {
+            f"/realms/{realm}": {
+                "realm": realm,
+                "public_key": base64.b64encode(public_key).decode(),
+            },
+            f"/realms/{realm}/protocol/openid-connect/userinfo": {
+                key: value
+                for key, value in BENCHMARK_USER.items()
+                if key != "realm_access"
+            },
+        }
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="auth-stub", daemon=True
+        )
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def issue_token(self, lifetime_seconds: int = 24 * 60 * 60) -> str:
+        now = int(time.time())
+        claims = {**BENCHMARK_USER, "iat": now, "exp": now + lifetime_seconds}
+        return jwt.encode(claims, self._key, algorithm="RS256")
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        responses = self._responses
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                body = responses.get(self.path.rstrip("/"))
+                self._reply(200 if body else 404, body or {})
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path.startswith("/v1/data/"):
+                    self._reply(200, {"result": {"allow": True}})
+                else:
+                    self._reply(404, {})
+
+            def _reply(self, status: int, body: dict) -> None:
+                content = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
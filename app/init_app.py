@@ -6,8 +6,25 @@ from fastapi.openapi.docs import (
     get_swagger_ui_html,
     get_swagger_ui_oauth2_redirect_html,
 )
+from v1.controllers.module_settings.common.registry.registry import (
+    MODULE_SETTINGS_CHANNEL,
+    ModuleSettingsRegistry,
+)
+from v1.controllers.settings_events.common.create.utils import (
+    SETTINGS_EVENTS_CHANNEL,
+)
+from v1.controllers.settings_events.common.hub.hub import SettingsEventsHub
+from v1.metrics.metrics import register_collectors
+from v1.utils.sheduler.job.delete_old_settings_events import (
+    delete_old_settings_events,
+)
 from v1.utils.sheduler.job.delete_old_states import delete_old_states
 from v1.database import Base
+from v1.database.listener import PgListener
+from v1.routers.color_range.utils import (
+    COLOR_RANGES_CHANNEL,
+    ColorRangeDefaultsCache,
+)
 
 import v1.settings as v1_settings
 
@@ -20,8 +37,10 @@ from settings import (
     REDOC_JS_URL,
     DOCS_ENABLED,
     DOCS_CUSTOM_ENABLED,
+    FAST_JSON_ENABLED,
 )
 from v1.database.database import Database
+from v1.utils.serialize import get_json_response_class
 from v1.utils.sheduler.sheduler import Scheduler
 
 
@@ -84,17 +103,44 @@ async def lifespan(app: FastAPI):
     )
     await db.init()
 
+    registry = ModuleSettingsRegistry()
+    await registry.reload()
+
+    listener = PgListener()
+    listener.set_config(database_url=v1_settings.DATABASE_URL)
+    listener.add_callback(MODULE_SETTINGS_CHANNEL, registry.on_notification)
+    listener.add_callback(
+        SETTINGS_EVENTS_CHANNEL, SettingsEventsHub().on_notification
+    )
+    listener.add_callback(
+        COLOR_RANGES_CHANNEL, ColorRangeDefaultsCache().on_notification
+    )
+    await listener.start()
+
     sched = Scheduler()
     sched.add_job(delete_old_states, v1_settings.DROP_INTERVAL_MINUTES)
+    # the registry is in memory of every replica
+    sched.add_job(
+        registry.reload,
+        v1_settings.MODULE_SETTINGS_RELOAD_INTERVAL_MINUTES,
+        exclusive=False,
+    )
+    sched.add_job(delete_old_settings_events, v1_settings.DROP_INTERVAL_MINUTES)
+
+    register_collectors(database=db, scheduler=sched)
 
     yield
 
     sched.shutdown()
+    await listener.stop()
     await db.engine.dispose()
 
 
 def create_app(documentation_enabled: bool = DOCS_ENABLED, **kwargs) -> FastAPI:
     options = kwargs
+    options.setdefault(
+        "default_response_class", get_json_response_class(FAST_JSON_ENABLED)
+    )
     if not documentation_enabled:
         options["openapi_url"] = None
     elif DOCS_CUSTOM_ENABLED:
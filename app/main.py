@@ -1,8 +1,19 @@
 from starlette.middleware.cors import CORSMiddleware
 
 import settings
+import v1.settings as v1_settings
 from init_app import create_app, lifespan
+from v1.metrics.metrics import metrics_endpoint
+from v1.metrics.middleware import (
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    QueryStatsMiddleware,
+    RequestIdMiddleware,
+    ServerTimingMiddleware,
+)
+from v1.metrics.tracing import instrument_app
 from v1.routers.color_range import color_range as color_range_new
+from v1.routers.debug.routers import router as debug_router
 from v1.routers.map import color_range
 from v1.routers.modules import modules
 from v1.routers.module_setting_logs.routers import (
@@ -11,9 +22,14 @@ from v1.routers.module_setting_logs.routers import (
 from v1.routers.module_settings.routers import router as module_settings_router
 from v1.routers.object_params import object_params
 from v1.routers.process import process
+from v1.routers.settings_events.routers import (
+    router as settings_events_router,
+)
 from v1.routers.state import state
 from v1.routers.table import columns, filters
+from v1.routers.tmo_settings import tmo_settings
 from v1.routers.user_settings import user_settings
+from v1.utils.logging_setup import setup_logging
 
 """
 The code below is responsible for setting up the entire microservice before running.
@@ -23,6 +39,8 @@ Prefix sets the main prefix for the entire microservice.
 
 APP_VERSION = "1"
 
+setup_logging()
+
 app = create_app(root_path=settings.PREFIX, lifespan=lifespan)
 
 if settings.DEBUG:
@@ -40,6 +58,25 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+if v1_settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+if v1_settings.QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, excluded_paths={"/metrics"})
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
+if settings.SERVER_TIMING_ENABLED or settings.SLOW_REQUEST_THRESHOLD_MS:
+    app.add_middleware(
+        ServerTimingMiddleware,
+        add_header=settings.SERVER_TIMING_ENABLED,
+        slow_request_ms=settings.SLOW_REQUEST_THRESHOLD_MS,
+    )
+
+app.add_middleware(RequestIdMiddleware)
+
 """
 Configuration block of the first version of the microservice.
 The service is created and the endpoints are connected, as well as mounted into the main application
@@ -68,5 +105,10 @@ app_v1.include_router(color_range_new.router)
 app_v1.include_router(module_settings_router)
 app_v1.include_router(user_settings.router)
 app_v1.include_router(module_settings_logs_router)
+app_v1.include_router(settings_events_router)
+app_v1.include_router(tmo_settings.router)
+app_v1.include_router(debug_router)
+
+instrument_app(app_v1)
 
 app.mount("/v1", app_v1)
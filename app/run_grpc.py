@@ -1,8 +1,8 @@
-import logging
 import asyncio
 from v1.grpc_config.grpc_server import start_grpc_serve
+from v1.utils.logging_setup import setup_logging
 
 
 if __name__ == '__main__':
-    logging.basicConfig(level=logging.INFO)
+    setup_logging()
     asyncio.run(start_grpc_serve())
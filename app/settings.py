@@ -13,6 +13,35 @@ PREFIX = f"/api/{TITLE.replace(' ', '_').lower()}"
 DEBUG = os.environ.get("DEBUG", "False").upper() in ("TRUE", "Y", "YES", "1")
 SECURITY_TYPE = os.environ.get("SECURITY_TYPE", "DISABLE").upper()
 UVICORN_WORKERS = os.environ.get("UVICORN_WORKERS", "")
+# /metrics is served without authentication
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "False").upper() in (
+    "TRUE",
+    "Y",
+    "YES",
+    "1",
+)
+# Server-Timing header with durations of request phases, it reveals
+# internal timings such as auth and db to clients
+SERVER_TIMING_ENABLED = os.environ.get(
+    "SERVER_TIMING_ENABLED", "False"
+).upper() in (
+    "TRUE",
+    "Y",
+    "YES",
+    "1",
+)
+# requests running longer are logged with their phases, 0 disables the log
+SLOW_REQUEST_THRESHOLD_MS = int(
+    os.environ.get("SLOW_REQUEST_THRESHOLD_MS", "0")
+)
+
+# JSON responses are encoded with orjson
+FAST_JSON_ENABLED = os.environ.get("FAST_JSON_ENABLED", "True").upper() in (
+    "TRUE",
+    "Y",
+    "YES",
+    "1",
+)
 
 # DOCUMENTATION
 DOCS_ENABLED = os.environ.get("DOCS_ENABLED", "True").upper() in (
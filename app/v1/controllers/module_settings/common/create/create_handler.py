@@ -10,9 +10,17 @@ from v1.controllers.module_settings.common.get.utils import (
 from v1.controllers.module_settings.common.input_models.models import (
     ModelSettingsCreteModel,
 )
+from v1.controllers.module_settings.common.registry.registry import (
+    ModuleSettingsRegistry,
+)
 from v1.controllers.module_settings_logs.common.builder.msl_builder import (
     ModuleSettingsLogsBuilder,
 )
+from v1.controllers.settings_events.common.create.utils import (
+    SettingsEventAction,
+    SettingsEventKind,
+    add_settings_events,
+)
 from v1.database.models.modules import ModuleSettings
 
 
@@ -118,5 +126,14 @@ class ModuleSettingsCreateHandler:
         """Creates ModuleSettings adds ModuleSettings and ModuleSettingsLogs to the session
         and returns list of created ModuleSettings with saving all changes in the database"""
         res = await self.create_without_commit()
+        await add_settings_events(
+            session=self.session,
+            kind=SettingsEventKind.MODULE_SETTINGS,
+            action=SettingsEventAction.CREATE,
+            keys=[module_settings.module_name for module_settings in res],
+        )
+        registry = ModuleSettingsRegistry()
+        await registry.publish(self.session)
         await self.session.commit()
+        registry.apply(changed=res)
         return res
@@ -7,9 +7,17 @@ from v1.controllers.exceptions.base import ControllerException
 from v1.controllers.module_settings.common.get.utils import (
     get_modules_settings_by_names,
 )
+from v1.controllers.module_settings.common.registry.registry import (
+    ModuleSettingsRegistry,
+)
 from v1.controllers.module_settings_logs.common.builder.msl_builder import (
     ModuleSettingsLogsBuilder,
 )
+from v1.controllers.settings_events.common.create.utils import (
+    SettingsEventAction,
+    SettingsEventKind,
+    add_settings_events,
+)
 from v1.settings import POSTGRES_ITEMS_LIMIT_IN_QUERY
 
 
@@ -91,7 +99,7 @@ class ModuleSettingsDeleteHandler:
                     modified_by_user=self.user_name,
                 )
                 for log in logs.get_list_of_msl_instance():
-                    await self.session.delete(log)
+                    self.session.add(log)
 
                 await self.session.delete(module_settings)
 
@@ -99,4 +107,13 @@ class ModuleSettingsDeleteHandler:
         """Deletes ModuleSettings adds ModuleSettingsLogs to the session
         with saving changes in the database"""
         await self.delete_without_commit()
+        await add_settings_events(
+            session=self.session,
+            kind=SettingsEventKind.MODULE_SETTINGS,
+            action=SettingsEventAction.DELETE,
+            keys=self.modul_names_to_delete,
+        )
+        registry = ModuleSettingsRegistry()
+        await registry.publish(self.session)
         await self.session.commit()
+        registry.apply(deleted=self.modul_names_to_delete)
@@ -0,0 +1,129 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from v1.database.database import Database
+from v1.database.listener import INSTANCE_ID, notify
+from v1.database.models.modules import Module, ModuleSettings
+from v1.utils.serialize import serialize
+from v1.utils.singleton import Singleton
+
+MODULE_SETTINGS_CHANNEL = "module_settings_changed"
+
+
+@dataclass(frozen=True)
+class ModuleSettingsSnapshot:
+    version: int
+    # module name: custom name
+    modules: dict[str, str] = field(default_factory=dict)
+    # module name: serialized ModelSettingsInfo
+    settings: dict[str, bytes] = field(default_factory=dict)
+    # serialized list of all ModelSettingsInfo
+    all_settings: bytes = b"[]"
+
+    @classmethod
+    def build(
+        cls, version: int, modules: dict[str, str], settings: dict[str, dict]
+    ):
+        serialized = {
+            name: serialize({"module_name": name, "settings": value})
+            for name, value in settings.items()
+        }
+        return cls(
+            version=version,
+            modules=modules,
+            settings=serialized,
+            all_settings=b"[" + b",".join(serialized.values()) + b"]",
+        )
+
+
+class ModuleSettingsRegistry(metaclass=Singleton):
+    """App-wide snapshot of modules and module settings.
+    Snapshots are immutable and replaced as a whole, so readers never see
+    partially applied changes."""
+
+    def __init__(self):
+        self._snapshot: ModuleSettingsSnapshot | None = None
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    async def get_snapshot(self) -> ModuleSettingsSnapshot:
+        if self._snapshot is None:
+            await self.reload()
+        return self._snapshot
+
+    async def reload(self, session: AsyncSession | None = None) -> None:
+        """Replaces the snapshot with the current state of the database.
+        Pass session to reuse the session of the current request"""
+        async with self._lock:
+            while True:
+                generation = self._generation
+                if session is None:
+                    async for new_session in Database().get_session():
+                        modules, settings = await self._load(new_session)
+                else:
+                    modules, settings = await self._load(session)
+                # retry if changes were applied while loading
+                if generation == self._generation:
+                    break
+            self._generation += 1
+            self._snapshot = ModuleSettingsSnapshot.build(
+                version=self._generation, modules=modules, settings=settings
+            )
+
+    def apply(
+        self,
+        changed: Iterable[ModuleSettings] = (),
+        deleted: Iterable[str] = (),
+    ) -> None:
+        """Applies committed changes of the current process to the snapshot"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return
+        settings = dict(snapshot.settings)
+        for module_settings in changed:
+            settings[module_settings.module_name] = serialize(
+                {
+                    "module_name": module_settings.module_name,
+                    "settings": module_settings.settings,
+                }
+            )
+        for module_name in deleted:
+            settings.pop(module_name, None)
+
+        self._generation += 1
+        self._snapshot = ModuleSettingsSnapshot(
+            version=self._generation,
+            modules=snapshot.modules,
+            settings=settings,
+            all_settings=b"[" + b",".join(settings.values()) + b"]",
+        )
+
+    @staticmethod
+    async def publish(session: AsyncSession) -> None:
+        """Notifies other replicas about changes after the session commit"""
+        await notify(session, MODULE_SETTINGS_CHANNEL, INSTANCE_ID)
+
+    async def on_notification(self, payload: str | None) -> None:
+        if payload == INSTANCE_ID:
+            return
+        await self.reload()
+
+    @staticmethod
+    async def _load(
+        session: AsyncSession,
+    ) -> tuple[dict[str, str], dict[str, dict]]:
+        stmt = select(
+            Module.name, Module.custom_name, ModuleSettings.settings
+        ).outerjoin(ModuleSettings, ModuleSettings.module_name == Module.name)
+        rows = await session.execute(stmt)
+        modules = dict()
+        settings = dict()
+        for name, custom_name, module_settings in rows.all():
+            modules[name] = custom_name
+            if module_settings is not None:
+                settings[name] = module_settings
+        return modules, settings
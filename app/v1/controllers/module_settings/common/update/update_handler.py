@@ -11,9 +11,17 @@ from v1.controllers.module_settings.common.get.utils import (
 from v1.controllers.module_settings.common.input_models.models import (
     ModelSettingsUpdateModel,
 )
+from v1.controllers.module_settings.common.registry.registry import (
+    ModuleSettingsRegistry,
+)
 from v1.controllers.module_settings_logs.common.builder.msl_builder import (
     ModuleSettingsLogsBuilder,
 )
+from v1.controllers.settings_events.common.create.utils import (
+    SettingsEventAction,
+    SettingsEventKind,
+    add_settings_events,
+)
 from v1.database.models.modules import ModuleSettings
 
 from v1.settings import POSTGRES_ITEMS_LIMIT_IN_QUERY
@@ -178,5 +186,14 @@ class ModuleSettingsUpdateHandler:
         """Updates ModuleSettings adds updated ModuleSettings and ModuleSettingsLogs to the session
         and returns list of updated ModuleSettings with saving all changes in the database"""
         res = await self.update_without_commit()
+        await add_settings_events(
+            session=self.session,
+            kind=SettingsEventKind.MODULE_SETTINGS,
+            action=SettingsEventAction.UPDATE,
+            keys=[module_settings.module_name for module_settings in res],
+        )
+        registry = ModuleSettingsRegistry()
+        await registry.publish(self.session)
         await self.session.commit()
+        registry.apply(changed=res)
         return res
@@ -0,0 +1,49 @@
+from enum import Enum
+from typing import Iterable
+
+from sqlalchemy import func, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from v1.database.models.settings_events import SettingsEvent
+
+SETTINGS_EVENTS_CHANNEL = "settings_events"
+
+
+class SettingsEventKind(str, Enum):
+    MODULE_SETTINGS = "module_settings"
+    MODULES = "modules"
+    USER_SETTINGS = "user_settings"
+
+
+class SettingsEventAction(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+async def add_settings_events(
+    session: AsyncSession,
+    kind: SettingsEventKind,
+    action: SettingsEventAction,
+    keys: Iterable[str],
+    username: str | None = None,
+) -> None:
+    """Adds events to the session transaction. Subscribers are notified
+    after commit"""
+    values = [
+        {
+            "kind": kind.value,
+            "action": action.value,
+            "key": key,
+            "username": username,
+        }
+        for key in keys
+    ]
+    if not values:
+        return
+    # notifications with the same payload are delivered once per transaction,
+    # so notifying per row keeps it a single statement
+    stmt = insert(SettingsEvent.__table__).returning(
+        func.pg_notify(SETTINGS_EVENTS_CHANNEL, "")
+    )
+    await session.execute(stmt, values)
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from v1.controllers.settings_events.common.create.utils import (
+    SettingsEventKind,
+)
+from v1.controllers.settings_events.common.output_models.models import (
+    SettingsEventModel,
+)
+from v1.database.database import Database
+from v1.database.models.settings_events import SettingsEvent
+from v1.utils.singleton import Singleton
+
+logger = logging.getLogger(__name__)
+
+# ids are taken from a sequence before commit, so events of concurrent
+# transactions can become visible out of order. Ids skipped by a fetch are
+# checked again by the next fetches until they are committed or expire,
+# ids of rolled back transactions never are
+GAP_TIMEOUT_SECONDS = 60
+MAX_GAPS = 1000
+
+
+@dataclass(eq=False)
+class Subscriber:
+    queue: asyncio.Queue
+    kinds: set[SettingsEventKind]
+    username: str
+    # set when the subscriber can't keep up and has to reconnect
+    overflowed: bool = False
+
+    def accepts(self, event: SettingsEventModel) -> bool:
+        if event.kind not in self.kinds:
+            return False
+        if event.kind == SettingsEventKind.USER_SETTINGS:
+            return event.username == self.username
+        return True
+
+
+def get_events_stmt(
+    after_id: int, kinds: set[SettingsEventKind], username: str
+):
+    """Returns query of the events after after_id which Subscriber with the same
+    kinds and username accepts"""
+    condition = SettingsEvent.kind.in_(
+        [k.value for k in kinds if k != SettingsEventKind.USER_SETTINGS]
+    )
+    if SettingsEventKind.USER_SETTINGS in kinds:
+        condition = or_(
+            condition,
+            and_(
+                SettingsEvent.kind == SettingsEventKind.USER_SETTINGS.value,
+                SettingsEvent.username == username,
+            ),
+        )
+    return (
+        select(SettingsEvent)
+        .where(SettingsEvent.id > after_id, condition)
+        .order_by(SettingsEvent.id)
+    )
+
+
+async def get_first_event_id(session: AsyncSession) -> int | None:
+    return await session.scalar(select(func.min(SettingsEvent.id)))
+
+
+class SettingsEventsHub(metaclass=Singleton):
+    """Fans out new rows of the settings_events table to the subscribers.
+    One query per notification is shared by all subscribers of the process"""
+
+    def __init__(self):
+        self._subscribers: set[Subscriber] = set()
+        self._last_id: int | None = None
+        # skipped id: monotonic time it expires at, in the order of ids
+        self._gaps: dict[int, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def subscribe(
+        self, kinds: set[SettingsEventKind], username: str, queue_size: int
+    ) -> Subscriber:
+        """Returns Subscriber which receives all events committed after the call"""
+        async with self._lock:
+            if self._last_id is None:
+                async for session in Database().get_session():
+                    await self._fetch(session, deliver=False)
+            subscriber = Subscriber(
+                queue=asyncio.Queue(maxsize=queue_size),
+                kinds=kinds,
+                username=username,
+            )
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+        if not self._subscribers:
+            # stop tracking, the next subscriber starts from the current state
+            self._last_id = None
+            self._gaps.clear()
+
+    async def on_notification(self, payload: str | None) -> None:
+        if self._last_id is None:
+            return
+        try:
+            async with self._lock:
+                async for session in Database().get_session():
+                    await self._fetch(session)
+        except Exception:
+            logger.exception("Can't fetch settings events")
+
+    async def _fetch(self, session: AsyncSession, deliver: bool = True) -> None:
+        if self._last_id is None:
+            last_id = await session.scalar(select(func.max(SettingsEvent.id)))
+            # recent ids can still be held by uncommitted transactions
+            self._last_id = max((last_id or 0) - MAX_GAPS, 0)
+        self._expire_gaps()
+        condition = SettingsEvent.id > self._last_id
+        if self._gaps:
+            condition = or_(condition, SettingsEvent.id.in_(list(self._gaps)))
+        events = await session.scalars(
+            select(SettingsEvent).where(condition).order_by(SettingsEvent.id)
+        )
+        for event in events.all():
+            if event.id > self._last_id:
+                self._add_gaps(self._last_id + 1, event.id)
+                self._last_id = event.id
+            else:
+                del self._gaps[event.id]
+            if deliver:
+                self._broadcast(SettingsEventModel.model_validate(event))
+
+    def _add_gaps(self, start: int, stop: int) -> None:
+        expires_at = time.monotonic() + GAP_TIMEOUT_SECONDS
+        for event_id in range(max(start, stop - MAX_GAPS), stop):
+            self._gaps[event_id] = expires_at
+        while len(self._gaps) > MAX_GAPS:
+            del self._gaps[next(iter(self._gaps))]
+
+    def _expire_gaps(self) -> None:
+        now = time.monotonic()
+        expired = [
+            event_id
+            for event_id, expires_at in self._gaps.items()
+            if expires_at <= now
+        ]
+        for event_id in expired:
+            del self._gaps[event_id]
+
+    def _broadcast(self, event: SettingsEventModel) -> None:
+        for subscriber in list(self._subscribers):
+            if subscriber.overflowed or not subscriber.accepts(event):
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                subscriber.overflowed = True
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from v1.controllers.settings_events.common.create.utils import (
+    SettingsEventAction,
+    SettingsEventKind,
+)
+
+
+class SettingsEventModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    kind: SettingsEventKind
+    action: SettingsEventAction
+    key: str
+    created_at: datetime
+    username: str | None = Field(default=None, exclude=True)
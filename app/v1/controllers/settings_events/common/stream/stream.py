@@ -0,0 +1,76 @@
+import asyncio
+from typing import AsyncGenerator
+
+from v1.controllers.settings_events.common.create.utils import (
+    SettingsEventKind,
+)
+from v1.controllers.settings_events.common.hub.hub import (
+    SettingsEventsHub,
+    get_events_stmt,
+    get_first_event_id,
+)
+from v1.controllers.settings_events.common.output_models.models import (
+    SettingsEventModel,
+)
+from v1.database.database import Database
+from v1.settings import (
+    SETTINGS_EVENTS_HEARTBEAT_SECONDS,
+    SETTINGS_EVENTS_QUEUE_SIZE,
+)
+
+# time in milliseconds the client waits before reconnecting
+RECONNECT_RETRY_MS = 3000
+
+
+def format_event(event: SettingsEventModel) -> str:
+    return (
+        f"id: {event.id}\n"
+        f"event: {event.kind.value}\n"
+        f"data: {event.model_dump_json()}\n\n"
+    )
+
+
+async def stream_settings_events(
+    kinds: set[SettingsEventKind],
+    username: str,
+    last_event_id: int | None = None,
+) -> AsyncGenerator[str, None]:
+    """Yields Server-Sent Events with changes of the settings.
+    If last_event_id is given, missed events are sent first, or the resync event
+    if some of them were already dropped from the database.
+    The stream ends when the client can't keep up, so it reconnects and resumes"""
+    hub = SettingsEventsHub()
+    subscriber = await hub.subscribe(
+        kinds=kinds, username=username, queue_size=SETTINGS_EVENTS_QUEUE_SIZE
+    )
+    try:
+        yield f"retry: {RECONNECT_RETRY_MS}\n\n"
+
+        replayed_ids = set()
+        if last_event_id is not None:
+            async for session in Database().get_session():
+                first_id = await get_first_event_id(session)
+                if first_id is None or first_id > last_event_id + 1:
+                    yield "event: resync\ndata: {}\n\n"
+                else:
+                    stmt = get_events_stmt(last_event_id, kinds, username)
+                    for event in (await session.scalars(stmt)).all():
+                        replayed_ids.add(event.id)
+                        yield format_event(
+                            SettingsEventModel.model_validate(event)
+                        )
+
+        while not (subscriber.overflowed and subscriber.queue.empty()):
+            try:
+                event = await asyncio.wait_for(
+                    subscriber.queue.get(),
+                    timeout=SETTINGS_EVENTS_HEARTBEAT_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if event.id in replayed_ids:
+                continue
+            yield format_event(event)
+    finally:
+        hub.unsubscribe(subscriber)
@@ -10,6 +10,8 @@ from .models.fault_manager import (
     FaultFiltersTable,
 )
 from .models.user_settings import UserSettingsOrm
+from .models.settings_events import SettingsEvent
+from .models.scheduler import SchedulerLease
 from .model import Base
 
 __all__ = [
@@ -28,4 +30,6 @@ __all__ = [
     "ModuleSettings",
     "UserSettingsOrm",
     "ModuleSettingsLogs",
+    "SettingsEvent",
+    "SchedulerLease",
 ]
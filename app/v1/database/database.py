@@ -5,8 +5,7 @@ Use get_session every time you send a new query to the database.
 """
 
 import asyncio
-import traceback
-from sys import stderr
+import logging
 from typing import AsyncIterator
 
 from fastapi import HTTPException, status, Depends
@@ -21,10 +20,16 @@ from sqlalchemy.ext.asyncio import (
 
 from fastapi.requests import Request
 
+from v1.metrics.queries import QueryStats
+from v1.metrics.timing import register_session_timing
+from v1.metrics.tracing import instrument_engine
 from v1.security.security_data_models import UserData
 from v1.security.security_factory import security
+from v1.settings import QUERY_STATS_ENABLED, SLOW_QUERY_THRESHOLD_MS
 from v1.utils.singleton import Singleton
 
+logger = logging.getLogger(__name__)
+
 ACTIONS = {
     "POST": "create",
     "GET": "read",
@@ -61,6 +66,13 @@ class Database(metaclass=Singleton):
                     },
                 },
             )
+            if QUERY_STATS_ENABLED:
+                QueryStats().attach(
+                    self.engine.sync_engine,
+                    slow_query_ms=SLOW_QUERY_THRESHOLD_MS,
+                )
+            register_session_timing()
+            instrument_engine(self.engine.sync_engine)
             async_session_factory = async_sessionmaker(
                 self.engine,
                 class_=AsyncSession,
@@ -73,8 +85,8 @@ class Database(metaclass=Singleton):
             )
             async with self.engine.begin() as connection:
                 await connection.run_sync(self._metadata.create_all)
-        except Exception as e:
-            print(traceback.format_exception(e), file=stderr)
+        except Exception:
+            logger.exception("Database connection error")
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Database connection error.",
@@ -0,0 +1,106 @@
+"""
+Dedicated connection that LISTENs to PostgreSQL notification channels.
+Use notify to publish a notification inside the current transaction,
+it is delivered to all listeners when the transaction commits.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from typing import Awaitable, Callable
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from v1.utils.singleton import Singleton
+
+logger = logging.getLogger(__name__)
+
+# identifies notifications sent by the current process
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+RECONNECT_DELAY_SECONDS = 5
+
+# receives the payload or None if notifications could have been missed
+NotificationCallback = Callable[[str | None], Awaitable[None]]
+
+
+async def notify(session: AsyncSession, channel: str, payload: str) -> None:
+    """Sends a notification, which will be delivered after commit"""
+    await session.execute(select(func.pg_notify(channel, payload)))
+
+
+class PgListener(metaclass=Singleton):
+    def __init__(self):
+        self._dsn = None
+        self._connection: asyncpg.Connection | None = None
+        self._callbacks: dict[str, list[NotificationCallback]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._reconnect_task: asyncio.Task | None = None
+        self._stopped = False
+
+    def set_config(self, database_url: str):
+        url = make_url(database_url).set(drivername="postgresql")
+        self._dsn = url.render_as_string(hide_password=False)
+
+    def add_callback(self, channel: str, callback: NotificationCallback):
+        self._callbacks.setdefault(channel, []).append(callback)
+
+    async def start(self):
+        self._stopped = False
+        try:
+            await self._connect()
+        except (OSError, asyncpg.PostgresError) as e:
+            logger.warning("Notification listener is not connected: %s", e)
+            self._schedule_reconnect()
+
+    async def stop(self):
+        self._stopped = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+    async def _connect(self):
+        self._connection = await asyncpg.connect(
+            self._dsn,
+            server_settings={"application_name": "Frontend Settings MS"},
+        )
+        self._connection.add_termination_listener(self._on_termination)
+        for channel in self._callbacks:
+            await self._connection.add_listener(channel, self._on_notification)
+
+    def _on_notification(self, connection, pid, channel: str, payload: str):
+        self._dispatch(channel, payload)
+
+    def _on_termination(self, connection):
+        if not self._stopped:
+            logger.warning("Notification listener connection was lost")
+            self._schedule_reconnect()
+
+    def _dispatch(self, channel: str, payload: str | None):
+        for callback in self._callbacks.get(channel, []):
+            task = asyncio.create_task(callback(payload))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _schedule_reconnect(self):
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self):
+        while not self._stopped:
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+            try:
+                await self._connect()
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("Notification listener reconnect failed: %s", e)
+                continue
+            # notifications sent while disconnected are lost
+            for channel in self._callbacks:
+                self._dispatch(channel, None)
+            return
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Boolean, UniqueConstraint, JSON
+from sqlalchemy import String, Boolean, UniqueConstraint, JSON, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -60,6 +60,15 @@ class ColorRangeTableNew(Base):
     __tableargs__ = UniqueConstraint(
         tmo_id, tprm_id, name, created_by, name="color_range_unique"
     )
+    __table_args__ = (
+        # defaults of (tmo_id, tprm_id) pairs are selected with DISTINCT ON
+        Index(
+            "ix_color_range_default_tmo_id_tprm_id",
+            "tmo_id",
+            "tprm_id",
+            postgresql_where=text('"default"'),
+        ),
+    )
 
     def update_from(self, item: dict):
         for key, value in item.items():
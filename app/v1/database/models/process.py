@@ -3,14 +3,25 @@ from typing import List
 from sqlalchemy.sql import expression
 
 from ..model import Base
-from sqlalchemy import Column, Integer, String, JSON, Boolean, UniqueConstraint
+from ..packing import register_packed_column
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    JSON,
+    Boolean,
+    UniqueConstraint,
+    LargeBinary,
+)
 
 
 class FilterSet(Base):
     __tablename__ = "filter_set"
     id: int = Column("id", Integer, primary_key=True)
     name: str = Column("name", String, nullable=False)
-    filters: List[dict] = Column("filters", JSON, nullable=False)
+    # NULL if filters are packed
+    filters: List[dict] = Column("filters", JSON, nullable=True)
+    filters_packed: bytes = Column("filters_packed", LargeBinary, nullable=True)
     join_operator: str = Column("join_operator", String, nullable=True)
     created_by: str = Column("created_by", String, nullable=False)
     created_by_sub: str = Column("created_by_sub", String, nullable=False)
@@ -28,3 +39,6 @@ class FilterSet(Base):
     __tableargs__ = UniqueConstraint(
         "name", "created_by_sub", name="_user_filters"
     )
+
+
+register_packed_column(FilterSet, "filters", "filters_packed")
@@ -0,0 +1,24 @@
+""" "DB models for the scheduler"""
+
+import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..model import Base
+
+
+class SchedulerLease(Base):
+    """Job is run by the replica which holds its lease"""
+
+    __tablename__ = "scheduler_leases"
+
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    owner: Mapped[str] = mapped_column(String, nullable=False)
+    expires_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    # start of the last run, runs of the next interval start after it
+    started_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
@@ -0,0 +1,22 @@
+""" "DB models for the feed of settings changes"""
+
+import datetime
+
+from sqlalchemy import BigInteger, String, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..model import Base
+
+
+class SettingsEvent(Base):
+    __tablename__ = "settings_events"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    kind: Mapped[str] = mapped_column(String, nullable=False)
+    action: Mapped[str] = mapped_column(String, nullable=False)
+    key: Mapped[str] = mapped_column(String, nullable=False)
+    # owner of user settings, None for events visible to everyone
+    username: Mapped[str | None] = mapped_column(String, nullable=True)
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        server_default=text("TIMEZONE('utc', now())"), index=True
+    )
@@ -2,13 +2,21 @@ from __future__ import annotations
 
 import datetime
 
-from sqlalchemy import DateTime, String, CheckConstraint
+from sqlalchemy import (
+    DateTime,
+    String,
+    CheckConstraint,
+    Index,
+    LargeBinary,
+    text,
+)
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.dialects.postgresql import UUID as _UUIDC, JSONB
 from uuid import UUID, uuid4
 
 from ..model import Base
+from ..packing import register_packed_column
 
 UUIDC = _UUIDC(as_uuid=True)
 
@@ -19,17 +27,34 @@ class State(Base):
     id: Mapped[UUID] = mapped_column(
         UUIDC, default=uuid4, primary_key=True, index=True, nullable=False
     )
-    value: Mapped[dict] = mapped_column(
-        JSONB(none_as_null=True), nullable=False
+    # NULL if the value is packed
+    value: Mapped[dict | None] = mapped_column(
+        JSONB(none_as_null=True), nullable=True
+    )
+    value_packed: Mapped[bytes | None] = mapped_column(
+        LargeBinary, nullable=True
     )
     creation_date: Mapped[datetime] = mapped_column(
         DateTime(timezone=False), default=datetime.datetime.now, nullable=False
     )
     expire_date: Mapped[datetime] = mapped_column(
-        DateTime(timezone=False), nullable=True
+        DateTime(timezone=False), nullable=True, index=True
     )
     created_by: Mapped[str] = mapped_column(String, nullable=False)
+    # sha256 of the canonical JSON of deduplicated states
+    content_hash: Mapped[bytes | None] = mapped_column(
+        LargeBinary, nullable=True
+    )
 
     __table_args__ = (
         CheckConstraint("expire_date >= creation_date", name="exp_qe_cr"),
+        Index(
+            "ix_state_content_hash",
+            "content_hash",
+            unique=True,
+            postgresql_where=text("content_hash IS NOT NULL"),
+        ),
     )
+
+
+register_packed_column(State, "value", "value_packed")
@@ -1,8 +1,9 @@
-from sqlalchemy import String, Boolean, UniqueConstraint, Integer
+from sqlalchemy import String, Boolean, UniqueConstraint, Integer, LargeBinary
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..model import Base
+from ..packing import register_packed_column
 
 """
 Web table view settings
@@ -15,7 +16,11 @@ class ColumnsTable(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     tmo_id: Mapped[int] = mapped_column(Integer, nullable=False)
     name: Mapped[str] = mapped_column(String)
-    value: Mapped[dict] = mapped_column(JSONB)
+    # NULL if the value is packed
+    value: Mapped[dict | None] = mapped_column(JSONB)
+    value_packed: Mapped[bytes | None] = mapped_column(
+        LargeBinary, nullable=True
+    )
     created_by: Mapped[str] = mapped_column(String, nullable=False)
     created_by_sub: Mapped[str] = mapped_column(String, nullable=False)
     public: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
@@ -40,7 +45,11 @@ class FiltersTable(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     tmo_id: Mapped[int] = mapped_column(Integer, nullable=False)
     name: Mapped[str] = mapped_column(String, unique=True)
-    value: Mapped[dict] = mapped_column(JSONB)
+    # NULL if the value is packed
+    value: Mapped[dict | None] = mapped_column(JSONB)
+    value_packed: Mapped[bytes | None] = mapped_column(
+        LargeBinary, nullable=True
+    )
     created_by: Mapped[str] = mapped_column(String, nullable=False)
     created_by_sub: Mapped[str] = mapped_column(String, nullable=False)
     public: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
@@ -57,3 +66,7 @@ class FiltersTable(Base):
             if key not in self.__dict__:
                 continue
             setattr(self, key, value)
+
+
+register_packed_column(ColumnsTable, "value", "value_packed")
+register_packed_column(FiltersTable, "value", "value_packed")
@@ -0,0 +1,116 @@
+"""
+Optional compressed storage of large JSON documents.
+A packed document is kept in a separate bytea column, while the JSON column is NULL.
+Packed bytes are one header byte with the codec followed by the compressed
+UTF-8 JSON, so they can be passed through without decoding the document.
+"""
+
+import gzip
+import json
+import logging
+
+from sqlalchemy import event, null
+from sqlalchemy.orm import attributes
+
+from v1 import settings
+from v1.utils.serialize import serialize
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+GZIP_CODEC = 1
+ZSTD_CODEC = 2
+
+if settings.STORAGE_COMPRESSION_CODEC == "zstd" and zstandard is None:
+    logger.warning("zstandard is not installed, gzip is used for compression")
+
+
+def _get_codec() -> int:
+    if settings.STORAGE_COMPRESSION_CODEC == "zstd" and zstandard is not None:
+        return ZSTD_CODEC
+    return GZIP_CODEC
+
+
+def pack(content: bytes) -> bytes:
+    """Compresses serialized JSON document"""
+    codec = _get_codec()
+    if codec == ZSTD_CODEC:
+        compressed = zstandard.ZstdCompressor().compress(content)
+    else:
+        compressed = gzip.compress(content, compresslevel=6, mtime=0)
+    return bytes([codec]) + compressed
+
+
+def pack_if_large(value) -> bytes | None:
+    """Returns packed value if packing is enabled and the value is large enough"""
+    threshold = settings.STORAGE_COMPRESSION_THRESHOLD_BYTES
+    if threshold <= 0 or value is None:
+        return None
+    content = serialize(value)
+    if len(content) < threshold:
+        return None
+    return pack(content)
+
+
+def get_codec(packed: bytes) -> int:
+    return packed[0]
+
+
+def unpack_json(packed: bytes) -> bytes:
+    """Returns serialized JSON document without decoding it"""
+    codec, compressed = packed[0], packed[1:]
+    if codec == GZIP_CODEC:
+        return gzip.decompress(compressed)
+    if codec == ZSTD_CODEC:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read packed document")
+        return zstandard.ZstdDecompressor().decompress(compressed)
+    raise ValueError(f"Unknown codec of packed document: {codec}")
+
+
+def unpack(packed: bytes):
+    return json.loads(unpack_json(packed))
+
+
+def unpack_item(item: dict, json_key: str, packed_key: str) -> dict:
+    """Replaces packed_key of a selected row with the unpacked json_key"""
+    packed = item.pop(packed_key, None)
+    if packed is not None:
+        item[json_key] = unpack(packed)
+    return item
+
+
+def register_packed_column(model, json_attr: str, packed_attr: str) -> None:
+    """Packs large values of json_attr into packed_attr on flush and unpacks them
+    on load, so the model is used the same way as without packing"""
+
+    def on_load(target, *args):
+        # packed bytes are removed from the loaded attributes, so they are
+        # neither kept in memory nor exposed by endpoints returning __dict__
+        packed = target.__dict__.pop(packed_attr, None)
+        if packed is not None:
+            attributes.set_committed_value(target, json_attr, unpack(packed))
+
+    def before_insert(mapper, connection, target):
+        packed = pack_if_large(target.__dict__.get(json_attr))
+        setattr(target, packed_attr, packed)
+        if packed is not None:
+            setattr(target, json_attr, null())
+
+    def before_update(mapper, connection, target):
+        if attributes.get_history(target, json_attr).has_changes():
+            before_insert(mapper, connection, target)
+
+    def after_flush(mapper, connection, target):
+        on_load(target)
+
+    event.listen(model, "load", on_load)
+    event.listen(model, "refresh", on_load)
+    event.listen(model, "before_insert", before_insert)
+    event.listen(model, "before_update", before_update)
+    event.listen(model, "after_insert", after_flush)
+    event.listen(model, "after_update", after_flush)
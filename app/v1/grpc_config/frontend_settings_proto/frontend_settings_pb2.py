@@ -14,7 +14,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x17\x66rontend_settings.proto\x12\x11\x66rontend_settings\"Z\n\x13PreferenceInstances\x12\x43\n\x14preference_instances\x18\x01 \x03(\x0b\x32%.frontend_settings.PreferenceInstance\"\xd5\x01\n\x17RequestObjectForPalette\x12Z\n\x11tmo_id_preference\x18\x01 \x03(\x0b\x32?.frontend_settings.RequestObjectForPalette.TmoIdPreferenceEntry\x1a^\n\x14TmoIdPreferenceEntry\x12\x0b\n\x03key\x18\x01 \x01(\x05\x12\x35\n\x05value\x18\x02 \x01(\x0b\x32&.frontend_settings.PreferenceInstances:\x02\x38\x01\"O\n\x12PreferenceInstance\x12\x17\n\x0fpreference_name\x18\x01 \x01(\t\x12\x10\n\x08val_type\x18\x02 \x01(\t\x12\x0e\n\x06kpi_id\x18\x03 \x01(\x05\"$\n\x0bWrongKpiIds\x12\x15\n\rwrong_kpi_ids\x18\x01 \x03(\x05\"\x86\x01\n PreferenceInstanceForWithPalette\x12\x17\n\x0fpreference_name\x18\x01 \x01(\t\x12\x10\n\x08val_type\x18\x02 \x01(\t\x12\x0e\n\x06kpi_id\x18\x03 \x01(\x05\x12\x0f\n\x07palette\x18\x04 \x01(\t\x12\x16\n\x0eobject_type_id\x18\x05 \x01(\x05\"n\n\x19RequestToSetCustomPalette\x12Q\n\x14preference_instances\x18\x01 \x03(\x0b\x32\x33.frontend_settings.PreferenceInstanceForWithPalette2\xea\x01\n\x10\x46rontendSettings\x12i\n\x19SetDefaultPaletteForItems\x12*.frontend_settings.RequestObjectForPalette\x1a\x1e.frontend_settings.WrongKpiIds\"\x00\x12k\n\x19SetCustomColorRangeForKPI\x12,.frontend_settings.RequestToSetCustomPalette\x1a\x1e.frontend_settings.WrongKpiIds\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x17\x66rontend_settings.proto\x12\x11\x66rontend_settings\"Z\n\x13PreferenceInstances\x12\x43\n\x14preference_instances\x18\x01 \x03(\x0b\x32%.frontend_settings.PreferenceInstance\"\xd5\x01\n\x17RequestObjectForPalette\x12Z\n\x11tmo_id_preference\x18\x01 \x03(\x0b\x32?.frontend_settings.RequestObjectForPalette.TmoIdPreferenceEntry\x1a^\n\x14TmoIdPreferenceEntry\x12\x0b\n\x03key\x18\x01 \x01(\x05\x12\x35\n\x05value\x18\x02 \x01(\x0b\x32&.frontend_settings.PreferenceInstances:\x02\x38\x01\"O\n\x12PreferenceInstance\x12\x17\n\x0fpreference_name\x18\x01 \x01(\t\x12\x10\n\x08val_type\x18\x02 \x01(\t\x12\x0e\n\x06kpi_id\x18\x03 \x01(\x05\"$\n\x0bWrongKpiIds\x12\x15\n\rwrong_kpi_ids\x18\x01 \x03(\x05\"\x86\x01\n PreferenceInstanceForWithPalette\x12\x17\n\x0fpreference_name\x18\x01 \x01(\t\x12\x10\n\x08val_type\x18\x02 \x01(\t\x12\x0e\n\x06kpi_id\x18\x03 \x01(\x05\x12\x0f\n\x07palette\x18\x04 \x01(\t\x12\x16\n\x0eobject_type_id\x18\x05 \x01(\x05\"n\n\x19RequestToSetCustomPalette\x12Q\n\x14preference_instances\x18\x01 \x03(\x0b\x32\x33.frontend_settings.PreferenceInstanceForWithPalette\"B\n\rColorRangeKey\x12\x0e\n\x06tmo_id\x18\x01 \x01(\x05\x12\x0f\n\x07tprm_id\x18\x02 \x01(\x05\x12\x10\n\x08val_type\x18\x03 \x01(\t\"K\n\x19RequestDefaultColorRanges\x12.\n\x04keys\x18\x01 \x03(\x0b\x32 .frontend_settings.ColorRangeKey\"\xc9\x01\n\x11\x44\x65\x66\x61ultColorRange\x12\x0e\n\x06tmo_id\x18\x01 \x01(\x05\x12\x0f\n\x07tprm_id\x18\x02 \x01(\x05\x12\n\n\x02id\x18\x03 \x01(\x05\x12\x0c\n\x04name\x18\x04 \x01(\t\x12\x10\n\x08val_type\x18\x05 \x01(\t\x12\x12\n\nvalue_type\x18\x06 \x01(\t\x12\x11\n\tdirection\x18\x07 \x01(\t\x12\x1a\n\x12with_indeterminate\x18\x08 \x01(\x08\x12\x14\n\x0cwith_cleared\x18\t \x01(\x08\x12\x0e\n\x06ranges\x18\n \x01(\t\"P\n\x12\x44\x65\x66\x61ultColorRanges\x12:\n\x0c\x63olor_ranges\x18\x01 \x03(\x0b\x32$.frontend_settings.DefaultColorRange\"P\n\x15RequestClassifyValues\x12\x16\n\x0e\x63olor_range_id\x18\x01 \x01(\x05\x12\x0e\n\x06values\x18\x02 \x03(\x01\x12\x0f\n\x07\x63leared\x18\x03 \x03(\x08\"3\n\x10\x43lassifiedValues\x12\x0f\n\x07indices\x18\x01 \x03(\x05\x12\x0e\n\x06\x63olors\x18\x02 \x03(\t2\xbd\x03\n\x10\x46rontendSettings\x12i\n\x19SetDefaultPaletteForItems\x12*.frontend_settings.RequestObjectForPalette\x1a\x1e.frontend_settings.WrongKpiIds\"\x00\x12k\n\x19SetCustomColorRangeForKPI\x12,.frontend_settings.RequestToSetCustomPalette\x1a\x1e.frontend_settings.WrongKpiIds\"\x00\x12n\n\x15GetDefaultColorRanges\x12,.frontend_settings.RequestDefaultColorRanges\x1a%.frontend_settings.DefaultColorRanges\"\x00\x12\x61\n\x0e\x43lassifyValues\x12(.frontend_settings.RequestClassifyValues\x1a#.frontend_settings.ClassifiedValues\"\x00\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -37,6 +37,18 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _globals['_PREFERENCEINSTANCEFORWITHPALETTE']._serialized_end=608
   _globals['_REQUESTTOSETCUSTOMPALETTE']._serialized_start=610
   _globals['_REQUESTTOSETCUSTOMPALETTE']._serialized_end=720
-  _globals['_FRONTENDSETTINGS']._serialized_start=723
-  _globals['_FRONTENDSETTINGS']._serialized_end=957
+  _globals['_COLORRANGEKEY']._serialized_start=722
+  _globals['_COLORRANGEKEY']._serialized_end=788
+  _globals['_REQUESTDEFAULTCOLORRANGES']._serialized_start=790
+  _globals['_REQUESTDEFAULTCOLORRANGES']._serialized_end=865
+  _globals['_DEFAULTCOLORRANGE']._serialized_start=868
+  _globals['_DEFAULTCOLORRANGE']._serialized_end=1069
+  _globals['_DEFAULTCOLORRANGES']._serialized_start=1071
+  _globals['_DEFAULTCOLORRANGES']._serialized_end=1151
+  _globals['_REQUESTCLASSIFYVALUES']._serialized_start=1153
+  _globals['_REQUESTCLASSIFYVALUES']._serialized_end=1233
+  _globals['_CLASSIFIEDVALUES']._serialized_start=1235
+  _globals['_CLASSIFIEDVALUES']._serialized_end=1286
+  _globals['_FRONTENDSETTINGS']._serialized_start=1289
+  _globals['_FRONTENDSETTINGS']._serialized_end=1734
 # @@protoc_insertion_point(module_scope)
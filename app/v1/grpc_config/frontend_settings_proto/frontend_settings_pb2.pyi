@@ -59,3 +59,67 @@ class RequestToSetCustomPalette(_message.Message):
     PREFERENCE_INSTANCES_FIELD_NUMBER: _ClassVar[int]
     preference_instances: _containers.RepeatedCompositeFieldContainer[PreferenceInstanceForWithPalette]
     def __init__(self, preference_instances: _Optional[_Iterable[_Union[PreferenceInstanceForWithPalette, _Mapping]]] = ...) -> None: ...
+
+class ColorRangeKey(_message.Message):
+    __slots__ = ("tmo_id", "tprm_id", "val_type")
+    TMO_ID_FIELD_NUMBER: _ClassVar[int]
+    TPRM_ID_FIELD_NUMBER: _ClassVar[int]
+    VAL_TYPE_FIELD_NUMBER: _ClassVar[int]
+    tmo_id: int
+    tprm_id: int
+    val_type: str
+    def __init__(self, tmo_id: _Optional[int] = ..., tprm_id: _Optional[int] = ..., val_type: _Optional[str] = ...) -> None: ...
+
+class RequestDefaultColorRanges(_message.Message):
+    __slots__ = ("keys",)
+    KEYS_FIELD_NUMBER: _ClassVar[int]
+    keys: _containers.RepeatedCompositeFieldContainer[ColorRangeKey]
+    def __init__(self, keys: _Optional[_Iterable[_Union[ColorRangeKey, _Mapping]]] = ...) -> None: ...
+
+class DefaultColorRange(_message.Message):
+    __slots__ = ("tmo_id", "tprm_id", "id", "name", "val_type", "value_type", "direction", "with_indeterminate", "with_cleared", "ranges")
+    TMO_ID_FIELD_NUMBER: _ClassVar[int]
+    TPRM_ID_FIELD_NUMBER: _ClassVar[int]
+    ID_FIELD_NUMBER: _ClassVar[int]
+    NAME_FIELD_NUMBER: _ClassVar[int]
+    VAL_TYPE_FIELD_NUMBER: _ClassVar[int]
+    VALUE_TYPE_FIELD_NUMBER: _ClassVar[int]
+    DIRECTION_FIELD_NUMBER: _ClassVar[int]
+    WITH_INDETERMINATE_FIELD_NUMBER: _ClassVar[int]
+    WITH_CLEARED_FIELD_NUMBER: _ClassVar[int]
+    RANGES_FIELD_NUMBER: _ClassVar[int]
+    tmo_id: int
+    tprm_id: int
+    id: int
+    name: str
+    val_type: str
+    value_type: str
+    direction: str
+    with_indeterminate: bool
+    with_cleared: bool
+    ranges: str
+    def __init__(self, tmo_id: _Optional[int] = ..., tprm_id: _Optional[int] = ..., id: _Optional[int] = ..., name: _Optional[str] = ..., val_type: _Optional[str] = ..., value_type: _Optional[str] = ..., direction: _Optional[str] = ..., with_indeterminate: bool = ..., with_cleared: bool = ..., ranges: _Optional[str] = ...) -> None: ...
+
+class DefaultColorRanges(_message.Message):
+    __slots__ = ("color_ranges",)
+    COLOR_RANGES_FIELD_NUMBER: _ClassVar[int]
+    color_ranges: _containers.RepeatedCompositeFieldContainer[DefaultColorRange]
+    def __init__(self, color_ranges: _Optional[_Iterable[_Union[DefaultColorRange, _Mapping]]] = ...) -> None: ...
+
+class RequestClassifyValues(_message.Message):
+    __slots__ = ("color_range_id", "values", "cleared")
+    COLOR_RANGE_ID_FIELD_NUMBER: _ClassVar[int]
+    VALUES_FIELD_NUMBER: _ClassVar[int]
+    CLEARED_FIELD_NUMBER: _ClassVar[int]
+    color_range_id: int
+    values: _containers.RepeatedScalarFieldContainer[float]
+    cleared: _containers.RepeatedScalarFieldContainer[bool]
+    def __init__(self, color_range_id: _Optional[int] = ..., values: _Optional[_Iterable[float]] = ..., cleared: _Optional[_Iterable[bool]] = ...) -> None: ...
+
+class ClassifiedValues(_message.Message):
+    __slots__ = ("indices", "colors")
+    INDICES_FIELD_NUMBER: _ClassVar[int]
+    COLORS_FIELD_NUMBER: _ClassVar[int]
+    indices: _containers.RepeatedScalarFieldContainer[int]
+    colors: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, indices: _Optional[_Iterable[int]] = ..., colors: _Optional[_Iterable[str]] = ...) -> None: ...
@@ -24,6 +24,16 @@ class FrontendSettingsStub(object):
                 request_serializer=frontend__settings__pb2.RequestToSetCustomPalette.SerializeToString,
                 response_deserializer=frontend__settings__pb2.WrongKpiIds.FromString,
                 )
+        self.GetDefaultColorRanges = channel.unary_unary(
+                '/frontend_settings.FrontendSettings/GetDefaultColorRanges',
+                request_serializer=frontend__settings__pb2.RequestDefaultColorRanges.SerializeToString,
+                response_deserializer=frontend__settings__pb2.DefaultColorRanges.FromString,
+                )
+        self.ClassifyValues = channel.unary_unary(
+                '/frontend_settings.FrontendSettings/ClassifyValues',
+                request_serializer=frontend__settings__pb2.RequestClassifyValues.SerializeToString,
+                response_deserializer=frontend__settings__pb2.ClassifiedValues.FromString,
+                )
 
 
 class FrontendSettingsServicer(object):
@@ -41,6 +51,18 @@ class FrontendSettingsServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetDefaultColorRanges(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ClassifyValues(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_FrontendSettingsServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -54,6 +76,16 @@ def add_FrontendSettingsServicer_to_server(servicer, server):
                     request_deserializer=frontend__settings__pb2.RequestToSetCustomPalette.FromString,
                     response_serializer=frontend__settings__pb2.WrongKpiIds.SerializeToString,
             ),
+            'GetDefaultColorRanges': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetDefaultColorRanges,
+                    request_deserializer=frontend__settings__pb2.RequestDefaultColorRanges.FromString,
+                    response_serializer=frontend__settings__pb2.DefaultColorRanges.SerializeToString,
+            ),
+            'ClassifyValues': grpc.unary_unary_rpc_method_handler(
+                    servicer.ClassifyValues,
+                    request_deserializer=frontend__settings__pb2.RequestClassifyValues.FromString,
+                    response_serializer=frontend__settings__pb2.ClassifiedValues.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'frontend_settings.FrontendSettings', rpc_method_handlers)
@@ -97,3 +129,37 @@ class FrontendSettings(object):
             frontend__settings__pb2.WrongKpiIds.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetDefaultColorRanges(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/frontend_settings.FrontendSettings/GetDefaultColorRanges',
+            frontend__settings__pb2.RequestDefaultColorRanges.SerializeToString,
+            frontend__settings__pb2.DefaultColorRanges.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def ClassifyValues(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/frontend_settings.FrontendSettings/ClassifyValues',
+            frontend__settings__pb2.RequestClassifyValues.SerializeToString,
+            frontend__settings__pb2.ClassifiedValues.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -5,15 +5,32 @@ import json
 import logging
 
 import grpc
+from prometheus_client import start_http_server
 
 from v1.database import Base
 from v1.database.database import Database
+from v1.database.listener import PgListener
 from v1.database.models.color_range import ColorRangeTableNew
 from v1.grpc_config.grpc_utils import check_color_range_exists
+from v1.metrics.grpc_interceptor import (
+    MetricsInterceptor,
+    RequestIdInterceptor,
+)
+from v1.metrics.metrics import register_collectors
+from v1.metrics.tracing import get_grpc_interceptors
+from v1.routers.color_range.classification import get_compiled_color_range
 from v1.routers.color_range.models import ColorRangeCreate
+from v1.routers.color_range.utils import (
+    COLOR_RANGES_CHANNEL,
+    ColorRangeDefaultsCache,
+    get_color_range_defaults,
+)
+from v1.utils.logging_setup import setup_logging
 from .frontend_settings_proto import frontend_settings_pb2
 from .frontend_settings_proto import frontend_settings_pb2_grpc
-from v1.settings import DATABASE_URL, DB_SCHEMA
+from v1.settings import DATABASE_URL, DB_SCHEMA, GRPC_METRICS_PORT
+
+logger = logging.getLogger(__name__)
 
 
 class FrontendSettings(frontend_settings_pb2_grpc.FrontendSettingsServicer):
@@ -86,7 +103,11 @@ class FrontendSettings(frontend_settings_pb2_grpc.FrontendSettingsServicer):
                         session.add(orm_item)
 
                     except BaseException as e:
-                        print(e)
+                        logger.warning(
+                            "Default color range of KPI %s is not created: %r",
+                            kpi_id,
+                            e,
+                        )
                         wrong_kpi_ids.append(kpi_id)
                         continue
 
@@ -152,27 +173,131 @@ class FrontendSettings(frontend_settings_pb2_grpc.FrontendSettingsServicer):
                         session.add(orm_item)
 
                 except BaseException as e:
-                    print(e)
+                    logger.warning(
+                        "Default color range of KPI %s is not created: %r",
+                        kpi_id,
+                        e,
+                    )
                     wrong_kpi_ids.append(kpi_id)
                     continue
 
+            await ColorRangeDefaultsCache.publish(session)
             await session.commit()
+        ColorRangeDefaultsCache().clear()
 
         return frontend_settings_pb2.WrongKpiIds(wrong_kpi_ids=wrong_kpi_ids)
 
+    async def GetDefaultColorRanges(
+        self,
+        request: frontend_settings_pb2.RequestDefaultColorRanges,
+        context: grpc.ServicerContext,
+    ) -> frontend_settings_pb2.DefaultColorRanges:
+        """Public default color ranges of (tmo_id, tprm_id, val_type) keys"""
+        db = Database()
+        db.set_config(
+            database_url=DATABASE_URL,
+            db_schema=DB_SCHEMA,
+            metadata=Base.metadata,
+        )
+
+        async for session in db.get_session():
+            defaults = await get_color_range_defaults(
+                session=session,
+                user_id=None,
+                keys=[
+                    (str(key.tmo_id), str(key.tprm_id), key.val_type or None)
+                    for key in request.keys
+                ],
+            )
+
+        return frontend_settings_pb2.DefaultColorRanges(
+            color_ranges=[
+                frontend_settings_pb2.DefaultColorRange(
+                    tmo_id=int(item["tmoId"]),
+                    tprm_id=int(item["tprmId"]),
+                    id=item["id"],
+                    name=item["name"],
+                    val_type=item["valType"],
+                    value_type=item["value_type"],
+                    direction=item["direction"],
+                    with_indeterminate=bool(item["withIndeterminate"]),
+                    with_cleared=bool(item["withCleared"]),
+                    ranges=json.dumps(item["ranges"]),
+                )
+                for item in defaults.values()
+            ]
+        )
+
+    async def ClassifyValues(
+        self,
+        request: frontend_settings_pb2.RequestClassifyValues,
+        context: grpc.ServicerContext,
+    ) -> frontend_settings_pb2.ClassifiedValues:
+        """Classifies values by a public color range"""
+        db = Database()
+        db.set_config(
+            database_url=DATABASE_URL,
+            db_schema=DB_SCHEMA,
+            metadata=Base.metadata,
+        )
+
+        error = None
+        async for session in db.get_session():
+            try:
+                compiled = await get_compiled_color_range(
+                    session=session,
+                    range_id=request.color_range_id,
+                    user_id=None,
+                )
+            except ValueError as e:
+                error = str(e)
+        # abort raises, so it is called after the session is closed
+        if error is not None:
+            await context.abort(grpc.StatusCode.FAILED_PRECONDITION, error)
+        if compiled is None:
+            await context.abort(
+                grpc.StatusCode.NOT_FOUND, "Color range does not exist"
+            )
+
+        try:
+            indices = compiled.classify(request.values, request.cleared or None)
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        return frontend_settings_pb2.ClassifiedValues(
+            indices=indices,
+            colors=[color or "" for color in compiled.colors],
+        )
+
 
 async def start_grpc_serve() -> None:
-    server = grpc.aio.server()
+    interceptors = [RequestIdInterceptor(), *get_grpc_interceptors()]
+    if GRPC_METRICS_PORT:
+        start_http_server(GRPC_METRICS_PORT)
+        register_collectors(database=Database())
+        interceptors.append(MetricsInterceptor())
+    server = grpc.aio.server(interceptors=interceptors)
     frontend_settings_pb2_grpc.add_FrontendSettingsServicer_to_server(
         FrontendSettings(), server
     )
     listen_addr = "[::]:50051"
     server.add_insecure_port(listen_addr)
-    logging.info("Starting server on %s", listen_addr)
+
+    # changes of color ranges made by the application clear cached defaults
+    listener = PgListener()
+    listener.set_config(database_url=DATABASE_URL)
+    listener.add_callback(
+        COLOR_RANGES_CHANNEL, ColorRangeDefaultsCache().on_notification
+    )
+    await listener.start()
+
+    logger.info("Starting server on %s", listen_addr)
     await server.start()
-    await server.wait_for_termination()
+    try:
+        await server.wait_for_termination()
+    finally:
+        await listener.stop()
 
 
 if __name__ == "__main__":
-    logging.basicConfig(level=logging.INFO)
+    setup_logging()
     asyncio.run(start_grpc_serve())
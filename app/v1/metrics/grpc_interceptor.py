@@ -0,0 +1,74 @@
+import time
+import uuid
+
+import grpc
+
+from v1.metrics.metrics import DB_QUERIES_PER_REQUEST, GRPC_REQUEST_DURATION
+from v1.metrics.queries import QueryStats, track_queries
+from v1.utils.logging_setup import REQUEST_ID_HEADER, request_id_var
+
+
+class MetricsInterceptor(grpc.aio.ServerInterceptor):
+    """Measures unary gRPC requests by method and status code
+    and counts their SQL queries"""
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+
+        method = handler_call_details.method
+        behavior = handler.unary_unary
+
+        async def measured_behavior(request, context: grpc.aio.ServicerContext):
+            started = time.perf_counter()
+            code = grpc.StatusCode.UNKNOWN
+            with track_queries(method) as queries:
+                try:
+                    response = await behavior(request, context)
+                    code = context.code() or grpc.StatusCode.OK
+                    return response
+                except grpc.aio.AbortError:
+                    code = context.code() or code
+                    raise
+                finally:
+                    GRPC_REQUEST_DURATION.labels(
+                        method, getattr(code, "name", str(code))
+                    ).observe(time.perf_counter() - started)
+                    QueryStats().record_request(queries)
+                    DB_QUERIES_PER_REQUEST.labels(method).observe(queries.count)
+
+        return grpc.unary_unary_rpc_method_handler(
+            measured_behavior,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
+
+
+class RequestIdInterceptor(grpc.aio.ServerInterceptor):
+    """Takes the request id from x-request-id metadata or generates it
+    for log records of unary gRPC requests"""
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+
+        metadata = dict(handler_call_details.invocation_metadata or ())
+        behavior = handler.unary_unary
+
+        async def behavior_with_request_id(request, context):
+            request_id = (
+                metadata.get(REQUEST_ID_HEADER.lower()) or uuid.uuid4().hex
+            )
+            token = request_id_var.set(request_id)
+            try:
+                return await behavior(request, context)
+            finally:
+                request_id_var.reset(token)
+
+        return grpc.unary_unary_rpc_method_handler(
+            behavior_with_request_id,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
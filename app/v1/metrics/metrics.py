@@ -0,0 +1,130 @@
+"""
+Prometheus metrics of the service.
+Gauges of the database pool and scheduler counters are collected on scrape,
+so they cost nothing on the request path.
+"""
+
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import (
+    CounterMetricFamily,
+    GaugeMetricFamily,
+    REGISTRY,
+)
+from prometheus_client.registry import Collector
+from starlette.requests import Request
+from starlette.responses import Response
+
+from v1.metrics.timing import add_phase
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Duration of HTTP requests by route template",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Number of HTTP requests in progress",
+    ["method"],
+)
+
+EXTERNAL_CALL_DURATION = Histogram(
+    "external_call_duration_seconds",
+    "Duration of calls to Keycloak and OPA",
+    ["service", "outcome"],
+)
+
+
+@contextmanager
+def measure_external_call(service: str):
+    """Observes duration of the call with outcome error if it raises
+    and adds it to the phases of the current request"""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        elapsed = time.perf_counter() - started
+        EXTERNAL_CALL_DURATION.labels(service, outcome).observe(elapsed)
+        add_phase(service, elapsed)
+
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Lookups of in-memory caches",
+    ["cache", "result"],
+)
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Number of SQL queries per request by route template or gRPC method",
+    ["route"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+
+GRPC_REQUEST_DURATION = Histogram(
+    "grpc_request_duration_seconds",
+    "Duration of gRPC requests",
+    ["method", "code"],
+)
+
+
+class DatabasePoolCollector(Collector):
+    def __init__(self, database):
+        self._database = database
+
+    def collect(self):
+        if self._database.engine is None:
+            return
+        pool = self._database.engine.pool
+        for name, description, value in (
+            ("size", "Size of the pool", pool.size()),
+            ("checked_out", "Connections in use", pool.checkedout()),
+            ("checked_in", "Idle connections", pool.checkedin()),
+            ("overflow", "Connections over the pool size", pool.overflow()),
+        ):
+            yield GaugeMetricFamily(f"db_pool_{name}", description, value=value)
+
+
+class SchedulerCollector(Collector):
+    def __init__(self, scheduler):
+        self._scheduler = scheduler
+
+    def collect(self):
+        runs = CounterMetricFamily(
+            "scheduler_job_runs",
+            "Runs of periodic jobs by result",
+            labels=["job", "result"],
+        )
+        for job, stats in self._scheduler.stats.items():
+            for result in ("ran", "skipped", "failed", "timed_out"):
+                runs.add_metric([job, result], stats[result])
+        yield runs
+
+
+_collectors: list[Collector] = []
+
+
+def register_collectors(database, scheduler=None) -> None:
+    """Registers collectors of the database pool and scheduler jobs"""
+    while _collectors:
+        REGISTRY.unregister(_collectors.pop())
+    collectors = [DatabasePoolCollector(database)]
+    if scheduler is not None:
+        collectors.append(SchedulerCollector(scheduler))
+    for collector in collectors:
+        REGISTRY.register(collector)
+        _collectors.append(collector)
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
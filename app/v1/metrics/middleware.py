@@ -0,0 +1,230 @@
+import cProfile
+import logging
+import time
+import uuid
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from v1.metrics.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_PROGRESS,
+)
+from v1.metrics.profiling import format_profile, profiling_lock
+from v1.metrics.queries import QueryStats, track_queries
+from v1.metrics.timing import format_server_timing, track_request_timing
+from v1.security.data.utils import is_admin
+from v1.security.security_factory import security
+from v1.utils.logging_setup import REQUEST_ID_HEADER, request_id_var
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+
+
+class RequestIdMiddleware:
+    """Takes the request id from the X-Request-ID header or generates it.
+    The id is added to log records and returned in the response header"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = (
+            Headers(scope=scope).get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+        )
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
+
+
+class MetricsMiddleware:
+    """Measures HTTP requests by route template, so path parameters
+    don't multiply label values. Unmatched paths are grouped together"""
+
+    def __init__(self, app: ASGIApp, excluded_paths: set[str] = frozenset()):
+        self.app = app
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            HTTP_REQUEST_DURATION.labels(
+                method, get_route_template(scope), status
+            ).observe(time.perf_counter() - started)
+
+
+class QueryStatsMiddleware:
+    """Counts SQL queries per request by route template"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(lambda: get_route_template(scope)) as context:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                QueryStats().record_request(context)
+                DB_QUERIES_PER_REQUEST.labels(context.name).observe(
+                    context.count
+                )
+
+
+class ServerTimingMiddleware:
+    """Adds the Server-Timing header with durations of request phases
+    if add_header is set. Requests slower than slow_request_ms are logged
+    with their phases"""
+
+    def __init__(
+        self, app: ASGIApp, add_header: bool = True, slow_request_ms: int = 0
+    ):
+        self.app = app
+        self.add_header = add_header
+        self.slow_request_seconds = slow_request_ms / 1000
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_request_timing() as timing:
+
+            async def send_wrapper(message: Message):
+                if message["type"] == "http.response.start":
+                    phases = timing.finish()
+                    if self.add_header:
+                        headers = MutableHeaders(scope=message)
+                        headers.append(
+                            "Server-Timing", format_server_timing(phases)
+                        )
+                    if (
+                        self.slow_request_seconds
+                        and phases["total"] >= self.slow_request_seconds
+                    ):
+                        self._log(scope, message["status"], phases)
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _log(scope: Scope, status: int, phases: dict[str, float]) -> None:
+        logger.warning(
+            "Slow request method=%s route=%s status=%s %s",
+            scope["method"],
+            get_route_template(scope),
+            status,
+            " ".join(
+                f"{name}_ms={seconds * 1000:.1f}"
+                for name, seconds in phases.items()
+            ),
+        )
+
+
+class ProfilingMiddleware:
+    """Captures cProfile of requests of admins with the X-Profile header
+    and returns it instead of the response: a text report for X-Profile: text
+    or stats loadable with pstats and snakeviz for X-Profile: pstats.
+    Status of the profiled response is returned in the X-Profiled-Status header"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        mode = None
+        if scope["type"] == "http":
+            mode = Headers(scope=scope).get(PROFILE_HEADER)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            user_data = await security(Request(scope))
+        except HTTPException as e:
+            response = JSONResponse({"detail": e.detail}, e.status_code)
+            await response(scope, receive, send)
+            return
+        if not is_admin(user_data):
+            response = JSONResponse({"detail": "Admin role is required"}, 403)
+            await response(scope, receive, send)
+            return
+        if not profiling_lock.acquire(blocking=False):
+            response = JSONResponse({"detail": "Profiling is in progress"}, 409)
+            await response(scope, receive, send)
+            return
+
+        status = 500
+
+        async def discard_send(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+            try:
+                await self.app(scope, receive, discard_send)
+            finally:
+                profile.disable()
+        finally:
+            profiling_lock.release()
+
+        binary = mode.lower() == "pstats"
+        response = Response(
+            format_profile(profile, binary=binary),
+            media_type="application/octet-stream" if binary else "text/plain",
+            headers={"X-Profiled-Status": str(status)},
+        )
+        await response(scope, receive, send)
+
+
+def get_route_template(scope: Scope) -> str:
+    """Returns path template of the matched route including mount paths"""
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    # routers update the scope of the request in place, root_path holds
+    # paths of the mounts in front of the route
+    mount_path = scope.get("root_path", "")[
+        len(scope.get("app_root_path", "")) :
+    ]
+    return mount_path + route.path
@@ -0,0 +1,72 @@
+"""
+On-demand profiling of the live process.
+sample_stacks periodically samples stacks of all threads and returns them in
+the folded format of flamegraph.pl and speedscope: "frame;frame;frame count".
+format_profile formats a cProfile of one request. cProfile traces the whole
+thread, so concurrent requests of the event loop appear in the profile too.
+"""
+
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+# one profile at a time, profilers of the same thread replace each other
+profiling_lock = threading.Lock()
+
+PROFILE_REPORT_LINES = 50
+
+
+def _format_frame(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _fold_stack(thread_name: str, frame) -> str:
+    frames = []
+    while frame is not None:
+        frames.append(_format_frame(frame))
+        frame = frame.f_back
+    frames.append(thread_name)
+    return ";".join(reversed(frames))
+
+
+def sample_stacks(seconds: float, interval: float) -> Counter[str]:
+    """Samples stacks of all other threads, blocks for the given seconds"""
+    own_id = threading.get_ident()
+    counts = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id != own_id:
+                counts[
+                    _fold_stack(names.get(thread_id, str(thread_id)), frame)
+                ] += 1
+        time.sleep(interval)
+    return counts
+
+
+def format_folded(counts: Counter[str]) -> str:
+    return "".join(
+        f"{stack} {count}\n" for stack, count in counts.most_common()
+    )
+
+
+def format_profile(profile: cProfile.Profile, binary: bool) -> bytes:
+    """Returns text report sorted by cumulative time
+    or marshalled stats loadable with pstats and snakeviz"""
+    if binary:
+        profile.create_stats()
+        return marshal.dumps(profile.stats)
+    stream = io.StringIO()
+    stats = pstats.Stats(profile, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+        PROFILE_REPORT_LINES
+    )
+    return stream.getvalue().encode()
@@ -0,0 +1,187 @@
+"""
+Timings of SQL statements collected with SQLAlchemy cursor events.
+Statements are grouped by shape: literals and parameters are replaced with ?
+and lists of parameters are collapsed, so IN lists of any length and multi-row
+inserts share one shape.
+Use track_queries to count queries of a request or a gRPC call and to name
+the source of slow queries in the log.
+"""
+
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from v1.metrics.timing import add_phase
+from v1.utils.singleton import Singleton
+
+logger = logging.getLogger(__name__)
+
+# new shapes are not recorded after the limit, keeps memory bounded
+MAX_SHAPES = 1000
+MAX_ROUTES = 1000
+
+BACKGROUND_SOURCE = "background"
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+# parameter with an optional cast, e.g. $1::VARCHAR
+_PARAM = r"\$?\?(?:::\w+(?:\[\])?)?"
+_PARAMS_LIST_RE = re.compile(rf"([(\[])\s*{_PARAM}(?:\s*,\s*{_PARAM})*\s*[)\]]")
+_ROWS_LIST_RE = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def normalize_statement(statement: str) -> str:
+    """Returns statement without literals and parameters"""
+    shape = _STRING_RE.sub("?", statement)
+    shape = _NUMBER_RE.sub("?", shape)
+    shape = _PARAMS_LIST_RE.sub(
+        lambda match: "(...)" if match[1] == "(" else "[...]", shape
+    )
+    shape = _ROWS_LIST_RE.sub("(...)", shape)
+    return _WHITESPACE_RE.sub(" ", shape).strip()
+
+
+@dataclass
+class QueryContext:
+    source: str | Callable[[], str]
+    count: int = 0
+    seconds: float = 0.0
+
+    @property
+    def name(self) -> str:
+        return self.source() if callable(self.source) else self.source
+
+
+_query_context: ContextVar[QueryContext | None] = ContextVar(
+    "query_context", default=None
+)
+
+
+@contextmanager
+def track_queries(source: str | Callable[[], str]) -> Iterator[QueryContext]:
+    """Counts queries executed inside the block.
+    source names the request, pass a callable to resolve it lazily"""
+    context = QueryContext(source=source)
+    token = _query_context.set(context)
+    try:
+        yield context
+    finally:
+        _query_context.reset(token)
+
+
+@dataclass
+class ShapeStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+
+@dataclass
+class RouteStats:
+    requests: int = 0
+    queries: int = 0
+    max_queries: int = 0
+
+    @property
+    def mean_queries(self) -> float:
+        return self.queries / self.requests if self.requests else 0.0
+
+
+class QueryStats(metaclass=Singleton):
+    """Process-wide statistics of SQL statements and queries per request"""
+
+    def __init__(self):
+        self.shapes: dict[str, ShapeStats] = {}
+        self.routes: dict[str, RouteStats] = {}
+        self.slow_query_seconds: float = 0.0
+        self._engines: set[Engine] = set()
+
+    def attach(self, engine: Engine, slow_query_ms: int = 0) -> None:
+        """Registers cursor events of the engine, pass sync_engine of
+        an async engine. slow_query_ms of 0 disables the slow query log"""
+        self.slow_query_seconds = slow_query_ms / 1000
+        if engine in self._engines:
+            return
+        self._engines.add(engine)
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "handle_error", self._on_error)
+
+    def reset(self) -> None:
+        self.shapes = {}
+        self.routes = {}
+
+    def record_request(self, context: QueryContext) -> None:
+        route = context.name
+        stats = self.routes.get(route)
+        if stats is None:
+            if len(self.routes) >= MAX_ROUTES:
+                return
+            stats = self.routes[route] = RouteStats()
+        stats.requests += 1
+        stats.queries += context.count
+        stats.max_queries = max(stats.max_queries, context.count)
+
+    def top_shapes(
+        self, limit: int, key: Callable[[ShapeStats], float]
+    ) -> list[tuple[str, ShapeStats]]:
+        return sorted(
+            self.shapes.items(), key=lambda item: key(item[1]), reverse=True
+        )[:limit]
+
+    @staticmethod
+    def _before_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def _after_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        self._record(statement, elapsed)
+
+    @staticmethod
+    def _on_error(exception_context):
+        connection = exception_context.connection
+        if connection is None:
+            return
+        started = connection.info.get("query_started")
+        if started:
+            started.pop()
+
+    def _record(self, statement: str, elapsed: float) -> None:
+        shape = normalize_statement(statement)
+        stats = self.shapes.get(shape)
+        if stats is None and len(self.shapes) < MAX_SHAPES:
+            stats = self.shapes[shape] = ShapeStats()
+        if stats is not None:
+            stats.count += 1
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+
+        query_context = _query_context.get()
+        if query_context is not None:
+            query_context.count += 1
+            query_context.seconds += elapsed
+        add_phase("db", elapsed)
+
+        if self.slow_query_seconds and elapsed >= self.slow_query_seconds:
+            source = query_context.name if query_context else BACKGROUND_SOURCE
+            logger.warning(
+                "Slow query %.1f ms in %s: %s", elapsed * 1000, source, shape
+            )
@@ -0,0 +1,154 @@
+"""
+Breakdown of the request time by phase, e.g. auth, opa, db, serialize.
+ServerTimingMiddleware starts the timing of a request, code on the request path
+adds phases with measure_phase or add_phase, which do nothing outside requests.
+Phases may overlap, e.g. opa is a part of auth.
+"""
+
+import asyncio
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+@dataclass
+class RequestTiming:
+    started: float = field(default_factory=time.perf_counter)
+    # phase name: seconds
+    phases: dict[str, float] = field(default_factory=dict)
+    # perf_counter value when the endpoint function returned
+    endpoint_finished: float | None = None
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def finish(self) -> dict[str, float]:
+        """Returns phases with serialize and total at the response start"""
+        now = time.perf_counter()
+        phases = dict(self.phases)
+        if self.endpoint_finished is not None:
+            phases["serialize"] = now - self.endpoint_finished
+        phases["total"] = now - self.started
+        return phases
+
+
+_request_timing: ContextVar[RequestTiming | None] = ContextVar(
+    "request_timing", default=None
+)
+
+
+@contextmanager
+def track_request_timing():
+    timing = RequestTiming()
+    token = _request_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _request_timing.reset(token)
+
+
+def add_phase(name: str, seconds: float) -> None:
+    timing = _request_timing.get()
+    if timing is not None:
+        timing.add(name, seconds)
+
+
+@contextmanager
+def measure_phase(name: str):
+    timing = _request_timing.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - started)
+
+
+def timed_phase(name: str):
+    """Decorator of coroutine functions, which measures them as the phase"""
+
+    def decorator(function):
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            with measure_phase(name):
+                return await function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def format_server_timing(phases: dict[str, float]) -> str:
+    return ", ".join(
+        f"{name};dur={seconds * 1000:.1f}" for name, seconds in phases.items()
+    )
+
+
+class TimedRoute(APIRoute):
+    """Measures the endpoint function as the endpoint phase.
+    Time after it until the response starts is the serialize phase"""
+
+    def get_route_handler(self) -> Callable:
+        self.dependant.call = _timed_endpoint(self.dependant.call)
+        return super().get_route_handler()
+
+
+def _timed_endpoint(call: Callable) -> Callable:
+    if getattr(call, "_timed_endpoint", False):
+        return call
+
+    def finish(timing: RequestTiming | None, started: float) -> None:
+        if timing is not None:
+            timing.endpoint_finished = time.perf_counter()
+            timing.add("endpoint", timing.endpoint_finished - started)
+
+    if asyncio.iscoroutinefunction(call):
+
+        @functools.wraps(call)
+        async def wrapper(*args, **kwargs):
+            timing, started = _request_timing.get(), time.perf_counter()
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                finish(timing, started)
+    else:
+
+        @functools.wraps(call)
+        def wrapper(*args, **kwargs):
+            timing, started = _request_timing.get(), time.perf_counter()
+            try:
+                return call(*args, **kwargs)
+            finally:
+                finish(timing, started)
+
+    wrapper._timed_endpoint = True
+    return wrapper
+
+
+def register_session_timing() -> None:
+    """Measures acquisition of database connections by sessions
+    as the db_connect phase"""
+    if event.contains(Session, "after_transaction_create", _on_transaction):
+        return
+    event.listen(Session, "after_transaction_create", _on_transaction)
+    event.listen(Session, "after_begin", _on_begin)
+
+
+def _on_transaction(session, transaction) -> None:
+    if transaction.parent is None and _request_timing.get() is not None:
+        session.info["connect_started"] = time.perf_counter()
+
+
+def _on_begin(session, transaction, connection) -> None:
+    started = session.info.pop("connect_started", None)
+    if started is not None:
+        add_phase("db_connect", time.perf_counter() - started)
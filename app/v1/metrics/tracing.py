@@ -0,0 +1,110 @@
+"""
+Optional OpenTelemetry tracing of incoming HTTP and gRPC requests,
+SQL statements and calls to Keycloak and OPA.
+Requires the tracing extra with opentelemetry-sdk and the instrumentation packages,
+tracing is disabled with a warning if they are not installed.
+Trace context of callers is taken from the traceparent header or gRPC metadata,
+sampling follows the decision of the caller.
+"""
+
+import importlib
+import logging
+
+from v1 import settings
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.instrumentation.aiohttp_client import (
+        AioHttpClientInstrumentor,
+    )
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.instrumentation.grpc import aio_server_interceptor
+    from opentelemetry.instrumentation.requests import RequestsInstrumentor
+    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+    from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+        SpanExporter,
+    )
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+except ImportError:
+    trace = None
+
+logger = logging.getLogger(__name__)
+
+_provider = None
+
+
+def setup_tracing() -> bool:
+    """Configures the tracer provider and instrumentation of HTTP clients.
+    Returns False if tracing is disabled or not available"""
+    global _provider
+    if not settings.TRACING_ENABLED:
+        return False
+    if _provider is not None:
+        return True
+    if trace is None:
+        logger.warning(
+            "OpenTelemetry is not installed, tracing is disabled. "
+            "Install the tracing extra to enable it"
+        )
+        return False
+
+    _provider = TracerProvider(
+        resource=Resource.create({SERVICE_NAME: settings.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO)),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(_get_exporter()))
+    trace.set_tracer_provider(_provider)
+
+    AioHttpClientInstrumentor().instrument(tracer_provider=_provider)
+    RequestsInstrumentor().instrument(tracer_provider=_provider)
+    return True
+
+
+def _get_exporter() -> "SpanExporter":
+    exporter = settings.TRACING_EXPORTER
+    match exporter:
+        case "otlp":
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                OTLPSpanExporter,
+            )
+
+            # endpoint and headers are taken from OTEL_EXPORTER_OTLP_* variables
+            return OTLPSpanExporter()
+        case "console":
+            return ConsoleSpanExporter()
+        case "file":
+            return ConsoleSpanExporter(
+                out=open(settings.TRACING_FILE_PATH, "a"),
+                formatter=lambda span: span.to_json(indent=None) + "\n",
+            )
+        case _:
+            # module:attribute of an exporter class or factory
+            module_name, _, attribute = exporter.partition(":")
+            factory = getattr(importlib.import_module(module_name), attribute)
+            return factory()
+
+
+def instrument_app(app) -> None:
+    if setup_tracing():
+        # spans of every ASGI message would multiply the overhead
+        FastAPIInstrumentor.instrument_app(
+            app, tracer_provider=_provider, exclude_spans=["receive", "send"]
+        )
+
+
+def instrument_engine(engine) -> None:
+    """Traces statements of the engine, pass sync_engine of an async engine"""
+    if setup_tracing():
+        SQLAlchemyInstrumentor().instrument(
+            engine=engine, tracer_provider=_provider
+        )
+
+
+def get_grpc_interceptors() -> list:
+    if setup_tracing():
+        return [aio_server_interceptor(tracer_provider=_provider)]
+    return []
@@ -0,0 +1,174 @@
+"""
+Classification of KPI values by color ranges.
+values of ranges are ascending breakpoints splitting values into
+len(values) + 1 intervals. An interval includes its lower breakpoint and
+excludes the upper one, so a value equal to a breakpoint falls into the upper
+interval. With the asc direction interval i has color i of the range, with
+desc the colors go from the highest interval.
+The interval colors may be followed by the color of indeterminate values if
+with_indeterminate is set, then by the color of cleared values if with_cleared
+is set. Indeterminate values are null and NaN, cleared values are marked
+by the caller. Values without a color are classified as -1.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy
+from cachetools import LRUCache
+from sqlalchemy import literal_column, or_, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from v1.database.models.color_range import ColorRangeTableNew
+from v1.metrics.metrics import CACHE_REQUESTS
+from v1.utils.singleton import Singleton
+
+MISSING = -1
+
+
+@dataclass(frozen=True)
+class CompiledColorRange:
+    # ascending
+    breakpoints: numpy.ndarray
+    # hex of colors of the intervals, then of indeterminate and cleared values
+    colors: list[str | None]
+    descending: bool
+    # indices of colors of indeterminate and cleared values
+    indeterminate: int = MISSING
+    cleared: int = MISSING
+
+    def classify(self, values, cleared=None) -> list[int]:
+        """Returns color indices of values, cleared is an optional
+        sequence of flags of cleared values"""
+        return self.classify_array(
+            numpy.asarray(values, dtype=float),
+            None if cleared is None else numpy.asarray(cleared, dtype=bool),
+        ).tolist()
+
+    def classify_array(self, values, cleared=None):
+        """Returns color indices of an array of values as an array of int16.
+        Raises ValueError if the cleared flags don't match values"""
+        if cleared is not None and cleared.shape != values.shape:
+            raise ValueError("Cleared flags don't match values")
+        last = len(self.breakpoints)
+        buckets = numpy.searchsorted(self.breakpoints, values, side="right")
+        indices = buckets.astype(numpy.int16)
+        if self.descending:
+            numpy.subtract(last, indices, out=indices)
+        indices[numpy.isnan(values)] = self.indeterminate
+        if cleared is not None:
+            indices[cleared] = self.cleared
+        return indices
+
+
+def color_hex(color) -> str | None:
+    if isinstance(color, dict):
+        return color.get("hex")
+    return color
+
+
+def compile_color_range(
+    ranges: dict,
+    direction: str,
+    with_indeterminate: bool = False,
+    with_cleared: bool = False,
+) -> CompiledColorRange:
+    """Raises ValueError if the range can't classify values"""
+    breakpoints = ranges.get("values")
+    colors = [color_hex(color) for color in ranges.get("colors") or []]
+    if not breakpoints:
+        raise ValueError("The color range has no breakpoint values")
+    try:
+        breakpoints = [float(value) for value in breakpoints]
+    except (TypeError, ValueError):
+        raise ValueError("Breakpoint values of the color range are not numbers")
+    if any(math.isnan(value) for value in breakpoints):
+        raise ValueError("Breakpoint values of the color range are not numbers")
+    if breakpoints != sorted(breakpoints):
+        raise ValueError("Breakpoint values of the color range are not sorted")
+    intervals = len(breakpoints) + 1
+    if len(colors) < intervals:
+        raise ValueError(
+            f"The color range has {len(colors)} colors "
+            f"for {intervals} intervals"
+        )
+    # extra colors are taken in order, a flag without its color leaves
+    # the values without a color
+    extra = iter(range(intervals, len(colors)))
+    indeterminate = next(extra, MISSING) if with_indeterminate else MISSING
+    cleared = next(extra, MISSING) if with_cleared else MISSING
+    return CompiledColorRange(
+        breakpoints=numpy.array(breakpoints),
+        colors=colors[: max(intervals, indeterminate + 1, cleared + 1)],
+        descending=direction == "desc",
+        indeterminate=indeterminate,
+        cleared=cleared,
+    )
+
+
+class CompiledColorRangeCache(metaclass=Singleton):
+    """Compiled color ranges by id with the version of the row they were
+    compiled from. The version is the PostgreSQL xmin of the row, so it changes
+    with every update, including updates by other replicas"""
+
+    def __init__(self, max_size: int = 1024):
+        self._cache = LRUCache(maxsize=max_size)
+
+    def get(self, range_id: int, version: int) -> CompiledColorRange | None:
+        item = self._cache.get(range_id)
+        if item is not None and item[0] != version:
+            item = None
+        CACHE_REQUESTS.labels(
+            "color_range_compiled", "miss" if item is None else "hit"
+        ).inc()
+        return item[1] if item is not None else None
+
+    def set(
+        self, range_id: int, version: int, compiled: CompiledColorRange
+    ) -> None:
+        self._cache[range_id] = (version, compiled)
+
+
+async def get_compiled_color_range(
+    session: AsyncSession, range_id: int, user_id: str | None
+) -> CompiledColorRange | None:
+    """
+    Returns the compiled color range visible to the user, without user_id
+    only public ranges are visible. Returns None if the range doesn't exist,
+    raises ValueError if it can't classify values
+    """
+    visible = ColorRangeTableNew.public == true()
+    if user_id is not None:
+        visible = or_(visible, ColorRangeTableNew.created_by_sub == user_id)
+    version_column = literal_column("xmin").label("version")
+    version = await session.scalar(
+        select(version_column).where(ColorRangeTableNew.id == range_id, visible)
+    )
+    if version is None:
+        return None
+    cache = CompiledColorRangeCache()
+    compiled = cache.get(range_id, int(version))
+    if compiled is not None:
+        return compiled
+
+    response = await session.execute(
+        select(
+            ColorRangeTableNew.ranges,
+            ColorRangeTableNew.direction,
+            ColorRangeTableNew.with_indeterminate,
+            ColorRangeTableNew.with_cleared,
+            version_column,
+        ).where(ColorRangeTableNew.id == range_id, visible)
+    )
+    row = response.first()
+    if row is None:
+        return None
+    compiled = compile_color_range(
+        row.ranges,
+        row.direction,
+        with_indeterminate=bool(row.with_indeterminate),
+        with_cleared=bool(row.with_cleared),
+    )
+    # the version of the compiled content, the row may be updated meanwhile
+    cache.set(range_id, int(row.version), compiled)
+    return compiled
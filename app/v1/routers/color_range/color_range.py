@@ -1,24 +1,81 @@
-from operator import or_
+import logging
+from operator import itemgetter, or_
 
 from asyncpg import UniqueViolationError, NotNullViolationError
-from fastapi import APIRouter, Query, Depends, HTTPException, Path, Body
-from sqlalchemy import true, select, func
+from fastapi import (
+    APIRouter,
+    Query,
+    Depends,
+    HTTPException,
+    Path,
+    Body,
+    Request,
+)
+from fastapi.responses import Response
+from sqlalchemy import (
+    BigInteger,
+    String,
+    cast,
+    false,
+    func,
+    null,
+    select,
+    true,
+    tuple_,
+    union_all,
+)
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from v1.database.database import Database
 from v1.database.models.color_range import ColorRangeTableNew
+from v1.metrics.timing import TimedRoute
+from v1.routers.color_range.classification import (
+    CompiledColorRange,
+    get_compiled_color_range,
+)
+from v1.routers.color_range.columnar import (
+    ARROW_MEDIA_TYPE,
+    BINARY_CONTENT,
+    RAW_MEDIA_TYPE,
+    classify_arrow,
+    classify_raw,
+    export_arrow,
+)
 from v1.routers.color_range.models import (
+    ClassifiedValues,
+    ClassifyValuesRequest,
     ColorRangeCreate,
     ColorRangeUpdate,
     ColorRangeResponse,
     ColorRangeDescriptionResponse,
+    ColorRangeFilter,
+    ColorRangeKey,
+    ColorRangePage,
+    ColorRangePageMeta,
+    ColorRangePageRequest,
+)
+from v1.routers.color_range.utils import (
+    ColorRangeDefaultsCache,
+    change_default_value,
+    decode_cursor,
+    encode_cursor,
+    filter_conditions,
+    get_color_range_defaults,
+    ranges_serializer,
 )
-from v1.routers.color_range.utils import change_default_value
 from v1.security.security_data_models import UserData
 from v1.security.security_factory import security
+from v1.utils.serialize import RowSerializer
 
-router = APIRouter(prefix="/color_range", tags=["color"])
+logger = logging.getLogger(__name__)
+
+description_serializer = RowSerializer(ColorRangeDescriptionResponse, many=True)
+classified_serializer = RowSerializer(ClassifiedValues)
+
+router = APIRouter(
+    prefix="/color_range", tags=["color"], route_class=TimedRoute
+)
 
 
 @router.post("/")
@@ -46,9 +103,11 @@ async def create_color_range(
     session.add(orm_item)
     try:
         await session.flush()
+        await ColorRangeDefaultsCache.publish(session)
         await session.commit()
+        ColorRangeDefaultsCache().clear()
     except IntegrityError as e:
-        print(e)
+        logger.debug("Integrity error: %s", e.orig)
         await session.rollback()
         if isinstance(e.orig.__cause__, UniqueViolationError):
             raise HTTPException(
@@ -122,9 +181,11 @@ async def update_color_range(
     )
     session.add(item)
     try:
+        await ColorRangeDefaultsCache.publish(session)
         await session.commit()
+        ColorRangeDefaultsCache().clear()
     except IntegrityError as e:
-        print(e)
+        logger.debug("Integrity error: %s", e.orig)
         await session.rollback()
         if isinstance(e.orig.__cause__, UniqueViolationError):
             raise HTTPException(
@@ -166,7 +227,28 @@ async def delete_range(
         )
 
     await session.delete(item)
+    await ColorRangeDefaultsCache.publish(session)
     await session.commit()
+    ColorRangeDefaultsCache().clear()
+
+
+def get_ranges_serializer(
+    only_description: bool, fields: list[str] | None
+) -> tuple[RowSerializer, set[str] | None]:
+    """Returns the serializer and keys of the selected columns.
+    Only the columns of the response are selected, so descriptions
+    don't read the ranges JSON"""
+    if only_description:
+        return description_serializer, None
+    if not fields:
+        return ranges_serializer, None
+    unknown = set(fields).difference(ranges_serializer.keys)
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    return ranges_serializer, {"id", *fields}
 
 
 @router.post(
@@ -179,42 +261,125 @@ async def find_ranges(
     tprm_ids: list[str] | None = None,
     val_types: list[str] | None = None,
     is_default: bool | None = Body(None),
-    limit: int = Body(10, qt=0, le=1000),
-    offset: int = Body(0, qe=0),
+    limit: int = Body(10, gt=0, le=1000),
+    offset: int = Body(0, ge=0),
     only_description: bool = Body(True),
+    fields: list[str] | None = Body(
+        None,
+        description="Keys of ranges returned with only_description=false, "
+        "all by default. id is always returned",
+    ),
     session: AsyncSession = Depends(Database().get_session_with_depends),
     user_data: UserData = Depends(security),
 ):
+    """Offset pagination, use /filter/page to scroll through many ranges"""
+    serializer, keys = get_ranges_serializer(only_description, fields)
     query = (
-        select(ColorRangeTableNew)
+        select(*serializer.columns(ColorRangeTableNew, keys))
         .filter(
-            or_(
-                ColorRangeTableNew.public == true(),
-                ColorRangeTableNew.created_by_sub == user_data.id,
+            *filter_conditions(
+                user_id=user_data.id,
+                ids=ids,
+                tmo_ids=tmo_ids,
+                tprm_ids=tprm_ids,
+                val_types=val_types,
+                is_default=is_default,
             )
         )
         .limit(limit)
         .offset(offset)
         .order_by(ColorRangeTableNew.id)
     )
-
-    if ids:
-        query = query.filter(ColorRangeTableNew.id.in_(ids))
-    if tmo_ids:
-        query = query.filter(ColorRangeTableNew.tmo_id.in_(tmo_ids))
-    if tprm_ids:
-        query = query.filter(ColorRangeTableNew.tprm_id.in_(tprm_ids))
-    if is_default is not None:
-        query = query.filter(ColorRangeTableNew.default == is_default)
-    if val_types is not None:
-        query = query.filter(ColorRangeTableNew.val_type.in_(val_types))
     response = await session.execute(query)
-    result = [r.__dict__ for r in response.scalars().all()]
-    if only_description:
-        for r in result:
-            del r["ranges"]
-            del r["value_type"]
-    return result
+    return serializer.response([row._asdict() for row in response.fetchall()])
+
+
+@router.post("/filter/page", response_model=ColorRangePage)
+async def find_ranges_page(
+    request: ColorRangePageRequest,
+    session: AsyncSession = Depends(Database().get_session_with_depends),
+    user_data: UserData = Depends(security),
+):
+    """
+    Returns ranges sorted by id after the cursor. Counts of all matched
+    ranges are selected by the same statement as the page
+    """
+    serializer, keys = get_ranges_serializer(
+        request.only_description, request.fields
+    )
+    conditions = filter_conditions(
+        user_id=user_data.id,
+        ids=request.ids,
+        tmo_ids=request.tmo_ids,
+        tprm_ids=request.tprm_ids,
+        val_types=request.val_types,
+        is_default=request.is_default,
+    )
+    page = select(*serializer.columns(ColorRangeTableNew, keys)).filter(
+        *conditions
+    )
+    if request.cursor is not None:
+        page = page.filter(
+            ColorRangeTableNew.id > decode_cursor(request.cursor)
+        )
+    # one more range tells whether the next page exists
+    page = page.order_by(ColorRangeTableNew.id).limit(request.limit + 1)
+
+    meta = {}
+    if request.with_counts:
+        page = page.subquery()
+        keys = list(page.c.keys())
+        # counts by tmo_id, by val_type and the total are united
+        # with the page, columns of the other part are NULL
+        counts = select(
+            true().label("is_count"),
+            func.count().label("count"),
+            ColorRangeTableNew.tmo_id,
+            ColorRangeTableNew.val_type,
+            *(cast(null(), column.type) for column in page.c),
+        ).filter(*conditions)
+        counts = counts.group_by(
+            func.grouping_sets(
+                tuple_(ColorRangeTableNew.tmo_id),
+                tuple_(ColorRangeTableNew.val_type),
+                tuple_(),
+            )
+        )
+        rows = select(
+            false().label("is_count"),
+            cast(null(), BigInteger),
+            cast(null(), String),
+            cast(null(), String),
+            *page.c,
+        )
+        response = await session.execute(union_all(rows, counts))
+        elements = []
+        meta.update(total_count=0, tmo_id_counts={}, val_type_counts={})
+        for is_count, count, tmo_id, val_type, *values in response:
+            if not is_count:
+                elements.append(dict(zip(keys, values)))
+            elif tmo_id is not None:
+                meta["tmo_id_counts"][tmo_id] = count
+            elif val_type is not None:
+                meta["val_type_counts"][val_type] = count
+            else:
+                meta["total_count"] = count
+        # the order of the page isn't kept by UNION
+        elements.sort(key=itemgetter("id"))
+    else:
+        response = await session.execute(page)
+        elements = [row._asdict() for row in response.fetchall()]
+
+    if len(elements) > request.limit:
+        del elements[request.limit :]
+        meta["next_cursor"] = encode_cursor(elements[-1]["id"])
+    meta = ColorRangePageMeta(page_count=len(elements), **meta)
+    # elements are serialized from rows as by /filter
+    return Response(
+        b'{"meta":%b,"elements":%b}'
+        % (meta.model_dump_json().encode(), serializer.dump_json(elements)),
+        media_type="application/json",
+    )
 
 
 @router.get("/defaults", response_model=list[ColorRangeResponse])
@@ -231,7 +396,7 @@ async def get_defaults(
             detail="You must specify at least one search parameter",
         )
     query = select(
-        ColorRangeTableNew,
+        *ranges_serializer.columns(ColorRangeTableNew),
         func.rank()
         .over(
             partition_by=ColorRangeTableNew.tprm_id,
@@ -255,7 +420,160 @@ async def get_defaults(
     if val_type:
         query = query.filter(ColorRangeTableNew.val_type == val_type)
     subquery = query.subquery()
-    query = select(subquery).filter(subquery.c.rank == 1)
+    query = select(*(subquery.c[key] for key in ranges_serializer.keys)).filter(
+        subquery.c.rank == 1
+    )
     response = await session.execute(query)
-    result = response.mappings().all()
-    return result
+    return ranges_serializer.response(
+        [row._asdict() for row in response.fetchall()]
+    )
+
+
+@router.post("/defaults", response_model=list[ColorRangeResponse])
+async def get_defaults_by_keys(
+    keys: list[ColorRangeKey] = Body(
+        ..., embed=True, min_length=1, max_length=1000
+    ),
+    session: AsyncSession = Depends(Database().get_session_with_depends),
+    user_data: UserData = Depends(security),
+):
+    """
+    Returns default color ranges of (tmoId, tprmId, valType) keys in their
+    order, keys without a default are skipped. A key without valType matches
+    a default of any valType, as GET /defaults does
+    """
+    defaults = await get_color_range_defaults(
+        session=session,
+        user_id=user_data.id,
+        keys=[(key.tmo_id, key.tprm_id, key.val_type) for key in keys],
+    )
+    return ranges_serializer.response(list(defaults.values()))
+
+
+async def get_classifier(
+    session: AsyncSession, range_id: int, user_id: str
+) -> CompiledColorRange:
+    try:
+        compiled = await get_compiled_color_range(
+            session=session, range_id=range_id, user_id=user_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if compiled is None:
+        raise HTTPException(
+            status_code=404, detail="Does not exist or action not allowed"
+        )
+    return compiled
+
+
+@router.post("/{id}/classify", response_model=ClassifiedValues)
+async def classify_values(
+    request: ClassifyValuesRequest,
+    id_: int = Path(..., alias="id"),
+    session: AsyncSession = Depends(Database().get_session_with_depends),
+    user_data: UserData = Depends(security),
+):
+    """
+    Returns indices of colors of the color range for KPI values.
+    Values are split into intervals by values of ranges, a value equal
+    to a breakpoint falls into the upper interval. With the desc direction
+    colors go from the highest interval. Null values get the indeterminate
+    color and values flagged in cleared get the cleared color if the range
+    has them
+    """
+    compiled = await get_classifier(session, id_, user_data.id)
+    try:
+        indices = compiled.classify(request.values, request.cleared)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return classified_serializer.response(
+        {"indices": indices, "colors": compiled.colors}
+    )
+
+
+@router.post(
+    "/{id}/classify/binary",
+    response_class=Response,
+    responses={200: {"content": BINARY_CONTENT}},
+    openapi_extra={
+        "requestBody": {"required": True, "content": BINARY_CONTENT}
+    },
+)
+async def classify_binary_values(
+    request: Request,
+    id_: int = Path(..., alias="id"),
+    session: AsyncSession = Depends(Database().get_session_with_depends),
+    user_data: UserData = Depends(security),
+):
+    """
+    Same as /{id}/classify for bulk values, the response has the content
+    type of the body.
+    application/octet-stream: little-endian float64 values, returns
+    little-endian int16 indices.
+    application/vnd.apache.arrow.stream: values in the first column and
+    optional boolean flags of cleared values in the cleared column, returns
+    the int16 column index with colors in the schema metadata
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if media_type == RAW_MEDIA_TYPE:
+        classify = classify_raw
+    elif media_type == ARROW_MEDIA_TYPE:
+        classify = classify_arrow
+    else:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Expected {RAW_MEDIA_TYPE} or {ARROW_MEDIA_TYPE}",
+        )
+    compiled = await get_classifier(session, id_, user_data.id)
+    body = await request.body()
+    try:
+        content = classify(compiled, body)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return Response(content, media_type=media_type)
+
+
+@router.post(
+    "/export",
+    response_class=Response,
+    responses={
+        200: {"content": {ARROW_MEDIA_TYPE: BINARY_CONTENT[ARROW_MEDIA_TYPE]}}
+    },
+)
+async def export_ranges(
+    request: ColorRangeFilter,
+    session: AsyncSession = Depends(Database().get_session_with_depends),
+    user_data: UserData = Depends(security),
+):
+    """
+    Returns matched ranges sorted by id as an Arrow IPC stream, values
+    and hex colors of ranges are in the list columns breakpoints and colors
+    """
+    query = (
+        select(
+            ColorRangeTableNew.id,
+            ColorRangeTableNew.tmo_id,
+            ColorRangeTableNew.tprm_id,
+            ColorRangeTableNew.val_type,
+            ColorRangeTableNew.name,
+            ColorRangeTableNew.direction,
+            ColorRangeTableNew.public,
+            ColorRangeTableNew.default,
+            ColorRangeTableNew.ranges,
+        )
+        .filter(
+            *filter_conditions(
+                user_id=user_data.id,
+                ids=request.ids,
+                tmo_ids=request.tmo_ids,
+                tprm_ids=request.tprm_ids,
+                val_types=request.val_types,
+                is_default=request.is_default,
+            )
+        )
+        .order_by(ColorRangeTableNew.id)
+    )
+    response = await session.execute(query)
+    return Response(
+        export_arrow(response.fetchall()), media_type=ARROW_MEDIA_TYPE
+    )
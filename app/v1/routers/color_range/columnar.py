@@ -0,0 +1,134 @@
+"""
+Binary formats of bulk classification and export of color ranges.
+Raw buffers are little-endian float64 values in and int16 color indices out.
+Values of Arrow IPC streams are read into NumPy arrays without copying
+if the buffer has no nulls
+"""
+
+import json
+import math
+
+import numpy
+import pyarrow
+import pyarrow.ipc
+
+from v1.routers.color_range.classification import (
+    CompiledColorRange,
+    color_hex,
+)
+
+RAW_MEDIA_TYPE = "application/octet-stream"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+BINARY_CONTENT = {
+    RAW_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+    ARROW_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+}
+
+# optional boolean column of Arrow streams with flags of cleared values
+CLEARED_COLUMN = "cleared"
+
+
+def read_raw_values(body: bytes):
+    """Values of a little-endian float64 buffer, raises ValueError if the
+    buffer size isn't a multiple of 8"""
+    if len(body) % 8:
+        raise ValueError("Size of the body is not a multiple of 8 bytes")
+    return numpy.frombuffer(body, dtype="<f8")
+
+
+def classify_raw(compiled: CompiledColorRange, body: bytes) -> memoryview:
+    """Returns color indices of values of the raw buffer
+    as a little-endian int16 buffer"""
+    indices = compiled.classify_array(read_raw_values(body))
+    return indices.astype("<i2", copy=False).data
+
+
+def read_arrow_values(body: bytes):
+    """Values of the first column of the Arrow IPC stream as float64,
+    nulls are read as NaN, and flags of the cleared column or None without it.
+    Null flags are read as false. Raises ValueError if the stream
+    can't be read"""
+    try:
+        table = pyarrow.ipc.open_stream(body).read_all()
+        if table.num_columns == 0:
+            raise ValueError("The Arrow stream has no columns")
+        column = table.column(0).cast(pyarrow.float64()).combine_chunks()
+        cleared = None
+        if CLEARED_COLUMN in table.column_names[1:]:
+            cleared = (
+                table.column(CLEARED_COLUMN)
+                .cast(pyarrow.bool_())
+                .combine_chunks()
+                .fill_null(False)
+                .to_numpy(zero_copy_only=False)
+            )
+    except pyarrow.ArrowException as e:
+        raise ValueError(f"Invalid Arrow stream: {e}")
+    # without nulls the array shares the buffer of the stream
+    return column.to_numpy(zero_copy_only=False), cleared
+
+
+def write_arrow_stream(batch) -> memoryview:
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return memoryview(sink.getvalue())
+
+
+def classify_arrow(compiled: CompiledColorRange, body: bytes) -> memoryview:
+    """Returns an Arrow IPC stream with the int16 column index of color
+    indices of values, colors of the range are in the schema metadata"""
+    indices = compiled.classify_array(*read_arrow_values(body))
+    schema = pyarrow.schema(
+        [pyarrow.field("index", pyarrow.int16())],
+        metadata={"colors": json.dumps(compiled.colors)},
+    )
+    batch = pyarrow.record_batch(
+        [pyarrow.array(indices, type=pyarrow.int16())], schema=schema
+    )
+    return write_arrow_stream(batch)
+
+
+def _breakpoints(ranges: dict) -> list[float] | None:
+    try:
+        breakpoints = [float(value) for value in ranges.get("values") or []]
+    except (TypeError, ValueError):
+        return None
+    return [None if math.isnan(value) else value for value in breakpoints]
+
+
+def export_arrow(rows) -> memoryview:
+    """Returns an Arrow IPC stream of ranges with breakpoints and hex colors
+    as list columns. Breakpoints which aren't numbers are exported as null"""
+    schema = pyarrow.schema(
+        [
+            pyarrow.field("id", pyarrow.int64(), nullable=False),
+            pyarrow.field("tmo_id", pyarrow.string(), nullable=False),
+            pyarrow.field("tprm_id", pyarrow.string(), nullable=False),
+            pyarrow.field("val_type", pyarrow.string(), nullable=False),
+            pyarrow.field("name", pyarrow.string(), nullable=False),
+            pyarrow.field("direction", pyarrow.string(), nullable=False),
+            pyarrow.field("public", pyarrow.bool_(), nullable=False),
+            pyarrow.field("default", pyarrow.bool_(), nullable=False),
+            pyarrow.field("breakpoints", pyarrow.list_(pyarrow.float64())),
+            pyarrow.field("colors", pyarrow.list_(pyarrow.string())),
+        ]
+    )
+    # the ranges column is the last, after the scalar columns of the schema
+    columns = list(zip(*rows)) or [()] * (len(schema) - 1)
+    ranges = columns.pop()
+    columns.append([_breakpoints(item) for item in ranges])
+    columns.append(
+        [
+            [color_hex(color) for color in item.get("colors") or []]
+            for item in ranges
+        ]
+    )
+    batch = pyarrow.record_batch(
+        [
+            pyarrow.array(column, type=field.type)
+            for column, field in zip(columns, schema)
+        ],
+        schema=schema,
+    )
+    return write_arrow_stream(batch)
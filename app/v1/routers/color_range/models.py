@@ -54,3 +54,73 @@ class ColorRangeDescriptionResponse(ColorRangeBase):
     id_: int = Field(..., alias="id")
     created_by: str = Field(...)
     created_by_sub: str = Field(...)
+
+
+class ColorRangeKey(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    tmo_id: str = Field(..., alias="tmoId", min_length=1)
+    tprm_id: str = Field(..., alias="tprmId", min_length=1)
+    val_type: str | None = Field(None, alias="valType", min_length=1)
+
+
+class ColorRangeFilter(BaseModel):
+    ids: list[int] | None = None
+    tmo_ids: list[str] | None = None
+    tprm_ids: list[str] | None = None
+    val_types: list[str] | None = None
+    is_default: bool | None = None
+
+
+class ColorRangePageRequest(ColorRangeFilter):
+    limit: int = Field(10, gt=0, le=1000)
+    cursor: str | None = Field(
+        None, description="next_cursor of the previous page"
+    )
+    only_description: bool = True
+    fields: list[str] | None = Field(
+        None,
+        description="Keys of ranges returned with only_description=false, "
+        "all by default. id is always returned",
+    )
+    with_counts: bool = Field(
+        False,
+        description="Count all matched ranges, in total and by tmo_id and val_type",
+    )
+
+
+class ColorRangePageMeta(BaseModel):
+    page_count: int
+    next_cursor: str | None = Field(
+        None, description="Cursor of the next page, null on the last page"
+    )
+    total_count: int | None = None
+    tmo_id_counts: dict[str, int] | None = None
+    val_type_counts: dict[str, int] | None = None
+
+
+class ColorRangePage(BaseModel):
+    meta: ColorRangePageMeta
+    elements: list[ColorRangeResponse | ColorRangeDescriptionResponse]
+
+
+class ClassifyValuesRequest(BaseModel):
+    values: list[float | None] = Field(
+        ..., description="KPI values, null values are indeterminate"
+    )
+    cleared: list[bool] | None = Field(
+        None, description="Flags of cleared values, one per value"
+    )
+
+
+class ClassifiedValues(BaseModel):
+    indices: list[int] = Field(
+        ...,
+        description="Indices of colors of the values, "
+        "-1 for values without a color",
+    )
+    colors: list[str | None] = Field(
+        ...,
+        description="hex of colors of the intervals, followed by colors "
+        "of indeterminate and cleared values if the range has them",
+    )
@@ -1,8 +1,26 @@
+import base64
+import binascii
+import json
+
+from cachetools import TTLCache
 from fastapi import HTTPException
-from sqlalchemy import false, true, select
+from sqlalchemy import false, or_, true, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from v1 import settings
+from v1.database.listener import INSTANCE_ID, notify
 from v1.database.models.color_range import ColorRangeTableNew
+from v1.metrics.metrics import CACHE_REQUESTS
+from v1.routers.color_range.models import ColorRangeResponse
+from v1.utils.serialize import RowSerializer
+from v1.utils.singleton import Singleton
+
+ranges_serializer = RowSerializer(ColorRangeResponse, many=True)
+
+COLOR_RANGES_CHANNEL = "color_ranges_changed"
+
+# (tmo_id, tprm_id, val_type), any val_type matches None
+DefaultsKey = tuple[str, str, str | None]
 
 
 async def change_default_value(
@@ -54,3 +72,163 @@ async def get_default_value(
     response = await session.execute(query)
     response = response.scalar()
     return response
+
+
+def encode_cursor(last_id: int) -> str:
+    """Opaque cursor of the page after the range with last_id"""
+    content = json.dumps({"after": last_id}).encode()
+    return base64.urlsafe_b64encode(content).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        last_id = json.loads(base64.urlsafe_b64decode(cursor))["after"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        last_id = None
+    if not isinstance(last_id, int):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+    return last_id
+
+
+def filter_conditions(
+    user_id: str,
+    ids: list[int] | None = None,
+    tmo_ids: list[str] | None = None,
+    tprm_ids: list[str] | None = None,
+    val_types: list[str] | None = None,
+    is_default: bool | None = None,
+) -> list:
+    """Conditions of ranges visible to the user and matched the filter"""
+    conditions = [
+        or_(
+            ColorRangeTableNew.public == true(),
+            ColorRangeTableNew.created_by_sub == user_id,
+        )
+    ]
+    if ids:
+        conditions.append(ColorRangeTableNew.id.in_(ids))
+    if tmo_ids:
+        conditions.append(ColorRangeTableNew.tmo_id.in_(tmo_ids))
+    if tprm_ids:
+        conditions.append(ColorRangeTableNew.tprm_id.in_(tprm_ids))
+    if is_default is not None:
+        conditions.append(ColorRangeTableNew.default == is_default)
+    if val_types is not None:
+        conditions.append(ColorRangeTableNew.val_type.in_(val_types))
+    return conditions
+
+
+class ColorRangeDefaultsCache(metaclass=Singleton):
+    """TTL cache of effective default color ranges by user and
+    (tmo_id, tprm_id, val_type). Keys without a default are cached as None.
+    Changes of color ranges clear it in the process that made them
+    and in other processes by notifications"""
+
+    def __init__(
+        self,
+        ttl: int = settings.COLOR_RANGE_DEFAULTS_CACHE_TTL_SECONDS,
+        max_size: int = settings.COLOR_RANGE_DEFAULTS_CACHE_SIZE,
+    ):
+        self._cache = (
+            TTLCache(maxsize=max_size, ttl=ttl)
+            if ttl > 0 and max_size > 0
+            else None
+        )
+
+    def get_many(
+        self, user_id: str | None, keys: list[DefaultsKey]
+    ) -> tuple[dict[DefaultsKey, dict | None], list[DefaultsKey]]:
+        """Returns cached defaults and keys missed in the cache"""
+        if self._cache is None:
+            return {}, keys
+        found, missed = {}, []
+        for key in keys:
+            try:
+                found[key] = self._cache[user_id, *key]
+            except KeyError:
+                missed.append(key)
+        if found:
+            CACHE_REQUESTS.labels("color_range_defaults", "hit").inc(len(found))
+        if missed:
+            CACHE_REQUESTS.labels("color_range_defaults", "miss").inc(
+                len(missed)
+            )
+        return found, missed
+
+    def set(
+        self, user_id: str | None, key: DefaultsKey, item: dict | None
+    ) -> None:
+        if self._cache is not None:
+            self._cache[user_id, *key] = item
+
+    def clear(self) -> None:
+        if self._cache is not None:
+            self._cache.clear()
+
+    @staticmethod
+    async def publish(session: AsyncSession) -> None:
+        """Notifies other processes about changes after the session commit"""
+        await notify(session, COLOR_RANGES_CHANNEL, INSTANCE_ID)
+
+    async def on_notification(self, payload: str | None) -> None:
+        if payload == INSTANCE_ID:
+            return
+        self.clear()
+
+
+async def get_color_range_defaults(
+    session: AsyncSession,
+    user_id: str | None,
+    keys: list[DefaultsKey],
+) -> dict[DefaultsKey, dict]:
+    """
+    Returns default color ranges of (tmo_id, tprm_id, val_type) keys,
+    serialized by ranges_serializer, in the order of keys. Keys without
+    a default are skipped, a key without val_type matches any val_type.
+    A private default of the user wins over the public one, then the latest
+    one. Without user_id only public defaults are returned
+    """
+    keys = list(dict.fromkeys(keys))
+    cache = ColorRangeDefaultsCache()
+    defaults, missed = cache.get_many(user_id, keys)
+    if missed:
+        visible = ColorRangeTableNew.public == true()
+        if user_id is not None:
+            visible = or_(visible, ColorRangeTableNew.created_by_sub == user_id)
+        pairs = list(dict.fromkeys(key[:2] for key in missed))
+        query = (
+            select(*ranges_serializer.columns(ColorRangeTableNew))
+            .where(
+                tuple_(
+                    ColorRangeTableNew.tmo_id, ColorRangeTableNew.tprm_id
+                ).in_(pairs),
+                ColorRangeTableNew.default == true(),
+                visible,
+            )
+            .order_by(
+                ColorRangeTableNew.tmo_id,
+                ColorRangeTableNew.tprm_id,
+                ColorRangeTableNew.public,
+                ColorRangeTableNew.id.desc(),
+            )
+        )
+        response = await session.execute(query)
+        # defaults of every val_type of the pair, in the order of precedence
+        candidates = {}
+        for row in response.fetchall():
+            item = row._asdict()
+            candidates.setdefault((item["tmoId"], item["tprmId"]), []).append(
+                item
+            )
+        for key in missed:
+            tmo_id, tprm_id, val_type = key
+            defaults[key] = next(
+                (
+                    item
+                    for item in candidates.get((tmo_id, tprm_id), [])
+                    if val_type is None or item["valType"] == val_type
+                ),
+                None,
+            )
+            cache.set(user_id, key, defaults[key])
+    return {key: defaults[key] for key in keys if defaults[key] is not None}
@@ -0,0 +1,30 @@
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class QueryShapesOrder(str, Enum):
+    total = "total"
+    mean = "mean"
+    max = "max"
+    count = "count"
+
+
+class QueryShapeInfo(BaseModel):
+    statement: str
+    count: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+
+
+class RouteQueriesInfo(BaseModel):
+    route: str
+    requests: int
+    mean_queries: float
+    max_queries: int
+
+
+class QueryStatsInfo(BaseModel):
+    shapes: list[QueryShapeInfo]
+    routes: list[RouteQueriesInfo]
@@ -0,0 +1,108 @@
+import asyncio
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from v1.metrics.profiling import (
+    format_folded,
+    profiling_lock,
+    sample_stacks,
+)
+from v1.metrics.queries import QueryStats
+from v1.metrics.timing import TimedRoute
+from v1.routers.debug.models import (
+    QueryShapeInfo,
+    QueryShapesOrder,
+    QueryStatsInfo,
+    RouteQueriesInfo,
+)
+from v1.routers.debug.utils import check_admin_or_raise_error
+from v1.security.security_data_models import UserData
+from v1.security.security_factory import security
+from v1.settings import PROFILING_ENABLED, QUERY_STATS_ENABLED
+
+router = APIRouter(prefix="/debug", tags=["Debug"], route_class=TimedRoute)
+
+SHAPES_ORDER_KEYS = {
+    QueryShapesOrder.total: lambda stats: stats.total_seconds,
+    QueryShapesOrder.mean: lambda stats: stats.mean_seconds,
+    QueryShapesOrder.max: lambda stats: stats.max_seconds,
+    QueryShapesOrder.count: lambda stats: stats.count,
+}
+
+
+def check_query_stats_enabled():
+    if not QUERY_STATS_ENABLED:
+        raise HTTPException(status_code=404, detail="Query stats are disabled")
+
+
+@router.get("/queries", response_model=QueryStatsInfo)
+async def read_query_stats(
+    limit: Annotated[int, Query(ge=1, le=1000)] = 20,
+    order_by: QueryShapesOrder = QueryShapesOrder.total,
+    user_data: UserData = Depends(security),
+):
+    """Returns the slowest SQL statement shapes of the current process
+    and numbers of queries per request by route, routes with most queries first.
+    Available to admins only if query stats are enabled"""
+    check_admin_or_raise_error(user_data)
+    check_query_stats_enabled()
+    query_stats = QueryStats()
+    shapes = [
+        QueryShapeInfo(
+            statement=statement,
+            count=stats.count,
+            total_ms=stats.total_seconds * 1000,
+            mean_ms=stats.mean_seconds * 1000,
+            max_ms=stats.max_seconds * 1000,
+        )
+        for statement, stats in query_stats.top_shapes(
+            limit, key=SHAPES_ORDER_KEYS[order_by]
+        )
+    ]
+    routes = [
+        RouteQueriesInfo(
+            route=route,
+            requests=stats.requests,
+            mean_queries=stats.mean_queries,
+            max_queries=stats.max_queries,
+        )
+        for route, stats in sorted(
+            query_stats.routes.items(),
+            key=lambda item: item[1].mean_queries,
+            reverse=True,
+        )[:limit]
+    ]
+    return QueryStatsInfo(shapes=shapes, routes=routes)
+
+
+@router.delete("/queries", status_code=204)
+async def reset_query_stats(user_data: UserData = Depends(security)):
+    """Resets statistics of SQL statements of the current process"""
+    check_admin_or_raise_error(user_data)
+    check_query_stats_enabled()
+    QueryStats().reset()
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile_process(
+    seconds: Annotated[float, Query(gt=0, le=60)] = 10,
+    interval_ms: Annotated[int, Query(ge=1, le=1000)] = 10,
+    user_data: UserData = Depends(security),
+):
+    """Samples stacks of all threads of the current process for the given
+    seconds. Returns them in the folded format of flamegraph.pl and speedscope.
+    Available to admins only if profiling is enabled"""
+    check_admin_or_raise_error(user_data)
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not profiling_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="Profiling is in progress")
+    try:
+        counts = await asyncio.to_thread(
+            sample_stacks, seconds, interval_ms / 1000
+        )
+    finally:
+        profiling_lock.release()
+    return PlainTextResponse(format_folded(counts))
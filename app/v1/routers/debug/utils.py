@@ -0,0 +1,10 @@
+from fastapi import HTTPException
+
+from v1.security.data.utils import is_admin
+from v1.security.security_data_models import UserData
+
+
+def check_admin_or_raise_error(user_data: UserData) -> None:
+    """Raises error if the user does not have the admin role"""
+    if not is_admin(user_data):
+        raise HTTPException(status_code=403, detail="Admin role is required")
@@ -1,3 +1,4 @@
+import logging
 from operator import or_
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Body, Query
@@ -8,6 +9,7 @@ from sqlalchemy import select, true
 
 from v1.database.database import Database
 from v1.database import ColorRangeTable
+from v1.metrics.timing import TimedRoute
 from v1.routers.map.models import (
     ColorRangeInList,
     ColorRangeCreate,
@@ -19,11 +21,18 @@ from v1.routers.map.util import change_default_value
 from v1.security.security_factory import security
 from v1.security.security_data_models import UserData
 
+logger = logging.getLogger(__name__)
+
 """
 Endpoints for working with map colors on the web
 """
 
-router = APIRouter(prefix="/map/color", tags=["map:colors"], deprecated=True)
+router = APIRouter(
+    prefix="/map/color",
+    tags=["map:colors"],
+    deprecated=True,
+    route_class=TimedRoute,
+)
 
 
 @router.get("/default", response_model=ExistingTableConfig)
@@ -47,7 +56,8 @@ async def get_default_color_range(
                 ColorRangeTable.created_by_sub == user_data.id,
             ),
         )
-        .order_by(ColorRangeTable.public)
+        .order_by(ColorRangeTable.public, ColorRangeTable.id)
+        .limit(1)
     )
     response = await session.execute(query)
     rows = response.fetchone()
@@ -151,7 +161,7 @@ async def post_range(
         await session.flush()
         await session.commit()
     except IntegrityError as e:
-        print(e)
+        logger.debug("Integrity error: %s", e.orig)
         await session.rollback()
         if isinstance(e.orig, UniqueViolationError):
             raise HTTPException(
@@ -215,7 +225,7 @@ async def put_range(
     try:
         await session.commit()
     except IntegrityError as e:
-        print(e)
+        logger.debug("Integrity error: %s", e.orig)
         await session.rollback()
         if isinstance(e.orig, UniqueViolationError):
             raise HTTPException(
@@ -13,10 +13,13 @@ from v1.controllers.module_settings_logs.common.output_models.models import (
     MSLPaginationMeta,
 )
 from v1.database.database import Database
+from v1.metrics.timing import TimedRoute
 
 
 router = APIRouter(
-    prefix="/module_settings_logs", tags=["Module Settings Logs"]
+    prefix="/module_settings_logs",
+    tags=["Module Settings Logs"],
+    route_class=TimedRoute,
 )
 
 
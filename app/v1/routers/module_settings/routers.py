@@ -1,7 +1,6 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from v1.controllers.exceptions.base import ControllerException
@@ -18,31 +17,34 @@ from v1.controllers.module_settings.common.input_models.models import (
 from v1.controllers.module_settings.common.output_models.models import (
     ModelSettingsOutput,
 )
+from v1.controllers.module_settings.common.registry.registry import (
+    ModuleSettingsRegistry,
+)
 from v1.controllers.module_settings.common.update.update_handler import (
     ModuleSettingsUpdateHandler,
 )
 from v1.database.database import Database
-from v1.database.models.modules import ModuleSettings
+from v1.metrics.timing import TimedRoute
 from v1.routers.module_settings.models import ModelSettingsInfo
 from v1.routers.module_settings.utils import (
-    get_module_by_name_or_raise_error,
+    check_module_exists_or_raise_error,
     get_module_settings_or_raise_error,
 )
 from v1.security.security_data_models import UserData
 from v1.security.security_factory import security
 
-router = APIRouter(prefix="/module_settings", tags=["Module Settings"])
+router = APIRouter(
+    prefix="/module_settings", tags=["Module Settings"], route_class=TimedRoute
+)
 
 
 @router.get("", status_code=200, response_model=List[ModelSettingsInfo])
-async def read_module_settings(
-    session: AsyncSession = Depends(Database().get_session_with_depends),
-):
+async def read_module_settings():
     """Returns settings for all modules"""
-    stmt = select(ModuleSettings)
-    all_settings = await session.execute(stmt)
-    all_settings = all_settings.scalars().all()
-    return all_settings
+    snapshot = await ModuleSettingsRegistry().get_snapshot()
+    return Response(
+        content=snapshot.all_settings, media_type="application/json"
+    )
 
 
 @router.post("", status_code=201, response_model=ModelSettingsOutput)
@@ -68,18 +70,18 @@ async def create_module_settings(
 @router.get("/{module_name}", status_code=200, response_model=ModelSettingsInfo)
 async def read_settings_of_particular_module(
     module_name: str,
-    session: AsyncSession = Depends(Database().get_session_with_depends),
 ):
     """Returns settings for a specific module"""
-    await get_module_by_name_or_raise_error(
-        module_name=module_name, session=session
+    snapshot = await ModuleSettingsRegistry().get_snapshot()
+    check_module_exists_or_raise_error(
+        module_name=module_name, snapshot=snapshot
     )
 
-    module_settings = await get_module_settings_or_raise_error(
-        module_name=module_name, session=session
+    module_settings = get_module_settings_or_raise_error(
+        module_name=module_name, snapshot=snapshot
     )
 
-    return module_settings
+    return Response(content=module_settings, media_type="application/json")
 
 
 @router.put(
@@ -2,12 +2,19 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from v1.controllers.settings_events.common.create.utils import (
+    SettingsEventAction,
+)
 from v1.database.database import Database
 from v1.database.models.modules import Module
+from v1.metrics.timing import TimedRoute
 from v1.routers.modules.models import ModuleCreate
-from v1.routers.modules.utils import check_source_exists
+from v1.routers.modules.utils import (
+    check_source_exists,
+    commit_module_changes,
+)
 
-router = APIRouter(prefix="/modules")
+router = APIRouter(prefix="/modules", route_class=TimedRoute)
 
 
 @router.get("/all", status_code=200, tags=["Modules"])
@@ -57,7 +64,9 @@ async def bulk_patch_module(
         modul.custom_name = modules[modul.name]
         session.add(modul)
         res[modul.name] = modul.custom_name
-    await session.commit()
+    await commit_module_changes(
+        session, action=SettingsEventAction.UPDATE, module_names=res.keys()
+    )
     return res
 
 
@@ -89,7 +98,9 @@ async def patch_module(
         )
     module_inst.custom_name = custom_name
     session.add(module_inst)
-    await session.commit()
+    await commit_module_changes(
+        session, action=SettingsEventAction.UPDATE, module_names=[modul_name]
+    )
     return {module_inst.name: module_inst.custom_name}
 
 
@@ -120,7 +131,11 @@ async def create_module(
 
     module = Module(**module_inst.dict())
     session.add(module)
-    await session.commit()
+    await commit_module_changes(
+        session,
+        action=SettingsEventAction.CREATE,
+        module_names=[module_inst.name],
+    )
     await session.refresh(module)
     return module
 
@@ -133,5 +148,7 @@ async def delete_module(
     """Deletes Module by module name"""
     module_inst = await check_source_exists(session, modul_name)
     await session.delete(module_inst)
-    await session.commit()
+    await commit_module_changes(
+        session, action=SettingsEventAction.DELETE, module_names=[modul_name]
+    )
     return {"msg": "Module deleted successfully"}
@@ -1,9 +1,19 @@
 """Utils for Module router"""
 
+from typing import Iterable
+
 from fastapi import HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from v1.controllers.module_settings.common.registry.registry import (
+    ModuleSettingsRegistry,
+)
+from v1.controllers.settings_events.common.create.utils import (
+    SettingsEventAction,
+    SettingsEventKind,
+    add_settings_events,
+)
 from v1.database.models.modules import Module
 
 
@@ -18,3 +28,22 @@ async def check_source_exists(session: AsyncSession, module_name: str):
             detail=f"Source with name={module_name} does not exist!",
         )
     return res
+
+
+async def commit_module_changes(
+    session: AsyncSession,
+    action: SettingsEventAction,
+    module_names: Iterable[str],
+):
+    """Commits changes of modules, notifies subscribers and refreshes
+    the module settings registry"""
+    await add_settings_events(
+        session=session,
+        kind=SettingsEventKind.MODULES,
+        action=action,
+        keys=module_names,
+    )
+    registry = ModuleSettingsRegistry()
+    await registry.publish(session)
+    await session.commit()
+    await registry.reload(session=session)
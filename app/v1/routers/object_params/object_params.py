@@ -1,3 +1,4 @@
+import logging
 from operator import or_
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Body, Query
@@ -7,20 +8,31 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from v1.database.database import Database
 from v1.database import ObjectParamsTable
+from v1.metrics.timing import TimedRoute
 from v1.routers.object_params.models import (
     ExistingTableConfig,
     TableConfigInfo,
     TableObjectParams,
 )
 from v1.routers.object_params.util import change_default_value
+from v1.routers.table.util import select_defaults, to_items_by_tmo
 from v1.security.security_data_models import UserData
 from v1.security.security_factory import security
+from v1.utils.serialize import RowSerializer
+
+logger = logging.getLogger(__name__)
 
 """
 Endpoints for working with possible object params on the web.
 """
 
-router = APIRouter(prefix="/object/params", tags=["object:params"])
+setting_serializer = RowSerializer(ExistingTableConfig)
+list_serializer = RowSerializer(TableConfigInfo, many=True)
+defaults_serializer = RowSerializer(ExistingTableConfig, keyed_by=int)
+
+router = APIRouter(
+    prefix="/object/params", tags=["object:params"], route_class=TimedRoute
+)
 
 
 @router.get("/default", response_model=ExistingTableConfig)
@@ -30,7 +42,7 @@ async def get_default_object_params(
     user_data: UserData = Depends(security),
 ):
     query = (
-        select(ObjectParamsTable)
+        select(*setting_serializer.columns(ObjectParamsTable))
         .where(
             ObjectParamsTable.tmo_id == tmo_id,
             ObjectParamsTable.default == true(),
@@ -39,14 +51,28 @@ async def get_default_object_params(
                 ObjectParamsTable.created_by_sub == user_data.id,
             ),
         )
-        .order_by(ObjectParamsTable.public)
+        .order_by(ObjectParamsTable.public, ObjectParamsTable.id)
+        .limit(1)
     )
     response = await session.execute(query)
-    rows = response.fetchone()
-    if rows is None:
+    row = response.first()
+    if row is None:
         raise HTTPException(status_code=404, detail="Default value not set yet")
-    row = rows[0]
-    return row.__dict__
+    return setting_serializer.response(row._asdict())
+
+
+@router.post("/default", response_model=dict[int, ExistingTableConfig])
+async def get_defaults_object_params(
+    tmo_ids: list[int] = Body(..., embed=True, min_length=1, max_length=1000),
+    session: AsyncSession = Depends(Database().get_session_with_depends),
+    user_data: UserData = Depends(security),
+):
+    """Returns the defaults of the tmos by tmo_id, tmos without a default are skipped"""
+    query = select_defaults(
+        ObjectParamsTable, defaults_serializer, user_data.id, tmo_ids
+    )
+    response = await session.execute(query)
+    return defaults_serializer.response(to_items_by_tmo(response.fetchall()))
 
 
 @router.get("/", response_model=list[TableConfigInfo])
@@ -56,7 +82,7 @@ async def get_all_object_settings(
     user_data: UserData = Depends(security),
 ):
     query = (
-        select(ObjectParamsTable)
+        select(*list_serializer.columns(ObjectParamsTable))
         .where(
             ObjectParamsTable.tmo_id == tmo_id,
             or_(
@@ -67,10 +93,10 @@ async def get_all_object_settings(
         .order_by(ObjectParamsTable.id)
     )
     settings = await session.execute(query)
-    settings = settings.scalars().fetchall()
+    settings = settings.fetchall()
     if len(settings) == 0:
         raise HTTPException(status_code=404, detail="Settings not found")
-    return [s.__dict__ for s in settings]
+    return list_serializer.response([row._asdict() for row in settings])
 
 
 @router.get("/{setting_id}", response_model=ExistingTableConfig)
@@ -79,7 +105,7 @@ async def get_object_settings(
     session: AsyncSession = Depends(Database().get_session_with_depends),
     user_data: UserData = Depends(security),
 ):
-    query = select(ObjectParamsTable).where(
+    query = select(*setting_serializer.columns(ObjectParamsTable)).where(
         ObjectParamsTable.id == setting_id,
         or_(
             ObjectParamsTable.public == true(),
@@ -87,11 +113,10 @@ async def get_object_settings(
         ),
     )
     response = await session.execute(query)
-    rows = response.fetchone()
-    if not rows:
+    row = response.first()
+    if row is None:
         raise HTTPException(status_code=404, detail="Setting not found")
-    setting = rows[0]
-    return setting.__dict__
+    return setting_serializer.response(row._asdict())
 
 
 @router.post("/", status_code=201, response_model=int)
@@ -117,7 +142,7 @@ async def create_object_settings(
         session.add(setting_orm)
         await session.commit()
     except IntegrityError as e:
-        print(e)
+        logger.debug("Integrity error: %s", e.orig)
         raise HTTPException(
             status_code=409, detail=f"Name [{setting.name}] already exists"
         )
@@ -175,7 +200,7 @@ async def update_object_settings(
     try:
         await session.commit()
     except IntegrityError as e:
-        print(e)
+        logger.debug("Integrity error: %s", e.orig)
         raise HTTPException(
             status_code=409, detail=f"Name [{update_item.name}] already exists"
         )
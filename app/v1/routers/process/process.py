@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from v1.database.database import Database
 from v1.database.models.process import FilterSet
+from v1.metrics.timing import TimedRoute
 from v1.routers.process.models import (
     ProcessFilterSetModel,
     ProcessFilterSetModelInfo,
@@ -18,7 +19,9 @@ from v1.routers.process.utils import (
 from v1.security.security_data_models import UserData
 from v1.security.security_factory import security
 
-router = APIRouter(prefix="/process", tags=["Process:filters"])
+router = APIRouter(
+    prefix="/process", tags=["Process:filters"], route_class=TimedRoute
+)
 
 
 @router.post(
@@ -0,0 +1,48 @@
+from typing import Annotated, List
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import StreamingResponse
+
+from v1.controllers.settings_events.common.create.utils import (
+    SettingsEventKind,
+)
+from v1.controllers.settings_events.common.stream.stream import (
+    stream_settings_events,
+)
+from v1.metrics.timing import TimedRoute
+from v1.security.security_data_models import UserData
+from v1.security.security_factory import security
+
+router = APIRouter(
+    prefix="/settings_events", tags=["Settings Events"], route_class=TimedRoute
+)
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_settings_events_endpoint(
+    kinds: Annotated[List[SettingsEventKind], Query()] = list(
+        SettingsEventKind
+    ),
+    last_event_id: Annotated[int | None, Query(ge=0)] = None,
+    last_event_id_header: Annotated[
+        int | None, Header(alias="Last-Event-ID", ge=0)
+    ] = None,
+    user_data: UserData = Depends(security),
+):
+    """Streams changes of module settings, modules and settings of the current user
+    as Server-Sent Events. Event data contains id, kind, action, key and created_at.
+    Reconnecting clients resume from Last-Event-ID header or last_event_id parameter.
+    The resync event means that some changes were lost and the client has to
+    reload the settings."""
+    if last_event_id_header is not None:
+        last_event_id = last_event_id_header
+
+    return StreamingResponse(
+        stream_settings_events(
+            kinds=set(kinds),
+            username=user_data.id,
+            last_event_id=last_event_id,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
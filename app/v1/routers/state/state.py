@@ -1,16 +1,27 @@
 from datetime import datetime, timedelta
+from uuid import uuid4
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Path
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Path
 from pydantic import UUID4
+from sqlalchemy import case, func, null, or_, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from v1 import settings
 from v1.database.database import Database
 from v1.database.models.state import State
+from v1.database.packing import pack_if_large
+from v1.metrics.timing import TimedRoute
+from v1.routers.state.utils import (
+    StateCache,
+    build_state_response,
+    get_state_content,
+    get_state_content_hash,
+)
 from v1.security.security_data_models import UserData
 from v1.security.security_factory import security
 
-router = APIRouter(prefix="/state", tags=["state"])
+router = APIRouter(prefix="/state", tags=["state"], route_class=TimedRoute)
 
 
 @router.post("/", response_model=UUID4)
@@ -32,26 +43,63 @@ async def save_state(
         if expires_in_minutes > 0
         else None
     )
-    db_state = State(
-        value=state,
+    value_packed = pack_if_large(state)
+    stmt = insert(State).values(
+        id=uuid4(),
+        value=None if value_packed is not None else state,
+        value_packed=value_packed,
         creation_date=now,
         expire_date=expire,
         created_by=user_data.name,
+        content_hash=get_state_content_hash(state)
+        if settings.STATE_DEDUPLICATION
+        else None,
     )
-    session.add(db_state)
-    await session.flush()
-    await session.refresh(db_state)
+    if settings.STATE_DEDUPLICATION:
+        # the same state was saved before, its id is returned
+        # and the longest expiry wins
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[State.content_hash],
+            index_where=State.content_hash.is_not(None),
+            set_={
+                State.expire_date: case(
+                    (
+                        or_(
+                            State.expire_date.is_(None),
+                            stmt.excluded.expire_date.is_(None),
+                        ),
+                        null(),
+                    ),
+                    else_=func.greatest(
+                        State.expire_date, stmt.excluded.expire_date
+                    ),
+                )
+            },
+        )
+    state_id = await session.scalar(stmt.returning(State.id))
     await session.commit()
-    return db_state.id
+    return state_id
 
 
 @router.get("/{stateId}", response_model=dict)
 async def get_state(
     state_id: UUID4 = Path(..., alias="stateId"),
+    accept_encoding: str = Header(""),
     session: AsyncSession = Depends(Database().get_session_with_depends),
 ):
-    state: State | None = await session.get(State, state_id)
     now = datetime.now()
-    if state is None or state.expire_date < now:
-        raise HTTPException(status_code=404, detail="State not found")
-    return state.value
+    cache = StateCache()
+    cached = cache.get(state_id, now)
+    if cached is None:
+        stmt = select(State.value, State.value_packed, State.expire_date).where(
+            State.id == state_id,
+            or_(State.expire_date.is_(None), State.expire_date >= now),
+        )
+        state = (await session.execute(stmt)).first()
+        if state is None:
+            raise HTTPException(status_code=404, detail="State not found")
+        cached = get_state_content(state.value, state.value_packed)
+        cache.set(state_id, *cached, expire_date=state.expire_date)
+
+    content, encoding = cached
+    return build_state_response(content, encoding, accept_encoding)
@@ -0,0 +1,119 @@
+"""Utils for State router"""
+
+import gzip
+import hashlib
+import json
+from datetime import datetime
+from uuid import UUID
+
+from cachetools import LRUCache
+from fastapi import Response
+
+from v1 import settings
+from v1.database.packing import GZIP_CODEC, get_codec, unpack_json
+from v1.metrics.metrics import CACHE_REQUESTS
+from v1.utils.serialize import serialize
+from v1.utils.singleton import Singleton
+
+
+def get_state_content_hash(value: dict) -> bytes:
+    """Returns sha256 of the canonical JSON of the state value.
+    The hash is only stored, ids of states stay random"""
+    canonical = json.dumps(
+        value, ensure_ascii=False, sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).digest()
+
+
+def get_state_content(
+    value: dict | None, value_packed: bytes | None
+) -> tuple[bytes, str | None]:
+    """Returns serialized state and its content encoding.
+    Gzip packed states are returned as stored"""
+    if value_packed is None:
+        return serialize(value), None
+    if get_codec(value_packed) == GZIP_CODEC:
+        return value_packed[1:], "gzip"
+    return unpack_json(value_packed), None
+
+
+def accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+    """Whether the Accept-Encoding header value accepts the encoding.
+    The encoding is accepted if its q-value, or the q-value of * if it isn't
+    listed, is above 0"""
+    q_values = {}
+    for item in accept_encoding.split(","):
+        name, *params = item.split(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q_value = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q_value = float(value)
+                except ValueError:
+                    q_value = 0.0
+        q_values[name] = q_value
+    q_value = q_values.get(encoding, q_values.get("*", 0.0))
+    return q_value > 0
+
+
+def build_state_response(
+    content: bytes, encoding: str | None, accept_encoding: str
+) -> Response:
+    # the body depends on Accept-Encoding for packed states only,
+    # but caches can't tell which states are packed
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding is not None:
+        if accepts_encoding(accept_encoding, encoding):
+            headers["Content-Encoding"] = encoding
+        else:
+            content = gzip.decompress(content)
+    return Response(
+        content=content, media_type="application/json", headers=headers
+    )
+
+
+class StateCache(metaclass=Singleton):
+    """LRU cache of serialized states bounded by the total size in bytes.
+    Values of states never change, so entries only have to be checked for expiry.
+    States are cached with their content encoding"""
+
+    def __init__(self, max_bytes: int = settings.STATE_CACHE_MAX_BYTES):
+        self._cache = (
+            LRUCache(maxsize=max_bytes, getsizeof=lambda item: len(item[0]))
+            if max_bytes > 0
+            else None
+        )
+
+    def get(
+        self, state_id: UUID, now: datetime
+    ) -> tuple[bytes, str | None] | None:
+        if self._cache is None:
+            return None
+        item = self._cache.get(state_id)
+        if item is not None and item[2] is not None and item[2] < now:
+            self._cache.pop(state_id, None)
+            item = None
+        CACHE_REQUESTS.labels("state", "miss" if item is None else "hit").inc()
+        if item is None:
+            return None
+        content, encoding, _ = item
+        return content, encoding
+
+    def set(
+        self,
+        state_id: UUID,
+        content: bytes,
+        encoding: str | None,
+        expire_date: datetime | None,
+    ) -> None:
+        if self._cache is None:
+            return
+        try:
+            self._cache[state_id] = (content, encoding, expire_date)
+        except ValueError:
+            # the state is bigger than the whole cache
+            pass
@@ -1,3 +1,4 @@
+import logging
 from operator import or_
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Body, Query
@@ -7,21 +8,38 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from v1.database.database import Database
 from v1.database import ColumnsTable
+from v1.metrics.timing import TimedRoute
 from v1.routers.table.models import (
     TableColumns,
     ExistingTableConfigColumnsEmpty,
     TableConfigColumnsInfo,
     ExistingTableConfigColumns,
 )
-from v1.routers.table.util import change_default_value
+from v1.routers.table.util import (
+    change_default_value,
+    select_defaults,
+    select_settings,
+    to_items,
+    to_items_by_tmo,
+)
 from v1.security.security_data_models import UserData
 from v1.security.security_factory import security
+from v1.utils.serialize import RowSerializer
+
+logger = logging.getLogger(__name__)
 
 """
 Endpoints for working with view columns on the web
 """
 
-router = APIRouter(prefix="/table/columns", tags=["table:columns"])
+default_serializer = RowSerializer(ExistingTableConfigColumnsEmpty)
+list_serializer = RowSerializer(TableConfigColumnsInfo, many=True)
+setting_serializer = RowSerializer(ExistingTableConfigColumns)
+defaults_serializer = RowSerializer(ExistingTableConfigColumns, keyed_by=int)
+
+router = APIRouter(
+    prefix="/table/columns", tags=["table:columns"], route_class=TimedRoute
+)
 
 
 @router.get(
@@ -38,7 +56,7 @@ async def get_default_columns(
     Returns the default for columns
     """
     query = (
-        select(ColumnsTable)
+        select_settings(ColumnsTable, default_serializer)
         .where(
             ColumnsTable.tmo_id == tmo_id,
             ColumnsTable.default == true(),
@@ -47,16 +65,31 @@ async def get_default_columns(
                 ColumnsTable.created_by_sub == user_data.id,
             ),
         )
-        .order_by(ColumnsTable.public)
+        .order_by(ColumnsTable.public, ColumnsTable.id)
+        .limit(1)
     )
     response = await session.execute(query)
-    rows = response.fetchone()
-    if rows is None:
-        response = dict()
-    else:
-        row = rows[0]
-        response = row.__dict__
-    return response
+    rows = to_items(response.fetchall())
+    return default_serializer.response(rows[0] if rows else {})
+
+
+@router.post(
+    "/default/tmo", response_model=dict[int, ExistingTableConfigColumns]
+)
+async def get_defaults_by_tmo(
+    tmo_ids: list[int] = Body(..., embed=True, min_length=1, max_length=1000),
+    session: AsyncSession = Depends(Database().get_session_with_depends),
+    user_data: UserData = Depends(security),
+):
+    """
+    Returns the defaults for columns of the tmos by tmo_id, tmos without
+    a default are skipped
+    """
+    query = select_defaults(
+        ColumnsTable, defaults_serializer, user_data.id, tmo_ids
+    )
+    response = await session.execute(query)
+    return defaults_serializer.response(to_items_by_tmo(response.fetchall()))
 
 
 @router.get("/tmo/all", response_model=list[TableConfigColumnsInfo])
@@ -69,16 +102,16 @@ async def get_all_table_columns_for_all_tmo(
     Data returns sorted by id
     """
     query = (
-        select(ColumnsTable)
+        select(*list_serializer.columns(ColumnsTable))
         .where(ColumnsTable.created_by_sub == user_data.id)
         .order_by(ColumnsTable.id)
     )
     user_columns = await session.execute(query)
-    user_columns = user_columns.scalars().fetchall()
+    user_columns = user_columns.fetchall()
     user_columns_tmo_ids = [x.tmo_id for x in user_columns]
 
     query = (
-        select(ColumnsTable)
+        select(*list_serializer.columns(ColumnsTable))
         .where(
             ColumnsTable.tmo_id.notin_(user_columns_tmo_ids),
             ColumnsTable.public == true(),
@@ -86,11 +119,8 @@ async def get_all_table_columns_for_all_tmo(
         .order_by(ColumnsTable.id)
     )
     columns = await session.execute(query)
-    columns = columns.scalars().fetchall()
-    res = user_columns + columns
-    if len(res) == 0:
-        return []
-    return [s.__dict__ for s in res]
+    res = user_columns + columns.fetchall()
+    return list_serializer.response([row._asdict() for row in res])
 
 
 @router.get("/tmo/{tmo_id}", response_model=list[TableConfigColumnsInfo])
@@ -103,7 +133,7 @@ async def get_all_table_columns(
     Returns all saved settings for displaying columns on the frontend. Data returns sorted by id
     """
     query = (
-        select(ColumnsTable)
+        select(*list_serializer.columns(ColumnsTable))
         .where(
             ColumnsTable.tmo_id == tmo_id,
             or_(
@@ -114,10 +144,9 @@ async def get_all_table_columns(
         .order_by(ColumnsTable.id)
     )
     settings = await session.execute(query)
-    settings = settings.scalars().fetchall()
-    if len(settings) == 0:
-        return []
-    return [s.__dict__ for s in settings]
+    return list_serializer.response(
+        [row._asdict() for row in settings.fetchall()]
+    )
 
 
 @router.get("/setting/{setting_id}", response_model=ExistingTableConfigColumns)
@@ -129,7 +158,7 @@ async def get_table_columns(
     """
     Returns one setting corresponding to its id. If the setting does not exist, it raises an error
     """
-    query = select(ColumnsTable).where(
+    query = select_settings(ColumnsTable, setting_serializer).where(
         ColumnsTable.id == setting_id,
         or_(
             ColumnsTable.public == true(),
@@ -137,11 +166,10 @@ async def get_table_columns(
         ),
     )
     response = await session.execute(query)
-    rows = response.fetchone()
+    rows = to_items(response.fetchall())
     if not rows:
         raise HTTPException(status_code=404, detail="Setting not found")
-    setting = rows[0]
-    return setting.__dict__
+    return setting_serializer.response(rows[0])
 
 
 @router.post("/tmo/{tmo_id}", status_code=201, response_model=int)
@@ -173,7 +201,7 @@ async def create_table_columns(
         session.add(setting_orm)
         await session.commit()
     except IntegrityError as e:
-        print(e)
+        logger.debug("Integrity error: %s", e.orig)
         raise HTTPException(
             status_code=409, detail=f"Name [{setting.name}] already exists"
         )
@@ -232,7 +260,7 @@ async def update_table_columns(
     try:
         await session.commit()
     except IntegrityError as e:
-        print(e)
+        logger.debug("Integrity error: %s", e.orig)
         raise HTTPException(
             status_code=409, detail=f"Name [{update_item.name}] already exists"
         )
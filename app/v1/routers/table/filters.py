@@ -1,3 +1,4 @@
+import logging
 from operator import or_
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Body, Query
@@ -7,21 +8,38 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from v1.database.database import Database
 from v1.database import FiltersTable
+from v1.metrics.timing import TimedRoute
 from v1.routers.table.models import (
     TableConfigInfo,
     TableFilters,
     ExistingTableConfig,
     ExistingTableConfigEmpty,
 )
-from v1.routers.table.util import change_default_value
+from v1.routers.table.util import (
+    change_default_value,
+    select_defaults,
+    select_settings,
+    to_items,
+    to_items_by_tmo,
+)
 from v1.security.security_data_models import UserData
 from v1.security.security_factory import security
+from v1.utils.serialize import RowSerializer
+
+logger = logging.getLogger(__name__)
 
 """
 Endpoints for working with view filters on the web
 """
 
-router = APIRouter(prefix="/table/filters", tags=["table:filters"])
+default_serializer = RowSerializer(ExistingTableConfigEmpty)
+list_serializer = RowSerializer(TableConfigInfo, many=True)
+setting_serializer = RowSerializer(ExistingTableConfig)
+defaults_serializer = RowSerializer(ExistingTableConfig, keyed_by=int)
+
+router = APIRouter(
+    prefix="/table/filters", tags=["table:filters"], route_class=TimedRoute
+)
 
 
 @router.get(
@@ -39,7 +57,7 @@ async def get_default_tmo(
     """
 
     query = (
-        select(FiltersTable)
+        select_settings(FiltersTable, default_serializer)
         .where(
             FiltersTable.tmo_id == tmo_id,
             FiltersTable.default == true(),
@@ -48,17 +66,29 @@ async def get_default_tmo(
                 FiltersTable.created_by_sub == user_data.id,
             ),
         )
-        .order_by(FiltersTable.public)
+        .order_by(FiltersTable.public, FiltersTable.id)
+        .limit(1)
     )
     response = await session.execute(query)
-    rows = response.fetchone()
+    rows = to_items(response.fetchall())
+    return default_serializer.response(rows[0] if rows else {})
+
 
-    if rows is None:
-        response = dict()
-    else:
-        row = rows[0]
-        response = row.__dict__
-    return response
+@router.post("/default/tmo", response_model=dict[int, ExistingTableConfig])
+async def get_defaults_by_tmo(
+    tmo_ids: list[int] = Body(..., embed=True, min_length=1, max_length=1000),
+    session: AsyncSession = Depends(Database().get_session_with_depends),
+    user_data: UserData = Depends(security),
+):
+    """
+    Returns the defaults for filters of the tmos by tmo_id, tmos without
+    a default are skipped
+    """
+    query = select_defaults(
+        FiltersTable, defaults_serializer, user_data.id, tmo_ids
+    )
+    response = await session.execute(query)
+    return defaults_serializer.response(to_items_by_tmo(response.fetchall()))
 
 
 @router.get("/tmo/all", response_model=list[TableConfigInfo])
@@ -70,16 +100,16 @@ async def get_all_table_filters_by_user(
     Returns all saved settings for all tmo for displaying filters on the frontend. Data returns sorted by id
     """
     query = (
-        select(FiltersTable)
+        select(*list_serializer.columns(FiltersTable))
         .where(FiltersTable.created_by_sub == user_data.id)
         .order_by(FiltersTable.id)
     )
     user_filters = await session.execute(query)
-    user_filters = user_filters.scalars().fetchall()
+    user_filters = user_filters.fetchall()
     user_filters_tmo_ids = [x.tmo_id for x in user_filters]
 
     query = (
-        select(FiltersTable)
+        select(*list_serializer.columns(FiltersTable))
         .where(
             FiltersTable.tmo_id.notin_(user_filters_tmo_ids),
             FiltersTable.public == true(),
@@ -87,11 +117,8 @@ async def get_all_table_filters_by_user(
         .order_by(FiltersTable.id)
     )
     settings = await session.execute(query)
-    settings = settings.scalars().fetchall()
-    res = user_filters + settings
-    if len(res) == 0:
-        return []
-    return [s.__dict__ for s in res]
+    res = user_filters + settings.fetchall()
+    return list_serializer.response([row._asdict() for row in res])
 
 
 @router.get("/tmo/{tmo_id}", response_model=list[TableConfigInfo])
@@ -104,7 +131,7 @@ async def get_all_table_filters(
     Returns all saved settings for displaying filters on the frontend. Data returns sorted by id
     """
     query = (
-        select(FiltersTable)
+        select(*list_serializer.columns(FiltersTable))
         .where(
             FiltersTable.tmo_id == tmo_id,
             or_(
@@ -115,10 +142,9 @@ async def get_all_table_filters(
         .order_by(FiltersTable.id)
     )
     settings = await session.execute(query)
-    settings = settings.scalars().fetchall()
-    if len(settings) == 0:
-        return []
-    return [s.__dict__ for s in settings]
+    return list_serializer.response(
+        [row._asdict() for row in settings.fetchall()]
+    )
 
 
 @router.get("/setting/{setting_id}", response_model=ExistingTableConfig)
@@ -130,7 +156,7 @@ async def get_table_filters(
     """
     Returns one setting corresponding to its id. If the setting does not exist, it raises an error
     """
-    query = select(FiltersTable).where(
+    query = select_settings(FiltersTable, setting_serializer).where(
         FiltersTable.id == setting_id,
         or_(
             FiltersTable.public == true(),
@@ -138,11 +164,10 @@ async def get_table_filters(
         ),
     )
     response = await session.execute(query)
-    rows = response.fetchone()
+    rows = to_items(response.fetchall())
     if not rows:
         raise HTTPException(status_code=404, detail="Setting not found")
-    setting = rows[0]
-    return setting.__dict__
+    return setting_serializer.response(rows[0])
 
 
 @router.post("/tmo/{tmo_id}", status_code=201, response_model=int)
@@ -174,7 +199,7 @@ async def create_table_filters(
         session.add(setting_orm)
         await session.commit()
     except IntegrityError as e:
-        print(e)
+        logger.debug("Integrity error: %s", e.orig)
         raise HTTPException(
             status_code=409, detail=f"Name [{setting.name}] already exists"
         )
@@ -233,7 +258,7 @@ async def update_table_filters(
     try:
         await session.commit()
     except IntegrityError as e:
-        print(e)
+        logger.debug("Integrity error: %s", e.orig)
         raise HTTPException(
             status_code=409, detail=f"Name [{update_item.name}] already exists"
         )
@@ -1,6 +1,44 @@
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, true, false
+from sqlalchemy import Row, Select, false, or_, select, true
+
+from v1.database.packing import unpack_item
+from v1.utils.serialize import RowSerializer
+
+
+def select_settings(table, serializer: RowSerializer) -> Select:
+    """Selects columns of the response, packed values are selected
+    with the value"""
+    columns = serializer.columns(table)
+    if "value" in serializer.keys and hasattr(table, "value_packed"):
+        columns.append(table.value_packed.label("value_packed"))
+    return select(*columns)
+
+
+def to_items(rows: list[Row]) -> list[dict]:
+    return [unpack_item(row._asdict(), "value", "value_packed") for row in rows]
+
+
+def select_defaults(
+    table, serializer: RowSerializer, user_id: str, tmo_ids: list[int]
+) -> Select:
+    """Selects effective defaults of the tmos, a private default of the user
+    takes precedence over the public one"""
+    return (
+        select_settings(table, serializer)
+        .add_columns(table.tmo_id.label("default_tmo_id"))
+        .where(
+            table.tmo_id.in_(tmo_ids),
+            table.default == true(),
+            or_(table.public == true(), table.created_by_sub == user_id),
+        )
+        .distinct(table.tmo_id)
+        .order_by(table.tmo_id, table.public, table.id)
+    )
+
+
+def to_items_by_tmo(rows: list[Row]) -> dict[int, dict]:
+    return {item.pop("default_tmo_id"): item for item in to_items(rows)}
 
 
 async def get_default_value(
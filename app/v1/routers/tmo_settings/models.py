@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+
+from v1.routers.color_range.models import ColorRangeResponse
+from v1.routers.object_params.models import (
+    ExistingTableConfig as ObjectParamsConfig,
+)
+from v1.routers.table.models import (
+    ExistingTableConfig,
+    ExistingTableConfigColumns,
+)
+
+
+class TmoSettingsBundle(BaseModel):
+    columns: ExistingTableConfigColumns | None = Field(
+        None, description="Default of table columns"
+    )
+    filters: ExistingTableConfig | None = Field(
+        None, description="Default of table filters"
+    )
+    object_params: ObjectParamsConfig | None = Field(
+        None, description="Default of object params"
+    )
+    color_ranges: list[ColorRangeResponse] = Field(
+        default_factory=list, description="Default color ranges by tprm_id"
+    )
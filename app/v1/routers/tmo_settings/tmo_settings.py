@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from v1.database.database import Database
+from v1.metrics.timing import TimedRoute
+from v1.routers.tmo_settings.models import TmoSettingsBundle
+from v1.routers.tmo_settings.utils import (
+    build_bundles,
+    etag_matches,
+    get_etag,
+    select_bundles,
+)
+from v1.security.security_data_models import UserData
+from v1.security.security_factory import security
+from v1.utils.serialize import serialize
+
+"""
+Settings of object types, which the web needs to open them
+"""
+
+router = APIRouter(
+    prefix="/tmo_settings", tags=["tmo_settings"], route_class=TimedRoute
+)
+
+
+@router.get(
+    "/",
+    response_model=dict[int, TmoSettingsBundle],
+    responses={304: {"description": "The bundles have not changed"}},
+)
+async def get_tmo_settings(
+    tmo_ids: list[int] = Query(
+        ..., alias="tmo_id", min_length=1, max_length=100
+    ),
+    if_none_match: str | None = Header(None),
+    session: AsyncSession = Depends(Database().get_session_with_depends),
+    user_data: UserData = Depends(security),
+):
+    """
+    Returns defaults of table columns, table filters, object params and
+    color ranges of the tmos by tmo_id, selected by one statement.
+    The ETag header is the version of the bundles, with If-None-Match
+    the response is 304 if they have not changed
+    """
+    tmo_ids = list(dict.fromkeys(tmo_ids))
+    response = await session.execute(select_bundles(user_data.id, tmo_ids))
+    content = serialize(build_bundles(tmo_ids, response.fetchall()))
+    headers = {"ETag": get_etag(content), "Cache-Control": "private, no-cache"}
+    if etag_matches(headers["ETag"], if_none_match):
+        return Response(status_code=304, headers=headers)
+    return Response(content, media_type="application/json", headers=headers)
@@ -0,0 +1,143 @@
+import hashlib
+
+from sqlalchemy import (
+    JSON,
+    LargeBinary,
+    Select,
+    String,
+    cast,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+    true,
+    union_all,
+)
+
+from v1.database import ColumnsTable, FiltersTable, ObjectParamsTable
+from v1.database.models.color_range import ColorRangeTableNew
+from v1.database.packing import unpack
+from v1.routers.color_range.models import ColorRangeResponse
+from v1.routers.object_params.models import (
+    ExistingTableConfig as ObjectParamsConfig,
+)
+from v1.routers.table.models import (
+    ExistingTableConfig,
+    ExistingTableConfigColumns,
+)
+from v1.routers.table.util import select_defaults
+from v1.utils.serialize import RowSerializer
+
+# part of the bundle: table, serializer
+BUNDLE_PARTS = {
+    "columns": (ColumnsTable, RowSerializer(ExistingTableConfigColumns)),
+    "filters": (FiltersTable, RowSerializer(ExistingTableConfig)),
+    "object_params": (ObjectParamsTable, RowSerializer(ObjectParamsConfig)),
+}
+COLOR_RANGES_SERIALIZER = RowSerializer(ColorRangeResponse)
+
+
+def select_color_range_defaults(user_id: str, tmo_ids: list[int]) -> Select:
+    """Selects the default color range of every tprm of the tmos,
+    the same as /color_range/defaults"""
+    return (
+        select(
+            *COLOR_RANGES_SERIALIZER.columns(ColorRangeTableNew),
+            ColorRangeTableNew.tmo_id.label("default_tmo_id"),
+        )
+        .where(
+            ColorRangeTableNew.tmo_id.in_([str(tmo_id) for tmo_id in tmo_ids]),
+            ColorRangeTableNew.default == true(),
+            or_(
+                ColorRangeTableNew.public == true(),
+                ColorRangeTableNew.created_by_sub == user_id,
+            ),
+        )
+        .distinct(ColorRangeTableNew.tmo_id, ColorRangeTableNew.tprm_id)
+        .order_by(
+            ColorRangeTableNew.tmo_id,
+            ColorRangeTableNew.tprm_id,
+            ColorRangeTableNew.public,
+            ColorRangeTableNew.id.desc(),
+        )
+    )
+
+
+def _bundle_part(part: str, query: Select, serializer: RowSerializer):
+    """Selects rows of the part as JSON objects with the keys of the response"""
+    rows = query.subquery()
+    item = func.json_build_object(
+        *(
+            argument
+            for key in serializer.keys
+            for argument in (literal(key), rows.c[key])
+        ),
+        type_=JSON,
+    )
+    packed = (
+        rows.c.value_packed
+        if "value_packed" in rows.c
+        else cast(null(), LargeBinary)
+    )
+    return select(
+        literal(part).label("part"),
+        cast(rows.c.default_tmo_id, String).label("tmo_id"),
+        item.label("item"),
+        packed.label("value_packed"),
+    )
+
+
+def select_bundles(user_id: str, tmo_ids: list[int]):
+    """Selects all parts of the bundles by one statement"""
+    parts = [
+        _bundle_part(
+            part,
+            select_defaults(table, serializer, user_id, tmo_ids),
+            serializer,
+        )
+        for part, (table, serializer) in BUNDLE_PARTS.items()
+    ]
+    parts.append(
+        _bundle_part(
+            "color_ranges",
+            select_color_range_defaults(user_id, tmo_ids),
+            COLOR_RANGES_SERIALIZER,
+        )
+    )
+    return union_all(*parts)
+
+
+def build_bundles(tmo_ids: list[int], rows) -> dict[int, dict]:
+    bundles = {
+        tmo_id: {
+            "columns": None,
+            "filters": None,
+            "object_params": None,
+            "color_ranges": [],
+        }
+        for tmo_id in tmo_ids
+    }
+    for part, tmo_id, item, value_packed in rows:
+        if value_packed is not None:
+            item["value"] = unpack(value_packed)
+        bundle = bundles[int(tmo_id)]
+        if part == "color_ranges":
+            bundle[part].append(item)
+        else:
+            bundle[part] = item
+    return bundles
+
+
+def get_etag(content: bytes) -> str:
+    return f'"{hashlib.sha1(content, usedforsecurity=False).hexdigest()}"'
+
+
+def etag_matches(etag: str, if_none_match: str | None) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # weak comparison, as proxies may weaken the tag of compressed responses
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in tags
@@ -1,4 +1,8 @@
-from pydantic import BaseModel, Field, JsonValue
+from typing import Annotated
+
+from pydantic import BaseModel, Field, JsonValue, RootModel, StringConstraints
+
+UserSettingsKey = Annotated[str, StringConstraints(min_length=1)]
 
 
 class UserSettingsBase(BaseModel):
@@ -15,3 +19,9 @@ class UserSettingsUpdate(UserSettingsBase):
 
 class UserSettingsResponse(UserSettingsBase):
     pass
+
+
+class UserSettingsBatchUpdate(RootModel[dict[UserSettingsKey, JsonValue]]):
+    """Settings by key"""
+
+    pass
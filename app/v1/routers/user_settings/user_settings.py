@@ -1,22 +1,35 @@
-from typing import Annotated
+from typing import Annotated, List
 
 from asyncpg import UniqueViolationError
-from fastapi import APIRouter, Depends, Body, Path, HTTPException
-from sqlalchemy import select, and_
+from fastapi import APIRouter, Depends, Body, Path, HTTPException, Query
+from pydantic import JsonValue
+from sqlalchemy import select, and_, delete, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from v1.controllers.settings_events.common.create.utils import (
+    SettingsEventAction,
+    SettingsEventKind,
+    add_settings_events,
+)
 from v1.database.database import Database
 from v1.database.models.user_settings import UserSettingsOrm
+from v1.metrics.timing import TimedRoute
 from v1.routers.user_settings.models import (
+    UserSettingsBatchUpdate,
+    UserSettingsKey,
     UserSettingsCreate,
     UserSettingsResponse,
     UserSettingsUpdate,
 )
+from v1.routers.user_settings.utils import upsert_user_settings
 from v1.security.security_data_models import UserData
 from v1.security.security_factory import security
 
-router = APIRouter(prefix="/user_settings", tags=["User Settings"])
+router = APIRouter(
+    prefix="/user_settings", tags=["User Settings"], route_class=TimedRoute
+)
 
 
 @router.get("/")
@@ -24,15 +37,65 @@ async def get_list_of_user_settings(
     session: Annotated[
         AsyncSession, Depends(Database().get_session_with_depends)
     ],
+    keys: Annotated[List[UserSettingsKey] | None, Query()] = None,
+    with_values: bool = False,
     user_data: UserData = Depends(security),
 ):
-    query = select(UserSettingsOrm.key).where(
-        UserSettingsOrm.user == user_data.id
-    )
+    """Returns keys of the user settings. If with_values is true, returns settings
+    by key. Results can be limited to the given keys"""
+    columns = [UserSettingsOrm.key]
+    if with_values:
+        columns.append(UserSettingsOrm.settings)
+    query = select(*columns).where(UserSettingsOrm.user == user_data.id)
+    if keys is not None:
+        query = query.where(UserSettingsOrm.key.in_(keys))
     user_settings = await session.execute(query)
-    user_settings = user_settings.scalars().all()
 
-    return user_settings
+    if with_values:
+        return {key: value for key, value in user_settings.all()}
+    return user_settings.scalars().all()
+
+
+@router.put("/", response_model=dict[str, JsonValue])
+async def upsert_many_user_settings(
+    settings: Annotated[UserSettingsBatchUpdate, Body()],
+    session: AsyncSession = Depends(Database().get_session_with_depends),
+    user_data: UserData = Depends(security),
+):
+    """Creates or replaces settings by key in one query"""
+    rows = await upsert_user_settings(
+        session=session, username=user_data.id, settings=settings.root
+    )
+    await session.commit()
+
+    return {row.key: row.settings for row in rows}
+
+
+@router.delete("/", status_code=204)
+async def delete_many_user_settings(
+    keys: Annotated[List[UserSettingsKey], Query(min_length=1)],
+    session: AsyncSession = Depends(Database().get_session_with_depends),
+    user_data: UserData = Depends(security),
+):
+    """Deletes settings by keys. Missing keys are ignored"""
+    stmt = (
+        delete(UserSettingsOrm)
+        .where(
+            UserSettingsOrm.user == user_data.id,
+            UserSettingsOrm.key.in_(keys),
+        )
+        .returning(UserSettingsOrm.key)
+    )
+    deleted_keys = (await session.scalars(stmt)).all()
+
+    await add_settings_events(
+        session=session,
+        kind=SettingsEventKind.USER_SETTINGS,
+        action=SettingsEventAction.DELETE,
+        keys=deleted_keys,
+        username=user_data.id,
+    )
+    await session.commit()
 
 
 @router.get("/{key}", response_model=UserSettingsResponse)
@@ -64,55 +127,73 @@ async def create_user_settings(
     session: AsyncSession = Depends(Database().get_session_with_depends),
     user_data: UserData = Depends(security),
 ):
-    user_settings = UserSettingsOrm(
+    stmt = insert(UserSettingsOrm).values(
         key=key, user=user_data.id, settings=settings.settings
     )
-
     try:
-        session.add(user_settings)
-        await session.flush()
-        await session.refresh(user_settings)
-        await session.commit()
+        await session.execute(stmt)
     except IntegrityError as exc:
         if isinstance(exc.orig.__cause__, UniqueViolationError):
             raise HTTPException(
                 status_code=409,
                 detail="Settings for this user and module already exist!",
             )
-
-    return UserSettingsResponse.model_validate(
-        user_settings, from_attributes=True
+        raise
+
+    await add_settings_events(
+        session=session,
+        kind=SettingsEventKind.USER_SETTINGS,
+        action=SettingsEventAction.CREATE,
+        keys=[key],
+        username=user_data.id,
     )
+    await session.commit()
+
+    return UserSettingsResponse(settings=settings.settings)
 
 
 @router.put("/{key}", response_model=UserSettingsResponse)
 async def update_user_settings(
     key: Annotated[str, Path(min_length=1)],
     settings: Annotated[UserSettingsUpdate, Body()],
+    upsert: bool = False,
     session: AsyncSession = Depends(Database().get_session_with_depends),
     user_data: UserData = Depends(security),
 ) -> UserSettingsResponse:
-    # get settings instance from database
-    query = select(UserSettingsOrm).where(
-        and_(UserSettingsOrm.key == key, UserSettingsOrm.user == user_data.id)
+    """Replaces settings. If upsert is true, creates missing settings
+    instead of raising error"""
+    if upsert:
+        rows = await upsert_user_settings(
+            session=session,
+            username=user_data.id,
+            settings={key: settings.settings},
+        )
+        await session.commit()
+        return UserSettingsResponse(settings=rows[0].settings)
+
+    stmt = (
+        update(UserSettingsOrm)
+        .where(UserSettingsOrm.key == key, UserSettingsOrm.user == user_data.id)
+        .values(settings=settings.settings)
+        .returning(UserSettingsOrm.settings)
     )
-    user_settings = await session.execute(query)
-    user_settings = user_settings.scalar()
+    updated_settings = (await session.execute(stmt)).first()
 
-    if not user_settings:
+    if updated_settings is None:
         raise HTTPException(
             status_code=404, detail="Settings with given id not exist!"
         )
 
-    user_settings.settings = settings.settings
-    session.add(user_settings)
-    await session.flush()
-    await session.refresh(user_settings)
+    await add_settings_events(
+        session=session,
+        kind=SettingsEventKind.USER_SETTINGS,
+        action=SettingsEventAction.UPDATE,
+        keys=[key],
+        username=user_data.id,
+    )
     await session.commit()
 
-    return UserSettingsResponse.model_validate(
-        user_settings, from_attributes=True
-    )
+    return UserSettingsResponse(settings=updated_settings.settings)
 
 
 @router.delete("/{key}", status_code=204)
@@ -134,4 +215,11 @@ async def delete_user_settings(
         )
 
     await session.delete(user_settings)
+    await add_settings_events(
+        session=session,
+        kind=SettingsEventKind.USER_SETTINGS,
+        action=SettingsEventAction.DELETE,
+        keys=[key],
+        username=user_data.id,
+    )
     await session.commit()
@@ -0,0 +1,52 @@
+"""Utils for User Settings router"""
+
+from typing import Sequence
+
+from sqlalchemy import Row, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from v1.controllers.settings_events.common.create.utils import (
+    SettingsEventAction,
+    SettingsEventKind,
+    add_settings_events,
+)
+from v1.database.models.user_settings import UserSettingsOrm
+
+
+async def upsert_user_settings(
+    session: AsyncSession, username: str, settings: dict
+) -> Sequence[Row]:
+    """Creates or replaces settings by key in one query, adds settings events
+    to the session and returns rows of key and settings"""
+    values = [
+        {"user": username, "key": key, "settings": value}
+        for key, value in settings.items()
+    ]
+    if not values:
+        return []
+
+    stmt = insert(UserSettingsOrm)
+    stmt = stmt.on_conflict_do_update(
+        constraint="user_settings_pkey",
+        set_={UserSettingsOrm.settings: stmt.excluded.settings},
+    ).returning(
+        UserSettingsOrm.key,
+        UserSettingsOrm.settings,
+        # xmax is zero for inserted rows
+        literal_column("xmax = 0").label("inserted"),
+    )
+    rows = (await session.execute(stmt, values)).all()
+
+    for action, inserted in (
+        (SettingsEventAction.CREATE, True),
+        (SettingsEventAction.UPDATE, False),
+    ):
+        await add_settings_events(
+            session=session,
+            kind=SettingsEventKind.USER_SETTINGS,
+            action=action,
+            keys=[row.key for row in rows if row.inserted == inserted],
+            username=username,
+        )
+    return rows
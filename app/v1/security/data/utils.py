@@ -1,3 +1,4 @@
+from v1.security.data.permission import db_admins
 from v1.security.security_data_models import UserData
 
 role_prefix = "__"
@@ -23,3 +24,7 @@ def get_user_permissions(jwt: UserData) -> list[str]:
                 ]
             )
     return permissions
+
+
+def is_admin(jwt: UserData) -> bool:
+    return len(db_admins.intersection(get_user_permissions(jwt))) > 0
@@ -9,12 +9,16 @@ from fastapi.security import OAuth2AuthorizationCodeBearer
 import jwt
 import aiohttp
 
+from v1.metrics.metrics import CACHE_REQUESTS, measure_external_call
+from v1.metrics.timing import measure_phase, timed_phase
 from v1.security.implementation.utils.user_info_cache import (
     UserInfoCacheInterface,
 )
 from v1.security.security_data_models import UserData
 from v1.security.security_interface import SecurityInterface
 
+logger = logging.getLogger(__name__)
+
 
 class Keycloak(OAuth2AuthorizationCodeBearer, SecurityInterface):
     def __init__(
@@ -50,39 +54,42 @@ class Keycloak(OAuth2AuthorizationCodeBearer, SecurityInterface):
 
     async def _get_public_key(self):
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    self.keycloak_public_url,
-                    timeout=aiohttp.ClientTimeout(total=5),
-                ) as resp:
-                    print(await resp.json())
-                    if resp.status != 200:
-                        print(resp.status, resp.headers)
-                        raise HTTPException(
-                            status_code=503,
-                            detail="Token verification service unavailable 1",
-                        )
-                    data = await resp.json()
+            with measure_external_call("keycloak_public_key"):
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(
+                        self.keycloak_public_url,
+                        timeout=aiohttp.ClientTimeout(total=5),
+                    ) as resp:
+                        if resp.status != 200:
+                            logger.warning(
+                                "Keycloak public key request failed with status %s",
+                                resp.status,
+                            )
+                            raise HTTPException(
+                                status_code=503,
+                                detail="Token verification service unavailable 1",
+                            )
+                        data = await resp.json()
         except ClientConnectionError as e:
-            print(e)
+            logger.warning("Keycloak request failed: %r", e)
             raise HTTPException(
                 status_code=503,
                 detail="Token verification service unavailable 2",
             )
         except asyncio.TimeoutError as e:
-            print(e)
+            logger.warning("Keycloak request failed: %r", e)
             raise HTTPException(
                 status_code=503,
                 detail="Token verification service unavailable 3",
             )
         except ClientResponseError as e:
-            print(e)
+            logger.warning("Keycloak request failed: %r", e)
             raise HTTPException(
                 status_code=503,
                 detail="Token verification service unavailable 4",
             )
         except InvalidURL as e:
-            print(e)
+            logger.warning("Keycloak request failed: %r", e)
             raise HTTPException(
                 status_code=503,
                 detail="Token verification service unavailable 5",
@@ -95,6 +102,7 @@ class Keycloak(OAuth2AuthorizationCodeBearer, SecurityInterface):
         )
         return public_key
 
+    @timed_phase("auth")
     async def __call__(self, request: Request) -> UserData:
         token = await super(Keycloak, self).__call__(request)
         user_info = await self._parse_jwt(token=token)
@@ -109,14 +117,15 @@ class Keycloak(OAuth2AuthorizationCodeBearer, SecurityInterface):
 
     async def _decode_token(self, token: str):
         try:
-            decoded_token = jwt.decode(
-                token,
-                self._public_key,
-                algorithms=["RS256"],
-                options=self._options,
-            )
+            with measure_phase("jwt"):
+                decoded_token = jwt.decode(
+                    token,
+                    self._public_key,
+                    algorithms=["RS256"],
+                    options=self._options,
+                )
         except jwt.PyJWTError as e:
-            logging.warning(e)
+            logger.debug("Invalid token: %s", e)
             raise HTTPException(status_code=403, detail=str(e))
         return decoded_token
 
@@ -155,6 +164,7 @@ class KeycloakInfo(Keycloak):
         )
         self.cache = cache
 
+    @timed_phase("auth")
     async def __call__(self, request: Request) -> UserData:
         token = await super(Keycloak, self).__call__(request)
         user_info = await self._parse_jwt(token=token)
@@ -176,42 +186,44 @@ class KeycloakInfo(Keycloak):
     async def get_from_keycloak(self, token: str) -> dict | None:
         headers = {"Authorization": f"Bearer {token}"}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    self.info_url,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=5),
-                ) as resp:
-                    print(await resp.json())
-                    if resp.status != 200:
-                        print(resp.status, resp.headers)
-                        print(f"Connection url: {self.info_url}")
-                        raise HTTPException(
-                            status_code=503,
-                            detail="Token verification service unavailable 6",
-                        )
-                    data = await resp.json()
+            with measure_external_call("keycloak_userinfo"):
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(
+                        self.info_url,
+                        headers=headers,
+                        timeout=aiohttp.ClientTimeout(total=5),
+                    ) as resp:
+                        if resp.status != 200:
+                            logger.warning(
+                                "Keycloak userinfo request to %s failed with status %s",
+                                self.info_url,
+                                resp.status,
+                            )
+                            raise HTTPException(
+                                status_code=503,
+                                detail="Token verification service unavailable 6",
+                            )
+                        data = await resp.json()
         except ClientConnectionError as e:
-            print(e)
+            logger.warning("Keycloak request failed: %r", e)
             raise HTTPException(
                 status_code=503,
                 detail="Token verification service unavailable 7",
             )
         except asyncio.TimeoutError as e:
-            print(e)
+            logger.warning("Keycloak request failed: %r", e)
             raise HTTPException(
                 status_code=503,
                 detail="Token verification service unavailable 8",
             )
         except ClientResponseError as e:
-            print(e)
-            print(e.headers)
+            logger.warning("Keycloak request failed: %r", e)
             raise HTTPException(
                 status_code=503,
                 detail="Token verification service unavailable 9",
             )
         except InvalidURL as e:
-            print(e)
+            logger.warning("Keycloak request failed: %r", e)
             raise HTTPException(
                 status_code=503,
                 detail="Token verification service unavailable 10",
@@ -221,6 +233,10 @@ class KeycloakInfo(Keycloak):
 
     async def get_user_info(self, token: str) -> dict | None:
         cached = await self.get_from_cache(token=token)
+        if self.cache:
+            CACHE_REQUESTS.labels(
+                "user_info", "hit" if cached else "miss"
+            ).inc()
         if not cached:
             cached = await self.get_from_keycloak(token=token)
             await self.set_in_cache(token=token, value=cached)
@@ -2,6 +2,7 @@ from typing import Optional
 
 from fastapi.requests import Request
 
+from v1.metrics.timing import timed_phase
 from v1.security.data.permission import db_admins
 from v1.security.data.utils import get_user_permissions
 from v1.security.implementation.keycloak import Keycloak
@@ -49,6 +50,7 @@ class OpaJwtRaw(Keycloak, OPA):
         OPA.__init__(self=self, opa_url=opa_url, policy_path=policy_path)
         self._public_key = ""
 
+    @timed_phase("auth")
     async def __call__(self, request: Request) -> UserData:
         token = await super(Keycloak, self).__call__(request)
         jwt_decoded = await self._parse_jwt(token)
@@ -95,6 +97,7 @@ class OpaJwtParsed(Keycloak, OPA):
         )
         OPA.__init__(self=self, opa_url=opa_url, policy_path=policy_path)
 
+    @timed_phase("auth")
     async def __call__(self, request: Request) -> UserData:
         token = await super(Keycloak, self).__call__(request)
         jwt_decoded = await self._parse_jwt(token)
@@ -7,6 +7,7 @@ import requests
 from fastapi import HTTPException
 from fastapi.requests import Request
 
+from v1.metrics.metrics import measure_external_call
 from v1.security.security_data_models import UserData
 
 
@@ -41,9 +42,10 @@ class OPA(ABC):
         if data:
             full_data.update(data)
         data_json = json.dumps({"input": full_data})
-        response = requests.post(
-            self._url, headers=request.headers, data=data_json, timeout=1
-        )
+        with measure_external_call("opa"):
+            response = requests.post(
+                self._url, headers=request.headers, data=data_json, timeout=1
+            )
         if response.status_code > 300:
             raise HTTPException(
                 status_code=403, detail="Check authorization server"
@@ -56,6 +56,64 @@ OPA_POLICY_PATH = f"/v1/data/{OPA_POLICY}"
 # OTHER
 DEBUG = os.environ.get("DEBUG", "False").upper() in ("TRUE", "Y", "YES", "1")
 SECURITY_TYPE = os.environ.get("SECURITY_TYPE", "DISABLE").upper()
+# port of the metrics endpoint of the gRPC worker, 0 disables metrics
+GRPC_METRICS_PORT = int(os.environ.get("GRPC_METRICS_PORT", "9100"))
+
+
+# QUERY STATS
+# timings of SQL statements grouped by shape and queries per request
+QUERY_STATS_ENABLED = os.environ.get(
+    "QUERY_STATS_ENABLED", "False"
+).upper() in (
+    "TRUE",
+    "Y",
+    "YES",
+    "1",
+)
+# statements running longer are logged with the route, 0 disables the log
+SLOW_QUERY_THRESHOLD_MS = int(os.environ.get("SLOW_QUERY_THRESHOLD_MS", "500"))
+
+
+# LOGGING
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+# json or text
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json").lower()
+# records with the same message template passed per window, 0 disables sampling
+LOG_SAMPLING_LIMIT = int(os.environ.get("LOG_SAMPLING_LIMIT", "10"))
+LOG_SAMPLING_WINDOW_SECONDS = int(
+    os.environ.get("LOG_SAMPLING_WINDOW_SECONDS", "60")
+)
+
+
+# PROFILING
+# admin-only sampling profiler endpoint and cProfile of requests with
+# the X-Profile header
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "False").upper() in (
+    "TRUE",
+    "Y",
+    "YES",
+    "1",
+)
+
+
+# TRACING
+TRACING_ENABLED = os.environ.get("TRACING_ENABLED", "False").upper() in (
+    "TRUE",
+    "Y",
+    "YES",
+    "1",
+)
+# otlp, console, file or module:attribute of a custom exporter factory
+TRACING_EXPORTER = os.environ.get("TRACING_EXPORTER", "otlp")
+TRACING_FILE_PATH = os.environ.get("TRACING_FILE_PATH", "traces.jsonl")
+# share of traces started here, traces of callers follow their decision
+TRACING_SAMPLE_RATIO = float(os.environ.get("TRACING_SAMPLE_RATIO", "0.1"))
+TRACING_SERVICE_NAME = os.environ.get("OTEL_SERVICE_NAME", "frontend-settings")
+
+
+# SCHEDULER
+# random delay of job runs, so replicas don't compete for job leases at once
+SCHEDULER_JITTER_SECONDS = int(os.environ.get("SCHEDULER_JITTER_SECONDS", "30"))
 
 
 # STATE
@@ -66,3 +124,56 @@ DROP_EXPIRED_MINUTES = int(
     os.environ.get("DROP_EXPIRED_MINUTES", "43200")
 )  # 30 * 24 * 60
 DROP_INTERVAL_MINUTES = int(os.environ.get("DROP_INTERVAL_MINUTES", "60"))
+DROP_BATCH_SIZE = int(os.environ.get("DROP_BATCH_SIZE", "1000"))
+# identical states are stored once, matched by a content hash, saving a
+# copy returns the id of the stored state
+STATE_DEDUPLICATION = os.environ.get(
+    "STATE_DEDUPLICATION", "False"
+).upper() in ("TRUE", "Y", "YES", "1")
+# size of the in-memory cache of read states, 0 disables the cache
+STATE_CACHE_MAX_BYTES = int(
+    os.environ.get("STATE_CACHE_MAX_BYTES", "33554432")
+)  # 32 MiB
+
+
+# COLOR RANGES
+# effective default color ranges are cached, changes clear the cache of
+# every replica by a notification, the TTL only limits staleness while a
+# listener reconnects, 0 disables the cache
+COLOR_RANGE_DEFAULTS_CACHE_TTL_SECONDS = int(
+    os.environ.get("COLOR_RANGE_DEFAULTS_CACHE_TTL_SECONDS", "30")
+)
+COLOR_RANGE_DEFAULTS_CACHE_SIZE = int(
+    os.environ.get("COLOR_RANGE_DEFAULTS_CACHE_SIZE", "100000")
+)
+
+
+# STORAGE
+# JSON documents of states, table settings and filter sets larger than
+# the threshold are stored compressed, 0 disables compression
+STORAGE_COMPRESSION_THRESHOLD_BYTES = int(
+    os.environ.get("STORAGE_COMPRESSION_THRESHOLD_BYTES", "0")
+)
+# gzip or zstd, zstd requires the zstandard package
+STORAGE_COMPRESSION_CODEC = os.environ.get(
+    "STORAGE_COMPRESSION_CODEC", "gzip"
+).lower()
+
+
+# MODULE SETTINGS
+# full reload of the module settings registry in case notifications are lost
+MODULE_SETTINGS_RELOAD_INTERVAL_MINUTES = int(
+    os.environ.get("MODULE_SETTINGS_RELOAD_INTERVAL_MINUTES", "5")
+)
+
+
+# SETTINGS EVENTS
+SETTINGS_EVENTS_RETENTION_MINUTES = int(
+    os.environ.get("SETTINGS_EVENTS_RETENTION_MINUTES", "1440")
+)  # 24 * 60
+SETTINGS_EVENTS_QUEUE_SIZE = int(
+    os.environ.get("SETTINGS_EVENTS_QUEUE_SIZE", "100")
+)
+SETTINGS_EVENTS_HEARTBEAT_SECONDS = int(
+    os.environ.get("SETTINGS_EVENTS_HEARTBEAT_SECONDS", "15")
+)
@@ -0,0 +1,161 @@
+"""
+Logging of the uvicorn and gRPC processes.
+Records are formatted on the calling thread and written to stdout by
+a background thread, so log I/O does not block the event loop.
+Records carry the request id and the trace id of the current request.
+Repeated messages are sampled: at most LOG_SAMPLING_LIMIT records with the same
+template per window, the number of suppressed records is logged with the next one.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from v1 import settings
+
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# attributes of every LogRecord, other attributes are passed with extra
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {
+    "message",
+    "asctime",
+    "request_id",
+    "trace_id",
+    "span_id",
+    "suppressed",
+}
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+class ContextFilter(logging.Filter):
+    """Adds ids of the current request and trace to records"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        record.trace_id = record.span_id = None
+        if trace is not None:
+            context = trace.get_current_span().get_span_context()
+            if context.is_valid:
+                record.trace_id = format(context.trace_id, "032x")
+                record.span_id = format(context.span_id, "016x")
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Passes at most limit records with the same template per window.
+    Records of exempt loggers, e.g. access logs, are not sampled"""
+
+    def __init__(
+        self,
+        limit: int,
+        window_seconds: float,
+        exempt_loggers: frozenset[str] = frozenset(),
+    ):
+        super().__init__()
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.exempt_loggers = exempt_loggers
+        # (logger, level, template): [window start, passed, suppressed]
+        self._windows: dict[tuple, list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.suppressed = 0
+        if not self.limit or record.name in self.exempt_loggers:
+            return True
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self.window_seconds:
+            if window is None and len(self._windows) >= 10_000:
+                self._windows.clear()
+            record.suppressed = window[2] if window else 0
+            self._windows[key] = [now, 1, 0]
+            return True
+        if window[1] < self.limit:
+            window[1] += 1
+            return True
+        window[2] += 1
+        return False
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name in ("request_id", "trace_id", "span_id", "suppressed"):
+            value = getattr(record, name, None)
+            if value:
+                entry[name] = value
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRIBUTES:
+                entry[name] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__(
+            "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+        )
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        if getattr(record, "suppressed", 0):
+            text += f" (suppressed {record.suppressed} similar messages)"
+        return text
+
+
+def setup_logging() -> None:
+    """Routes records of the root, uvicorn and gRPC loggers through the queue"""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(
+        SamplingFilter(
+            settings.LOG_SAMPLING_LIMIT,
+            settings.LOG_SAMPLING_WINDOW_SECONDS,
+            exempt_loggers=frozenset({"uvicorn.access"}),
+        )
+    )
+    queue_handler.addFilter(ContextFilter())
+    # records are formatted before they are queued, the writer prints them
+    queue_handler.setFormatter(
+        JsonFormatter() if settings.LOG_FORMAT == "json" else TextFormatter()
+    )
+    stream_handler = logging.StreamHandler(sys.stdout)
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(settings.LOG_LEVEL)
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access", "grpc"):
+        logger = logging.getLogger(name)
+        logger.handlers = []
+        logger.propagate = True
@@ -0,0 +1,95 @@
+import json
+from collections.abc import Collection
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import JSONResponse, Response
+from typing_extensions import TypedDict
+
+
+def serialize(content) -> bytes:
+    """Serializes content the same way as the default JSONResponse"""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson.
+    Output is the same for content prepared by FastAPI, including datetimes,
+    UUIDs and enums, except floats below 1e-4 or from 1e16, which are written
+    without the exponent sign, and NaN, written as null.
+    Content orjson can't encode, e.g. integers over 64 bits, is encoded
+    by JSONResponse"""
+
+    def render(self, content) -> bytes:
+        try:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            return super().render(content)
+
+
+def get_json_response_class(fast: bool) -> type[JSONResponse]:
+    return FastJSONResponse if fast else JSONResponse
+
+
+class RowSerializer:
+    """Serializes rows to JSON the same way as the model used as response_model,
+    without ORM objects and validation.
+    Select columns() of the table, they are labeled with aliases of the model
+    fields, and pass rows as dicts. Typed columns of the database
+    don't need validation.
+    With many rows are passed as a list, with keyed_by as a dict keyed
+    by values of this type"""
+
+    def __init__(
+        self,
+        model: type[BaseModel],
+        many: bool = False,
+        keyed_by: type | None = None,
+    ):
+        # field name: alias, in the order of fields in the output
+        self._fields = {
+            name: field.alias or name
+            for name, field in model.model_fields.items()
+        }
+        row_type = TypedDict(
+            f"{model.__name__}Row",
+            {
+                self._fields[name]: field.annotation
+                for name, field in model.model_fields.items()
+            },
+        )
+        if keyed_by is not None:
+            row_type = dict[keyed_by, row_type]
+        elif many:
+            row_type = list[row_type]
+        self._adapter = TypeAdapter(row_type)
+
+    @property
+    def keys(self) -> list[str]:
+        return list(self._fields.values())
+
+    def columns(self, table, keys: Collection[str] | None = None) -> list:
+        """Columns of the model fields or only of the given output keys,
+        attributes of the table are looked up by the field name, then by the alias.
+        Rows with a part of the keys are serialized without the rest"""
+        return [
+            getattr(table, name if hasattr(table, name) else alias).label(alias)
+            for name, alias in self._fields.items()
+            if keys is None or alias in keys
+        ]
+
+    def dump_json(self, content) -> bytes:
+        return self._adapter.dump_json(content, warnings=False)
+
+    def response(self, content, status_code: int = 200) -> Response:
+        return Response(
+            self.dump_json(content),
+            status_code=status_code,
+            media_type="application/json",
+        )
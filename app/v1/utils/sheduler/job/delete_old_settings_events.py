@@ -0,0 +1,24 @@
+import datetime
+from datetime import timedelta
+
+from sqlalchemy import delete, func, select
+
+from v1 import settings
+from v1.database.database import Database
+from v1.database.models.settings_events import SettingsEvent
+
+
+async def delete_old_settings_events():
+    # created_at is stored as utc without time zone
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    created_at = now - timedelta(
+        minutes=settings.SETTINGS_EVENTS_RETENTION_MINUTES
+    )
+    # the last event is kept, so resuming clients can detect dropped events
+    last_id = select(func.max(SettingsEvent.id)).scalar_subquery()
+    query = delete(SettingsEvent).where(
+        SettingsEvent.created_at <= created_at, SettingsEvent.id < last_id
+    )
+    async for session in Database().get_session():
+        await session.execute(query)
+        await session.commit()
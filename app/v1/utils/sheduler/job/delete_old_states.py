@@ -1,17 +1,42 @@
 import datetime
+import logging
+import time
 from datetime import timedelta
 
-from sqlalchemy import delete
+from sqlalchemy import delete, select
 
 from v1 import settings
 from v1.database.database import Database
 from v1.database.models.state import State
 
+logger = logging.getLogger(__name__)
+
 
 async def delete_old_states():
+    """Deletes states expired more than DROP_EXPIRED_MINUTES ago.
+    Every batch is a separate short transaction and skips rows locked by others"""
+    started = time.monotonic()
     now = datetime.datetime.now()
-    expire_date = now - timedelta(minutes=settings.DROP_INTERVAL_MINUTES)
-    query = delete(State).where(State.expire_date <= expire_date)
+    expire_date = now - timedelta(minutes=settings.DROP_EXPIRED_MINUTES)
+    batch = (
+        select(State.id)
+        .where(State.expire_date <= expire_date)
+        .limit(settings.DROP_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    )
+    query = delete(State).where(State.id.in_(batch))
+
+    deleted = 0
     async for session in Database().get_session():
-        await session.execute(query)
-        await session.commit()
+        while True:
+            result = await session.execute(query)
+            await session.commit()
+            deleted += result.rowcount
+            if result.rowcount < settings.DROP_BATCH_SIZE:
+                break
+
+    logger.info(
+        "Deleted %s expired states in %.3f s",
+        deleted,
+        time.monotonic() - started,
+    )
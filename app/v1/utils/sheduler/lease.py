@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.dialects.postgresql import insert
+
+from v1.database.database import Database
+from v1.database.listener import INSTANCE_ID
+from v1.database.models.scheduler import SchedulerLease
+
+
+async def try_acquire_lease(
+    name: str, duration: timedelta, min_gap: timedelta
+) -> bool:
+    """Takes the lease for the duration if it is free, expired or already held
+    by this replica, and the last run started at least min_gap ago.
+    Times are taken from the database, so clocks of replicas don't matter"""
+    stmt = insert(SchedulerLease).values(
+        name=name,
+        owner=INSTANCE_ID,
+        expires_at=func.now() + duration,
+        started_at=func.now(),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SchedulerLease.name],
+        set_={
+            SchedulerLease.owner: stmt.excluded.owner,
+            SchedulerLease.expires_at: stmt.excluded.expires_at,
+            SchedulerLease.started_at: stmt.excluded.started_at,
+        },
+        where=and_(
+            or_(
+                SchedulerLease.expires_at <= func.now(),
+                SchedulerLease.owner == INSTANCE_ID,
+            ),
+            or_(
+                SchedulerLease.started_at.is_(None),
+                SchedulerLease.started_at <= func.now() - min_gap,
+            ),
+        ),
+    ).returning(SchedulerLease.owner)
+
+    async for session in Database().get_session():
+        acquired = (await session.execute(stmt)).first()
+        await session.commit()
+        return acquired is not None
+
+
+async def release_lease(name: str) -> None:
+    """Releases the lease held by this replica, started_at still keeps
+    other replicas from running the job until the next interval"""
+    stmt = (
+        update(SchedulerLease)
+        .where(
+            SchedulerLease.name == name,
+            SchedulerLease.owner == INSTANCE_ID,
+        )
+        .values(expires_at=func.now())
+    )
+    async for session in Database().get_session():
+        await session.execute(stmt)
+        await session.commit()
@@ -1,17 +1,110 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import timedelta
+from typing import Awaitable, Callable
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
+from v1 import settings
+from v1.utils.sheduler.lease import release_lease, try_acquire_lease
 from v1.utils.singleton import Singleton
 
+logger = logging.getLogger(__name__)
+
+# covers database round trips and the time between the run and the lease
+LEASE_MARGIN = timedelta(seconds=10)
+
 
 class Scheduler(metaclass=Singleton):
     def __init__(self):
         self._scheduler = AsyncIOScheduler()
         self._scheduler.start()
+        # job name: counts of skipped, ran, failed and timed_out runs
+        self.stats: dict[str, Counter] = {}
 
-    def add_job(self, function, interval_minutes: int):
+    def add_job(
+        self,
+        function: Callable[[], Awaitable],
+        interval_minutes: int,
+        exclusive: bool = True,
+        max_runtime_minutes: int | None = None,
+    ):
+        """Adds job running every interval_minutes.
+        Exclusive jobs run on one replica per interval, which holds the job
+        lease while the job runs. Runs longer than max_runtime_minutes are
+        cancelled, by default they end before the next run can start"""
+        name = f"{function.__module__}.{function.__qualname__}"
+        self.stats[name] = Counter()
+        interval = timedelta(minutes=interval_minutes)
+        # runs of a replica start at least interval - jitter apart
+        min_gap = max(
+            interval
+            - timedelta(seconds=settings.SCHEDULER_JITTER_SECONDS)
+            - LEASE_MARGIN,
+            timedelta(0),
+        )
+        if max_runtime_minutes is not None:
+            max_runtime = timedelta(minutes=max_runtime_minutes)
+        else:
+            max_runtime = min_gap or interval
         self._scheduler.add_job(
-            func=function, trigger="interval", minutes=interval_minutes
+            func=self._run,
+            kwargs={
+                "name": name,
+                "function": function,
+                "exclusive": exclusive,
+                "min_gap": min_gap,
+                "max_runtime": max_runtime,
+            },
+            trigger="interval",
+            minutes=interval_minutes,
+            jitter=settings.SCHEDULER_JITTER_SECONDS,
         )
 
+    async def _run(
+        self,
+        name: str,
+        function: Callable[[], Awaitable],
+        exclusive: bool,
+        min_gap: timedelta,
+        max_runtime: timedelta,
+    ):
+        stats = self.stats[name]
+        try:
+            # the lease expires soon after max_runtime if the replica dies
+            if exclusive and not await try_acquire_lease(
+                name, max_runtime + LEASE_MARGIN, min_gap
+            ):
+                stats["skipped"] += 1
+                return
+        except Exception:
+            logger.exception("Can't acquire lease of job %s", name)
+            stats["failed"] += 1
+            return
+
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(
+                function(), timeout=max_runtime.total_seconds()
+            )
+        except asyncio.TimeoutError:
+            stats["timed_out"] += 1
+            logger.error("Job %s exceeded max runtime %s", name, max_runtime)
+        except Exception:
+            stats["failed"] += 1
+            logger.exception("Job %s failed", name)
+        else:
+            stats["ran"] += 1
+            logger.info(
+                "Job %s finished in %.3f s", name, time.monotonic() - started
+            )
+        if exclusive:
+            try:
+                await release_lease(name)
+            except Exception:
+                logger.exception("Can't release lease of job %s", name)
+
     def shutdown(self):
         self._scheduler.shutdown()
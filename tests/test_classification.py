@@ -0,0 +1,120 @@
+import math
+
+import numpy
+import pytest
+
+from v1.routers.color_range.classification import (
+    MISSING,
+    compile_color_range,
+)
+
+RANGES = {
+    "values": [20, 80],
+    "colors": [
+        {"name": "Low", "hex": "#00FF00"},
+        {"name": "Middle", "hex": "#FFCC00"},
+        {"name": "High", "hex": "#FF0000"},
+        {"name": "Indeterminate", "hex": "#888888"},
+        {"name": "Cleared", "hex": "#FFFFFF"},
+    ],
+}
+
+
+@pytest.mark.parametrize(
+    "value, index",
+    [
+        (-math.inf, 0),
+        (19.999, 0),
+        # a breakpoint belongs to the upper interval
+        (20, 1),
+        (20.001, 1),
+        (79.999, 1),
+        (80, 2),
+        (math.inf, 2),
+    ],
+)
+def test_bucket_edges(value, index):
+    compiled = compile_color_range(RANGES, "asc")
+    assert compiled.classify([value]) == [index]
+
+
+@pytest.mark.parametrize(
+    "value, index", [(19.999, 2), (20, 1), (79.999, 1), (80, 0)]
+)
+def test_bucket_edges_desc(value, index):
+    compiled = compile_color_range(RANGES, "desc")
+    assert compiled.classify([value]) == [index]
+
+
+def test_equal_breakpoints_make_empty_interval():
+    compiled = compile_color_range(
+        {"values": [10, 10], "colors": ["a", "b", "c"]}, "asc"
+    )
+    assert compiled.classify([9, 10, 11]) == [0, 2, 2]
+
+
+def test_colors_are_hex_of_intervals():
+    compiled = compile_color_range(RANGES, "asc")
+    assert compiled.colors == ["#00FF00", "#FFCC00", "#FF0000"]
+
+
+def test_missing_values_without_indeterminate_color():
+    compiled = compile_color_range(RANGES, "asc")
+    assert compiled.classify([None, math.nan, 50]) == [MISSING, MISSING, 1]
+
+
+def test_indeterminate_and_cleared_colors():
+    compiled = compile_color_range(
+        RANGES, "asc", with_indeterminate=True, with_cleared=True
+    )
+    assert compiled.colors[3:] == ["#888888", "#FFFFFF"]
+    indices = compiled.classify(
+        [None, math.nan, 50, 50], cleared=[False, False, False, True]
+    )
+    assert indices == [3, 3, 1, 4]
+
+
+def test_cleared_color_follows_intervals_without_indeterminate():
+    compiled = compile_color_range(RANGES, "asc", with_cleared=True)
+    assert compiled.colors[3] == "#888888"
+    indices = compiled.classify([None, 50], cleared=[False, True])
+    assert indices == [MISSING, 3]
+
+
+def test_flags_without_colors_leave_values_without_color():
+    ranges = {**RANGES, "colors": RANGES["colors"][:3]}
+    compiled = compile_color_range(
+        ranges, "asc", with_indeterminate=True, with_cleared=True
+    )
+    assert compiled.classify([None, 50], cleared=[False, True]) == [
+        MISSING,
+        MISSING,
+    ]
+
+
+def test_classify_array_returns_int16():
+    compiled = compile_color_range(RANGES, "desc", with_indeterminate=True)
+    indices = compiled.classify_array(numpy.array([0.0, 50.0, numpy.nan]))
+    assert indices.dtype == numpy.int16
+    assert indices.tolist() == [2, 1, 3]
+
+
+def test_cleared_flags_must_match_values():
+    compiled = compile_color_range(RANGES, "asc", with_cleared=True)
+    with pytest.raises(ValueError):
+        compiled.classify([1, 2], cleared=[True])
+
+
+@pytest.mark.parametrize(
+    "ranges",
+    [
+        {"values": [], "colors": ["a"]},
+        {"values": ["x"], "colors": ["a", "b"]},
+        {"values": [math.nan], "colors": ["a", "b"]},
+        {"values": [2, 1], "colors": ["a", "b", "c"]},
+        {"values": [1, 2], "colors": ["a", "b"]},
+    ],
+)
+def test_invalid_ranges(ranges):
+    with pytest.raises(ValueError):
+        compile_color_range(ranges, "asc")
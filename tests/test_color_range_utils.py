@@ -0,0 +1,42 @@
+import base64
+
+import pytest
+from fastapi import HTTPException
+
+from v1.routers.color_range.utils import decode_cursor, encode_cursor
+
+
+@pytest.mark.parametrize("last_id", [0, 1, 2**31, 2**63 - 1])
+def test_cursor_round_trip(last_id):
+    cursor = encode_cursor(last_id)
+    assert decode_cursor(cursor) == last_id
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(2**63 - 1)
+    assert set(cursor) <= set(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_="
+    )
+
+
+def _encode(content: bytes) -> str:
+    return base64.urlsafe_b64encode(content).decode()
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not a cursor",
+        _encode(b"not json"),
+        _encode(b"[]"),
+        _encode(b"{}"),
+        _encode(b'{"after": "1"}'),
+        _encode(b'{"after": 1.5}'),
+        _encode(b'{"after": null}'),
+    ],
+)
+def test_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 422
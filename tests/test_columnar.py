@@ -0,0 +1,133 @@
+import json
+import math
+
+import numpy
+import pyarrow
+import pyarrow.ipc
+import pytest
+
+from v1.routers.color_range.classification import compile_color_range
+from v1.routers.color_range.columnar import (
+    classify_arrow,
+    classify_raw,
+    export_arrow,
+    read_raw_values,
+)
+
+COMPILED = compile_color_range(
+    {"values": [20, 80], "colors": ["#0", "#1", "#2", "#i", "#c"]},
+    "asc",
+    with_indeterminate=True,
+    with_cleared=True,
+)
+
+
+def arrow_stream(table: pyarrow.Table) -> bytes:
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def read_stream(content) -> pyarrow.Table:
+    return pyarrow.ipc.open_stream(bytes(content)).read_all()
+
+
+def test_raw_round_trip():
+    body = numpy.array([0, 20, 80, math.nan], dtype="<f8").tobytes()
+    content = classify_raw(COMPILED, body)
+    assert numpy.frombuffer(content, dtype="<i2").tolist() == [0, 1, 2, 3]
+
+
+def test_raw_values_are_read_without_copy():
+    body = numpy.array([1.5, 2.5], dtype="<f8").tobytes()
+    values = read_raw_values(body)
+    assert values.tolist() == [1.5, 2.5]
+    assert not values.flags.owndata
+
+
+def test_raw_body_must_be_float64():
+    with pytest.raises(ValueError):
+        classify_raw(COMPILED, b"\x00" * 12)
+
+
+def test_arrow_round_trip():
+    table = pyarrow.table(
+        {
+            "value": pyarrow.array([None, 19, 20, 90], type=pyarrow.int64()),
+            "cleared": pyarrow.array([False, None, False, True]),
+        }
+    )
+    result = read_stream(classify_arrow(COMPILED, arrow_stream(table)))
+    assert result.schema.field("index").type == pyarrow.int16()
+    assert result.column("index").to_pylist() == [3, 0, 1, 4]
+    assert json.loads(result.schema.metadata[b"colors"]) == COMPILED.colors
+
+
+def test_arrow_without_cleared_column():
+    table = pyarrow.table({"value": [math.nan, 50.0]})
+    result = read_stream(classify_arrow(COMPILED, arrow_stream(table)))
+    assert result.column("index").to_pylist() == [3, 1]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"not arrow",
+        arrow_stream(pyarrow.table({"value": ["a", "b"]})),
+    ],
+)
+def test_invalid_arrow_stream(body):
+    with pytest.raises(ValueError):
+        classify_arrow(COMPILED, body)
+
+
+def test_export_round_trip():
+    rows = [
+        (
+            1,
+            "10",
+            "20",
+            "float",
+            "range",
+            "asc",
+            True,
+            False,
+            {"values": [1, "x"], "colors": [{"hex": "#0"}, "#1", None]},
+        ),
+        (2, "11", "21", "int", "empty", "desc", False, True, {}),
+    ]
+    result = read_stream(export_arrow(rows)).to_pylist()
+    assert result == [
+        {
+            "id": 1,
+            "tmo_id": "10",
+            "tprm_id": "20",
+            "val_type": "float",
+            "name": "range",
+            "direction": "asc",
+            "public": True,
+            "default": False,
+            # breakpoints which aren't numbers make the list null
+            "breakpoints": None,
+            "colors": ["#0", "#1", None],
+        },
+        {
+            "id": 2,
+            "tmo_id": "11",
+            "tprm_id": "21",
+            "val_type": "int",
+            "name": "empty",
+            "direction": "desc",
+            "public": False,
+            "default": True,
+            "breakpoints": [],
+            "colors": [],
+        },
+    ]
+
+
+def test_export_without_rows():
+    result = read_stream(export_arrow([]))
+    assert result.num_rows == 0
+    assert result.column_names[-2:] == ["breakpoints", "colors"]
@@ -0,0 +1,47 @@
+import pytest
+
+from v1.metrics.queries import normalize_statement
+
+
+@pytest.mark.parametrize(
+    "statement, shape",
+    [
+        (
+            "SELECT * FROM state WHERE id = $1::UUID",
+            "SELECT * FROM state WHERE id = $?::UUID",
+        ),
+        (
+            "SELECT * FROM state WHERE name = 'it''s' AND size > 10.5",
+            "SELECT * FROM state WHERE name = ? AND size > ?",
+        ),
+        (
+            "SELECT * FROM filters WHERE tmo_id IN ($1::INTEGER, "
+            "$2::INTEGER, $3::INTEGER)",
+            "SELECT * FROM filters WHERE tmo_id IN (...)",
+        ),
+        (
+            "SELECT * FROM filters WHERE tmo_id = ANY(ARRAY[$1, $2])",
+            "SELECT * FROM filters WHERE tmo_id = ANY(ARRAY[...])",
+        ),
+        (
+            "INSERT INTO events (kind, key) VALUES ($1, $2), ($3, $4), ($5, $6)",
+            "INSERT INTO events (kind, key) VALUES (...)",
+        ),
+        (
+            "SELECT id\n  FROM  state\n\tLIMIT 5",
+            "SELECT id FROM state LIMIT ?",
+        ),
+    ],
+)
+def test_normalize_statement(statement, shape):
+    assert normalize_statement(statement) == shape
+
+
+def test_statements_differing_in_parameter_count_share_shape():
+    assert normalize_statement(
+        "SELECT 1 FROM t WHERE id IN ($1, $2)"
+    ) == normalize_statement("SELECT 1 FROM t WHERE id IN ($1, $2, $3, $4)")
+
+
+def test_identifiers_with_digits_are_kept():
+    assert normalize_statement("SELECT col1 FROM t2") == "SELECT col1 FROM t2"
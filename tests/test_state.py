@@ -0,0 +1,132 @@
+import gzip
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from v1.routers.state.utils import (
+    StateCache,
+    accepts_encoding,
+    build_state_response,
+    get_state_content_hash,
+)
+from v1.utils.singleton import Singleton
+
+
+def test_content_hash_ignores_key_order():
+    first = get_state_content_hash({"a": 1, "b": {"c": [1, 2], "d": "é"}})
+    second = get_state_content_hash({"b": {"d": "é", "c": [1, 2]}, "a": 1})
+    assert first == second
+    assert len(first) == 32
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        {"a": 2},
+        {"a": "1"},
+        {"a": 1, "b": None},
+        {"A": 1},
+    ],
+)
+def test_content_hash_differs_by_content(other):
+    assert get_state_content_hash({"a": 1}) != get_state_content_hash(other)
+
+
+def test_content_hash_keeps_list_order():
+    assert get_state_content_hash([1, 2]) != get_state_content_hash([2, 1])
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, accepted",
+    [
+        ("gzip", True),
+        ("GZIP", True),
+        ("deflate, gzip;q=0.5", True),
+        ("gzip;q=0", False),
+        ("gzip; q=0.0", False),
+        ("gzip;q=invalid", False),
+        ("br", False),
+        ("*", True),
+        ("*;q=0", False),
+        ("br, *;q=0.1", True),
+        ("gzip;q=0, *", False),
+        ("", False),
+    ],
+)
+def test_accepts_encoding(accept_encoding, accepted):
+    assert accepts_encoding(accept_encoding, "gzip") is accepted
+
+
+def test_packed_state_is_sent_encoded_if_accepted():
+    content = gzip.compress(b'{"a":1}')
+    response = build_state_response(content, "gzip", "gzip, br")
+    assert response.body == content
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+def test_packed_state_is_decompressed_if_not_accepted():
+    content = gzip.compress(b'{"a":1}')
+    response = build_state_response(content, "gzip", "gzip;q=0")
+    assert response.body == b'{"a":1}'
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+def test_plain_state_is_sent_as_is():
+    response = build_state_response(b'{"a":1}', None, "gzip")
+    assert response.body == b'{"a":1}'
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+@pytest.fixture
+def state_cache():
+    Singleton._instances.pop(StateCache, None)
+    yield StateCache(max_bytes=10)
+    Singleton._instances.pop(StateCache, None)
+
+
+NOW = datetime(2026, 1, 1)
+
+
+def test_state_cache_returns_content_with_encoding(state_cache):
+    state_id = uuid4()
+    state_cache.set(state_id, b"abc", "gzip", None)
+    assert state_cache.get(state_id, NOW) == (b"abc", "gzip")
+    assert state_cache.get(uuid4(), NOW) is None
+
+
+def test_state_cache_drops_expired_states(state_cache):
+    state_id = uuid4()
+    state_cache.set(state_id, b"abc", None, NOW + timedelta(seconds=1))
+    assert state_cache.get(state_id, NOW) == (b"abc", None)
+    assert state_cache.get(state_id, NOW + timedelta(seconds=2)) is None
+    state_cache.set(state_id, b"abc", None, NOW + timedelta(seconds=1))
+    assert state_cache.get(state_id, NOW) == (b"abc", None)
+
+
+def test_state_cache_is_bounded_by_bytes(state_cache):
+    first, second = uuid4(), uuid4()
+    state_cache.set(first, b"123456", None, None)
+    state_cache.set(second, b"123456", None, None)
+    assert state_cache.get(first, NOW) is None
+    assert state_cache.get(second, NOW) == (b"123456", None)
+
+
+def test_state_cache_skips_states_bigger_than_cache(state_cache):
+    state_id = uuid4()
+    state_cache.set(state_id, b"x" * 11, None, None)
+    assert state_cache.get(state_id, NOW) is None
+
+
+def test_disabled_state_cache():
+    Singleton._instances.pop(StateCache, None)
+    try:
+        cache = StateCache(max_bytes=0)
+        state_id = uuid4()
+        cache.set(state_id, b"abc", None, None)
+        assert cache.get(state_id, NOW) is None
+    finally:
+        Singleton._instances.pop(StateCache, None)
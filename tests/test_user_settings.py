@@ -0,0 +1,70 @@
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from v1.routers.user_settings.utils import upsert_user_settings
+
+
+class Session:
+    """Records executed statements, the first one returns rows"""
+
+    def __init__(self, rows: list):
+        self.rows = rows
+        self.executed = []
+
+    async def execute(self, statement, params=None):
+        self.executed.append((statement, params))
+        rows = self.rows if len(self.executed) == 1 else []
+        return SimpleNamespace(all=lambda: rows)
+
+
+def compile_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def row(key: str, inserted: bool):
+    return SimpleNamespace(key=key, settings={}, inserted=inserted)
+
+
+def test_upsert_is_one_statement_returning_inserted_flag():
+    session = Session([row("a", True)])
+    asyncio.run(upsert_user_settings(session, "user", {"a": {"x": 1}}))
+
+    statement, params = session.executed[0]
+    sql = compile_sql(statement)
+    assert "ON CONFLICT ON CONSTRAINT user_settings_pkey DO UPDATE" in sql
+    assert "settings = excluded.settings" in sql
+    assert "xmax = 0 AS inserted" in sql
+    assert params == [{"user": "user", "key": "a", "settings": {"x": 1}}]
+
+
+def test_events_follow_inserted_flag():
+    session = Session([row("a", True), row("b", False), row("c", True)])
+    rows = asyncio.run(
+        upsert_user_settings(session, "user", {"a": {}, "b": {}, "c": {}})
+    )
+
+    assert [item.key for item in rows] == ["a", "b", "c"]
+    events = [params for _, params in session.executed[1:]]
+    assert [[event["key"] for event in batch] for batch in events] == [
+        ["a", "c"],
+        ["b"],
+    ]
+    assert {event["action"] for event in events[0]} == {"create"}
+    assert {event["action"] for event in events[1]} == {"update"}
+    assert all(event["username"] == "user" for event in events[0])
+
+
+def test_only_updates_add_no_create_events():
+    session = Session([row("a", False)])
+    asyncio.run(upsert_user_settings(session, "user", {"a": {}}))
+
+    assert len(session.executed) == 2
+    assert session.executed[1][1][0]["action"] == "update"
+
+
+def test_empty_settings_execute_nothing():
+    session = Session([])
+    assert asyncio.run(upsert_user_settings(session, "user", {})) == []
+    assert session.executed == []